@@ -17,23 +17,37 @@ db = client[DB_NAME]
 st.set_page_config(layout="wide")
 @st.cache_data(ttl=300)
 def load_collection(collection_name: str):
+    """Carrega uma coleção pequena inteira: snapshots realtime e rollups diários"""
     cursor = db[collection_name].find()
     return pd.DataFrame(list(cursor))
 
-reports_df = load_collection("reports")
+@st.cache_data(ttl=300)
+def load_documents(collection_name: str, query: dict, fields: tuple):
+    """Busca só os documentos e campos das tabelas de detalhe"""
+    projection = {field: 1 for field in fields}
+    projection["_id"] = 0
+    columns = list(dict.fromkeys(field.split(".")[0] for field in fields))
+    return pd.DataFrame(list(db[collection_name].find(query, projection)), columns=columns)
+
+@st.cache_data(ttl=300)
+def load_options(collection_name: str, field: str):
+    """Valores distintos de um campo para as opções dos filtros"""
+    return sorted(value for value in db[collection_name].distinct(field) if value is not None)
+
 realtime_reports_df = load_collection("realtime_reports")
-files_df = load_collection("files")
 realtime_files_df = load_collection("realtime_files")
-action_plans_df = load_collection("action_plans")
 realtime_action_plans_df = load_collection("realtime_action_plans_actions")
+reports_rollup_df = load_collection("reports_daily")
+files_rollup_df = load_collection("files_daily")
+action_plans_rollup_df = load_collection("action_plans_daily")
 
 tab = st.tabs(["Reports", "Files", "Action Plans"])
 
 with tab[0]:
-    render_reports_tab(reports_df, realtime_reports_df)
+    render_reports_tab(realtime_reports_df, reports_rollup_df, load_documents, load_options)
 
 with tab[1]:
-    render_files_tab(files_df, realtime_files_df)
+    render_files_tab(realtime_files_df, files_rollup_df, load_documents, load_options)
 
 with tab[2]:
-    render_action_plans_tab(action_plans_df, realtime_action_plans_df)
\ No newline at end of file
+    render_action_plans_tab(realtime_action_plans_df, action_plans_rollup_df, load_documents, load_options)
\ No newline at end of file
@@ -1,8 +1,17 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
+from .documents import build_query
+from .rollups import summarize_rollup
 
-def render_action_plans_tab(action_plans_df, realtime_action_plans_df):
+# Fields the action plans table and the raw fallback charts read
+DOCUMENT_FIELDS = (
+    "title", "description", "status", "priority", "due_date", "client",
+    "organization.name", "company.name", "workstation.name", "file.original_name",
+    "created_at", "updated_at", "completed_at",
+)
+
+def render_action_plans_tab(realtime_action_plans_df, action_plans_rollup_df, load_documents, load_options):
     st.subheader("📋 Realtime Action Plans")
     if not realtime_action_plans_df.empty:
         f1, f2, f3 = st.columns([1, 2, 2]) 
@@ -60,64 +69,59 @@ def render_action_plans_tab(action_plans_df, realtime_action_plans_df):
 
     col_client, col_org, col_comp, col_ws, col_status = st.columns(5)
     with col_client:
-        client_filter = st.multiselect("Client:", options=action_plans_df['client'].dropna().unique(), key="action_plans_client")
+        client_filter = st.multiselect("Client:", options=load_options("action_plans", "client"), key="action_plans_client")
     with col_org:
         organization_filter = st.multiselect(
             "Organization:",
-            options=action_plans_df['organization'].apply(lambda x: x.get('name') if isinstance(x, dict) else None).dropna().unique(),
+            options=load_options("action_plans", "organization.name"),
             key="action_plans_organization"
         )
     with col_comp:
         company_filter = st.multiselect(
             "Company:",
-            options=action_plans_df['company'].apply(lambda x: x.get('name') if isinstance(x, dict) else None).dropna().unique(),
+            options=load_options("action_plans", "company.name"),
             key="action_plans_company"
         )
     with col_ws:
         workstation_filter = st.multiselect(
             "Workstation:",
-            options=action_plans_df['workstation'].apply(lambda x: x.get('name') if isinstance(x, dict) else None).dropna().unique(),
+            options=load_options("action_plans", "workstation.name"),
             key="action_plans_workstation"
         )
     with col_status:
         status_filter = st.multiselect(
             "Status:",
-            options=action_plans_df['status'].dropna().unique(),
+            options=load_options("action_plans", "status"),
             key="action_plans_status"
         )
 
     title_filter = st.text_input("Action Plan Title:", key="action_plans_title")
-    priority_filter = st.selectbox("Priority:", options=["All"] + list(action_plans_df['priority'].dropna().unique()), key="action_plans_priority")
-
-    filtered_action_plans = action_plans_df.copy()
-    if len(date_range) == 2:
-        filtered_action_plans = filtered_action_plans[
-            (filtered_action_plans['created_at'] >= pd.to_datetime(date_range[0])) &
-            (filtered_action_plans['created_at'] <= pd.to_datetime(date_range[1]))
-        ]
+    priority_filter = st.selectbox("Priority:", options=["All"] + load_options("action_plans", "priority"), key="action_plans_priority")
+
+    # Rollups mantidos pelo ETL evitam agrupar os documentos brutos quando os filtros permitem
+    rollup_summary = summarize_rollup(
+        action_plans_rollup_df,
+        date_range,
+        {"client": client_filter, "status": status_filter},
+        [organization_filter, company_filter, workstation_filter, title_filter, priority_filter != "All"]
+    )
+
+    # Raw documents are only fetched, filtered and projected, when the table is shown
+    show_documents = st.toggle("Show action plans", key="action_plans_show_documents")
+    filtered_action_plans = pd.DataFrame()
     if not len(date_range) == 2:
         st.warning("Selecione um intervalo de datas válido.")
-        filtered_action_plans = pd.DataFrame()
-    if client_filter:
-        filtered_action_plans = filtered_action_plans[filtered_action_plans['client'].isin(client_filter)]
-    if organization_filter:
-        filtered_action_plans = filtered_action_plans[
-            filtered_action_plans['organization'].apply(lambda x: x.get('name') if isinstance(x, dict) else None).isin(organization_filter)
-        ]
-    if company_filter:
-        filtered_action_plans = filtered_action_plans[
-            filtered_action_plans['company'].apply(lambda x: x.get('name') if isinstance(x, dict) else None).isin(company_filter)
-        ]
-    if workstation_filter:
-        filtered_action_plans = filtered_action_plans[
-            filtered_action_plans['workstation'].apply(lambda x: x.get('name') if isinstance(x, dict) else None).isin(workstation_filter)
-        ]
-    if status_filter:
-        filtered_action_plans = filtered_action_plans[filtered_action_plans['status'].isin(status_filter)]
-    if title_filter:
-        filtered_action_plans = filtered_action_plans[filtered_action_plans['title'].str.contains(title_filter, case=False, na=False)]
-    if priority_filter != "All":
-        filtered_action_plans = filtered_action_plans[filtered_action_plans['priority'] == priority_filter]
+    elif show_documents:
+        filtered_action_plans = load_documents(
+            "action_plans",
+            build_query(
+                date_range,
+                equals={"client": client_filter, "status": status_filter, "priority": [] if priority_filter == "All" else [priority_filter]},
+                names={"organization": organization_filter, "company": company_filter, "workstation": workstation_filter},
+                contains={"title": title_filter},
+            ),
+            DOCUMENT_FIELDS,
+        )
 
     if not filtered_action_plans.empty:
         filtered_action_plans["organization_name"] = filtered_action_plans["organization"].apply(lambda x: x.get("name") if isinstance(x, dict) else None)
@@ -168,11 +172,17 @@ def render_action_plans_tab(action_plans_df, realtime_action_plans_df):
             use_container_width=True,
             hide_index=True
         )
-    else:
+    elif show_documents:
         st.info("No action plans found for applied filters.")
+    elif rollup_summary is None and len(date_range) == 2:
+        # Rollups are missing or cannot answer the active filters
+        st.info("Turn on \"Show action plans\" to see the summaries computed from the documents.")
 
     st.subheader("Status Resume")
-    if not filtered_action_plans.empty:
+    if rollup_summary is not None and not rollup_summary.empty:
+        status_summary = rollup_summary.groupby("status")["count"].sum().reset_index(name="count")
+        st.bar_chart(status_summary.set_index("status"))
+    elif not filtered_action_plans.empty:
         status_summary = filtered_action_plans.groupby("status").size().reset_index(name="count")
         st.bar_chart(status_summary.set_index("status"))
 
@@ -183,7 +193,15 @@ def render_action_plans_tab(action_plans_df, realtime_action_plans_df):
             st.bar_chart(priority_summary.set_index("priority"))
 
     st.subheader("Data Resume")
-    if not filtered_action_plans.empty:
+    date_summary = None
+    if rollup_summary is not None and not rollup_summary.empty:
+        date_summary = (
+            rollup_summary.groupby(["client", "date_only"])["count"]
+            .sum()
+            .reset_index(name="count")
+            .sort_values(["date_only"])
+        )
+    elif not filtered_action_plans.empty:
         filtered_action_plans["date_only"] = pd.to_datetime(filtered_action_plans["created_at"]).dt.date
 
         date_summary = (
@@ -193,6 +211,7 @@ def render_action_plans_tab(action_plans_df, realtime_action_plans_df):
             .sort_values(["date_only"])
         )
 
+    if date_summary is not None:
         display_date_df = date_summary.copy()
         display_date_df.rename(columns={
             "client": "👤 Client",
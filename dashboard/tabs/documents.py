@@ -0,0 +1,18 @@
+import re
+from .rollups import date_bounds
+
+def build_query(date_range, equals=None, names=None, contains=None):
+    """Monta o filtro do Mongo com os filtros da tela, para buscar só os documentos exibidos"""
+    start, end = date_bounds(date_range)
+    query = {"created_at": {"$gte": start.to_pydatetime(), "$lt": end.to_pydatetime()}}
+    for field, selected in (equals or {}).items():
+        if selected:
+            query[field] = {"$in": list(selected)}
+    # organization, company and workstation are embedded documents filtered by name
+    for field, selected in (names or {}).items():
+        if selected:
+            query[f"{field}.name"] = {"$in": list(selected)}
+    for field, text in (contains or {}).items():
+        if text:
+            query[field] = {"$regex": re.escape(text), "$options": "i"}
+    return query
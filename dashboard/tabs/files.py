@@ -1,8 +1,16 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
+from .documents import build_query
+from .rollups import summarize_rollup
 
-def render_files_tab(files_df, realtime_files_df):
+# Fields the files table and the raw fallback charts read
+DOCUMENT_FIELDS = (
+    "original_name", "generated_name", "duration", "status", "is_active", "client",
+    "organization.name", "company.name", "workstation.name", "created_at",
+)
+
+def render_files_tab(realtime_files_df, files_rollup_df, load_documents, load_options):
     st.subheader("📡 Realtime Active Files")
     if not realtime_files_df.empty:
         f1, f2, f3 = st.columns([1, 2, 2]) 
@@ -59,53 +67,52 @@ def render_files_tab(files_df, realtime_files_df):
 
     col_client, col_org, col_comp, col_ws = st.columns(4)
     with col_client:
-        client_filter = st.multiselect("Cliente:", options=files_df['client'].dropna().unique(), key="files_client")
+        client_filter = st.multiselect("Cliente:", options=load_options("files", "client"), key="files_client")
     with col_org:
         organization_filter = st.multiselect(
             "Organization:",
-            options=files_df['organization'].apply(lambda x: x.get('name') if isinstance(x, dict) else None).dropna().unique(),
+            options=load_options("files", "organization.name"),
             key="files_organization"
         )
     with col_comp:
         company_filter = st.multiselect(
             "Company:",
-            options=files_df['company'].apply(lambda x: x.get('name') if isinstance(x, dict) else None).dropna().unique(),
+            options=load_options("files", "company.name"),
             key="files_company"
         )
     with col_ws:
         workstation_filter = st.multiselect(
             "Workstation:",
-            options=files_df['workstation'].apply(lambda x: x.get('name') if isinstance(x, dict) else None).dropna().unique(),
+            options=load_options("files", "workstation.name"),
             key="files_workstation"
         )
 
     file_filter = st.text_input("File name:", key="files_file_name")
 
-    filtered_files = files_df.copy()
-    if len(date_range) == 2:
-        filtered_files = filtered_files[
-            (filtered_files['created_at'] >= pd.to_datetime(date_range[0])) &
-            (filtered_files['created_at'] <= pd.to_datetime(date_range[1]))
-        ]
+    # Rollups mantidos pelo ETL evitam agrupar os documentos brutos quando os filtros permitem
+    rollup_summary = summarize_rollup(
+        files_rollup_df,
+        date_range,
+        {"client": client_filter},
+        [organization_filter, company_filter, workstation_filter, file_filter]
+    )
+
+    # Raw documents are only fetched, filtered and projected, when the table is shown
+    show_documents = st.toggle("Show files", key="files_show_documents")
+    filtered_files = pd.DataFrame()
     if not len(date_range) == 2:
         st.warning("Selecione um intervalo de datas válido.")
-        filtered_files = pd.DataFrame()
-    if client_filter:
-        filtered_files = filtered_files[filtered_files['client'].isin(client_filter)]
-    if organization_filter:
-        filtered_files = filtered_files[
-            filtered_files['organization'].apply(lambda x: x.get('name') if isinstance(x, dict) else None).isin(organization_filter)
-        ]
-    if company_filter:
-        filtered_files = filtered_files[
-            filtered_files['company'].apply(lambda x: x.get('name') if isinstance(x, dict) else None).isin(company_filter)
-        ]
-    if workstation_filter:
-        filtered_files = filtered_files[
-            filtered_files['workstation'].apply(lambda x: x.get('name') if isinstance(x, dict) else None).isin(workstation_filter)
-        ]
-    if file_filter:
-        filtered_files = filtered_files[filtered_files['original_name'].str.contains(file_filter, case=False, na=False)]
+    elif show_documents:
+        filtered_files = load_documents(
+            "files",
+            build_query(
+                date_range,
+                equals={"client": client_filter},
+                names={"organization": organization_filter, "company": company_filter, "workstation": workstation_filter},
+                contains={"original_name": file_filter},
+            ),
+            DOCUMENT_FIELDS,
+        )
 
     if not filtered_files.empty:
         filtered_files["organization_name"] = filtered_files["organization"].apply(lambda x: x.get("name") if isinstance(x, dict) else None)
@@ -149,16 +156,30 @@ def render_files_tab(files_df, realtime_files_df):
             use_container_width=True,
             hide_index=True
         )
-    else:
+    elif show_documents:
         st.info("No files found for applied filters.")
+    elif rollup_summary is None and len(date_range) == 2:
+        # Rollups are missing or cannot answer the active filters
+        st.info("Turn on \"Show files\" to see the summaries computed from the documents.")
 
     st.subheader("Status Resume")
-    if not filtered_files.empty:
+    if rollup_summary is not None and not rollup_summary.empty:
+        status_summary = rollup_summary.groupby("status")["count"].sum().reset_index(name="count")
+        st.bar_chart(status_summary.set_index("status"))
+    elif not filtered_files.empty:
         status_summary = filtered_files.groupby("status").size().reset_index(name="count")
         st.bar_chart(status_summary.set_index("status"))
 
     st.subheader("Data Resume")
-    if not filtered_files.empty:
+    date_summary = None
+    if rollup_summary is not None and not rollup_summary.empty:
+        date_summary = (
+            rollup_summary.groupby(["client", "date_only"])["count"]
+            .sum()
+            .reset_index(name="count")
+            .sort_values(["date_only"])
+        )
+    elif not filtered_files.empty:
         filtered_files["date_only"] = pd.to_datetime(filtered_files["created_at"]).dt.date
 
         date_summary = (
@@ -168,6 +189,7 @@ def render_files_tab(files_df, realtime_files_df):
             .sort_values(["date_only"])
         )
 
+    if date_summary is not None:
         display_date_df = date_summary.copy()
         display_date_df.rename(columns={
             "client": "👤 Client",
@@ -1,8 +1,17 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
+from .documents import build_query
+from .rollups import summarize_rollup
 
-def render_reports_tab(reports_df, realtime_reports_df):
+# Fields the reports table and the raw fallback charts read
+DOCUMENT_FIELDS = (
+    "name", "type", "risk", "is_active", "client",
+    "organization.name", "company.name", "workstation.name", "file.original_name",
+    "created_at", "updated_at",
+)
+
+def render_reports_tab(realtime_reports_df, reports_rollup_df, load_documents, load_options):
     st.subheader("📡 Realtime Last Update Reports")
     if not realtime_reports_df.empty:
         f1, f2, f3 = st.columns([1, 2, 2])
@@ -56,58 +65,63 @@ def render_reports_tab(reports_df, realtime_reports_df):
     with col_type:
         type_filter = st.multiselect(
             "Type:",
-            options=reports_df['type'].dropna().unique(),
+            options=load_options("reports", "type"),
             key="reports_type"
         )
 
     col_client, col_org, col_comp, col_ws = st.columns(4)
     with col_client:
-        client_filter = st.multiselect("Client:", options=reports_df['client'].dropna().unique(), key="reports_client")
+        client_filter = st.multiselect("Client:", options=load_options("reports", "client"), key="reports_client")
     with col_org:
         organization_filter = st.multiselect(
             "Organization:",
-            options=reports_df['organization'].apply(lambda x: x.get('name') if isinstance(x, dict) else None).dropna().unique(),
+            options=load_options("reports", "organization.name"),
             key="reports_organization"
         )
     with col_comp:
         company_filter = st.multiselect(
             "Company:",
-            options=reports_df['company'].apply(lambda x: x.get('name') if isinstance(x, dict) else None).dropna().unique(),
+            options=load_options("reports", "company.name"),
             key="reports_company"
         )
     with col_ws:
         workstation_filter = st.multiselect(
             "Workstation:",
-            options=reports_df['workstation'].apply(lambda x: x.get('name') if isinstance(x, dict) else None).dropna().unique(),
+            options=load_options("reports", "workstation.name"),
             key="reports_workstation"
         )
     
 
-    filtered_reports = reports_df.copy()
-    filtered_reports = filtered_reports[
-        (filtered_reports['created_at'] >= pd.to_datetime(date_range[0])) &
-        (filtered_reports['created_at'] <= pd.to_datetime(date_range[1]))
-    ]
-    if client_filter:
-        filtered_reports = filtered_reports[filtered_reports['client'].isin(client_filter)]
-    if organization_filter:
-        filtered_reports = filtered_reports[
-            filtered_reports['organization'].apply(lambda x: x.get('name') if isinstance(x, dict) else None).isin(organization_filter)
-        ]
-    if company_filter:
-        filtered_reports = filtered_reports[
-            filtered_reports['company'].apply(lambda x: x.get('name') if isinstance(x, dict) else None).isin(company_filter)
-        ]
-    if workstation_filter:
-        filtered_reports = filtered_reports[
-            filtered_reports['workstation'].apply(lambda x: x.get('name') if isinstance(x, dict) else None).isin(workstation_filter)
-        ]
-    if type_filter:
-        filtered_reports = filtered_reports[filtered_reports['type'].isin(type_filter)]
-    if file_filter:
-        filtered_reports = filtered_reports[filtered_reports['name'].str.contains(file_filter, case=False, na=False)]
-
-    st.write(f"Total: {len(filtered_reports)}")
+    # Rollups mantidos pelo ETL evitam agrupar os documentos brutos quando os filtros permitem
+    rollup_summary = summarize_rollup(
+        reports_rollup_df,
+        date_range,
+        {"client": client_filter, "type": type_filter},
+        [organization_filter, company_filter, workstation_filter, file_filter]
+    )
+
+    # Raw documents are only fetched, filtered and projected, when the table is shown
+    show_documents = st.toggle("Show reports", key="reports_show_documents")
+    filtered_reports = pd.DataFrame()
+    if len(date_range) != 2:
+        st.warning("Selecione um intervalo de datas válido.")
+    elif show_documents:
+        filtered_reports = load_documents(
+            "reports",
+            build_query(
+                date_range,
+                equals={"client": client_filter, "type": type_filter},
+                names={"organization": organization_filter, "company": company_filter, "workstation": workstation_filter},
+                contains={"name": file_filter},
+            ),
+            DOCUMENT_FIELDS,
+        )
+
+    if rollup_summary is not None:
+        st.write(f"Total: {rollup_summary['count'].sum()}")
+    elif show_documents:
+        st.write(f"Total: {len(filtered_reports)}")
+
     if not filtered_reports.empty:
         st.subheader("📊 Reports Overview")
         filtered_reports["organization_name"] = filtered_reports["organization"].apply(
@@ -169,16 +183,31 @@ def render_reports_tab(reports_df, realtime_reports_df):
             use_container_width=True,
             hide_index=True,
         )
-    else:
+    elif show_documents:
         st.info("Nenhum report encontrado para os filtros aplicados.")
+    elif rollup_summary is None and len(date_range) == 2:
+        # Rollups are missing or cannot answer the active filters
+        st.info("Ative \"Show reports\" para ver os resumos calculados a partir dos documentos.")
 
     st.subheader("Resumo por risco")
-    if not filtered_reports.empty:
+    if rollup_summary is not None and not rollup_summary.empty:
+        risk_summary = rollup_summary.groupby("risk")["count"].sum().reset_index(name="count")
+        st.bar_chart(risk_summary.set_index("risk"))
+    elif not filtered_reports.empty:
         risk_summary = filtered_reports.groupby("risk").size().reset_index(name="count")
         st.bar_chart(risk_summary.set_index("risk"))
 
     st.subheader("Resumo por data")
-    if not filtered_reports.empty:
+    date_summary = None
+    if rollup_summary is not None and not rollup_summary.empty:
+        date_summary = (
+            rollup_summary
+            .groupby(["type", "client", "date_only"])["count"]
+            .sum()
+            .reset_index(name="count")
+            .sort_values(["date_only"])
+        )
+    elif not filtered_reports.empty:
     # Criar coluna de data
         filtered_reports["date_only"] = pd.to_datetime(filtered_reports["created_at"]).dt.date
 
@@ -191,6 +220,7 @@ def render_reports_tab(reports_df, realtime_reports_df):
             .sort_values(["date_only"])
         )
 
+    if date_summary is not None:
         # Preparar display_df padronizado
         display_date_df = date_summary.copy()
         display_date_df.rename(columns={
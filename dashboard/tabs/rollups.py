@@ -0,0 +1,22 @@
+import pandas as pd
+
+def date_bounds(date_range):
+    """Início e fim exclusivo do intervalo, para que o dia final entre inteiro"""
+    start = pd.to_datetime(date_range[0])
+    end = pd.to_datetime(date_range[1]) + pd.Timedelta(days=1)
+    return start, end
+
+def summarize_rollup(rollup_df, date_range, filters, unsupported_filters):
+    """Filtra o rollup diário; retorna None quando algum filtro ativo não existe no rollup"""
+    if rollup_df is None or rollup_df.empty or len(date_range) != 2 or any(unsupported_filters):
+        return None
+
+    start, end = date_bounds(date_range)
+    summary = rollup_df[(rollup_df["day"] >= start) & (rollup_df["day"] < end)]
+    for column, selected in filters.items():
+        if selected:
+            summary = summary[summary[column].isin(selected)]
+
+    summary = summary.copy()
+    summary["date_only"] = pd.to_datetime(summary["day"]).dt.date
+    return summary
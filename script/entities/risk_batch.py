@@ -0,0 +1,158 @@
+from typing import Any, Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from utils import (
+    KIM_PUSH_PULL_RISK,
+    KIM_PUSH_PULL_RISK_MAX_SCORE,
+    REBA_RISK,
+    REBA_RISK_MAX_SCORE,
+    STRAIN_INDEX_RISK,
+    STRAIN_INDEX_RISK_MAX_SCORE,
+    KIM_MHO_RISK,
+    KIM_MHO_RISK_MAX_SCORE,
+    KIM_MHO_RATING_POINTS,
+)
+from .risk_tables import FORCE_KEYS, FORCE_TABLES, INTENSITY_ROWS, RATING_POINTS
+
+Columns = Dict[str, Sequence[Any]]
+
+KIM_MHO_FORCE_COLUMNS = tuple(
+    f"{side}_force_{field}" for side in ("left", "right") for field in ("intensity", "frequency", "type")
+)
+
+# Columns each report type reads, in the same order as the scalar path
+BATCH_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "reba": ("score_seconds",),
+    "kim_pp": ("score",),
+    "strain_index": ("score_left_rsi", "score_right_rsi"),
+    "niosh": ("risk",),
+    "kim_mho": ("duration",) + tuple(KIM_MHO_RATING_POINTS) + KIM_MHO_FORCE_COLUMNS,
+}
+
+def is_available() -> bool:
+    return np is not None
+
+def to_columns(report_name: str, reports: List[Dict[str, Any]]) -> Columns:
+    """Transpõe as linhas para as colunas usadas pelo tipo de report"""
+    return {column: [report.get(column) for report in reports] for column in BATCH_COLUMNS[report_name]}
+
+def calculate_risk_batch(report_name: str, columns: Columns) -> "np.ndarray":
+    """Calcula o risco de um lote de um único tipo de report a partir de colunas"""
+    if np is None:
+        raise RuntimeError("Batch risk scoring requires numpy to be installed")
+    return _BATCH_CALCULATORS[report_name](columns)
+
+def _numeric(values: Sequence[Any]) -> "np.ndarray":
+    # None becomes NaN so every comparison with it is False; the None branches themselves use _missing
+    return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+
+def _missing(values: Sequence[Any]) -> "np.ndarray":
+    # Only None takes the scalar "missing" branch; NaN goes through the comparisons, which are all False
+    return np.fromiter((value is None for value in values), dtype=bool, count=len(values))
+
+def _categorical(values: Sequence[Any]) -> "np.ndarray":
+    return np.array(values, dtype=object)
+
+def _lookup(values: Sequence[Any], table: Dict[Any, Any], default: Any) -> "np.ndarray":
+    """Converte uma coluna categórica em números pela tabela; valores ausentes ou desconhecidos usam o padrão"""
+    return np.fromiter((table.get(value, default) for value in values), dtype=np.float64, count=len(values))
+
+def _select(conditions: List["np.ndarray"], choices: List[str], default: str) -> "np.ndarray":
+    # np.select keeps the first matching condition, exactly like the if-chains of the scalar path
+    return np.select(conditions, np.array(choices, dtype=object), default=np.array(default, dtype=object))
+
+def _reba(columns: Columns) -> "np.ndarray":
+    score = _numeric(columns["score_seconds"])
+    missing = _missing(columns["score_seconds"])
+    return _select(
+        [
+            missing | (score <= REBA_RISK_MAX_SCORE["LOW"]),
+            score <= REBA_RISK_MAX_SCORE["NEGLIGIBLE_RISK"],
+            score <= REBA_RISK_MAX_SCORE["MEDIUM"],
+            score <= REBA_RISK_MAX_SCORE["HIGH"],
+        ],
+        [REBA_RISK["LOW"], REBA_RISK["NEGLIGIBLE_RISK"], REBA_RISK["MEDIUM"], REBA_RISK["HIGH"]],
+        REBA_RISK["VERY_HIGH_RISK"],
+    )
+
+def _kim_push_pull(columns: Columns) -> "np.ndarray":
+    score = _numeric(columns["score"])
+    return _select(
+        [
+            _missing(columns["score"]) | (score < KIM_PUSH_PULL_RISK_MAX_SCORE["LOW"]),
+            score < KIM_PUSH_PULL_RISK_MAX_SCORE["MODERATE"],
+        ],
+        [KIM_PUSH_PULL_RISK["LOW"], KIM_PUSH_PULL_RISK["MODERATE"]],
+        KIM_PUSH_PULL_RISK["HIGH"],
+    )
+
+def _strain_index(columns: Columns) -> "np.ndarray":
+    left = _numeric(columns["score_left_rsi"])
+    right = _numeric(columns["score_right_rsi"])
+    safe_max = STRAIN_INDEX_RISK_MAX_SCORE["SAFE"]
+    return _select(
+        [
+            _missing(columns["score_left_rsi"]) | _missing(columns["score_right_rsi"]),
+            (left < safe_max) & (right < safe_max),
+        ],
+        [STRAIN_INDEX_RISK["SAFE"], STRAIN_INDEX_RISK["SAFE"]],
+        STRAIN_INDEX_RISK["HAZARDOUS"],
+    )
+
+def _niosh(columns: Columns) -> "np.ndarray":
+    risk = _categorical(columns["risk"])
+    return np.where(np.equal(risk, None), "LOW", risk).astype(object)
+
+_FORCE_TABLES = [
+    (type_name, np.array(matrix, dtype=np.float64), np.array(frequencies, dtype=np.float64))
+    for type_name, (matrix, frequencies) in FORCE_TABLES.items()
+] if np is not None else []
+
+def _force_points(columns: Columns, side: str) -> "np.ndarray":
+    type_key, intensity_key, frequency_key = FORCE_KEYS[side]
+    frequency = _numeric(columns[frequency_key])
+    type_ = _categorical(columns[type_key])
+
+    intensity_index = _lookup(columns[intensity_key], INTENSITY_ROWS, -1).astype(np.int64)
+    valid = (intensity_index >= 0) & ~np.isnan(frequency)
+    points = np.zeros(len(frequency), dtype=np.float64)
+
+    for type_name, matrix, frequencies in _FORCE_TABLES:
+        # First frequency >= value, the same bucket as the scalar linear scan
+        frequency_index = np.searchsorted(frequencies, np.nan_to_num(frequency, nan=np.inf), side="left")
+        rows = valid & np.equal(type_, type_name) & (frequency_index < len(frequencies))
+        points[rows] = matrix[intensity_index[rows], frequency_index[rows]]
+
+    return points
+
+def _kim_mho(columns: Columns) -> "np.ndarray":
+    duration = _numeric(columns["duration"])
+
+    subtotal = np.zeros(len(duration), dtype=np.float64)
+    for key, points in RATING_POINTS:
+        subtotal = subtotal + _lookup(columns[key], points, 0)
+
+    score = subtotal + np.maximum(_force_points(columns, "left"), _force_points(columns, "right"))
+    total_score = score * duration
+    return _select(
+        [
+            _missing(columns["duration"]),
+            total_score < KIM_MHO_RISK_MAX_SCORE["LOW"],
+            total_score < KIM_MHO_RISK_MAX_SCORE["SLIGHTLY_INCREASED"],
+            total_score < KIM_MHO_RISK_MAX_SCORE["SUBSTANTIALLY_INCREASED"],
+        ],
+        [KIM_MHO_RISK["LOW"], KIM_MHO_RISK["LOW"], KIM_MHO_RISK["SLIGHTLY_INCREASED"], KIM_MHO_RISK["SUBSTANTIALLY_INCREASED"]],
+        KIM_MHO_RISK["HIGH"],
+    )
+
+_BATCH_CALCULATORS = {
+    "reba": _reba,
+    "kim_pp": _kim_push_pull,
+    "strain_index": _strain_index,
+    "niosh": _niosh,
+    "kim_mho": _kim_mho,
+}
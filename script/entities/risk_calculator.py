@@ -1,6 +1,7 @@
-from typing import Any, Dict, Optional, Literal
+from typing import Any, Dict, List, Optional, Literal
 
 from utils import (
+    env,
     KIM_PUSH_PULL_RISK,
     KIM_PUSH_PULL_RISK_MAX_SCORE,
     REBA_RISK,
@@ -9,35 +10,45 @@ from utils import (
     STRAIN_INDEX_RISK_MAX_SCORE,
     KIM_MHO_RISK,
     KIM_MHO_RISK_MAX_SCORE,
-    KIM_MHO_HOLDING_MATRIX,
-    KIM_MHO_MATRIX,
-    KIM_MHO_HOLDING_FREQUENCIES,
-    KIM_MHO_MOVING_FREQUENCIES,
-    KIM_MHO_RATING_POINTS,
-    KIM_MHO_INTENSITIES,
 )
+from . import risk_batch
+from .risk_tables import FORCE_KEYS, RATING_POINTS, force_points
 
 class RiskCalculator:
 
-    _map_report_to_risk = {}
+    _map_report_to_risk: Dict[str, Any] = {}
 
     @classmethod
     def calculate_risk(cls, report_name: Literal["reba", "niosh", "kim_push_pull", "strain_index", "kim_mho"], report: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        cls._map_report_to_risk = {
-            "reba": cls._calculate_reba_risk,
-            "niosh": cls._calculate_niosh_risk,
-            "kim_pp": cls._calculate_kim_push_pull_risk,
-            "strain_index": cls._calculate_strain_index_risk,
-            "kim_mho": cls._calculate_kim_mho_risk
-        }
+        risk = cls.calculate_risk_value(report_name, report)
+        if risk is None:
+            return None
+
+        return {**report, "risk": risk}
 
+    @classmethod
+    def calculate_risk_value(cls, report_name: Literal["reba", "niosh", "kim_pp", "strain_index", "kim_mho"], report: Dict[str, Any]) -> Optional[str]:
+        """Calcula apenas o risco do report, sem copiar a linha"""
         calculate_risk_fn = cls._map_report_to_risk.get(report_name)
         if not calculate_risk_fn or not report:
             return None
 
-        risk = calculate_risk_fn(report)
+        return calculate_risk_fn(report)
 
-        return {**report, "risk": risk}
+    @classmethod
+    def calculate_risk_batch(cls, report_name: Literal["reba", "niosh", "kim_pp", "strain_index", "kim_mho"], columns: Dict[str, List[Any]]) -> List[Any]:
+        """Calcula o risco de um lote a partir de colunas, com o mesmo resultado do cálculo por linha"""
+        return risk_batch.calculate_risk_batch(report_name, columns).tolist()
+
+    @classmethod
+    def calculate_risks(cls, report_name: Literal["reba", "niosh", "kim_pp", "strain_index", "kim_mho"], reports: List[Dict[str, Any]]) -> List[Any]:
+        """Calcula o risco de cada report do lote, vetorizado quando o numpy está disponível"""
+        if not reports:
+            return []
+        if env.VECTORIZED_RISK and risk_batch.is_available():
+            return cls.calculate_risk_batch(report_name, risk_batch.to_columns(report_name, reports))
+        calculate_risk_value = cls.calculate_risk_value
+        return [calculate_risk_value(report_name, report) for report in reports]
 
     @staticmethod
     def _calculate_reba_risk(report: Dict[str, Any]):
@@ -86,7 +97,8 @@ class RiskCalculator:
             return KIM_MHO_RISK["LOW"]
             
         score = RiskCalculator._calculate_kim_mho_score(report)
-        total_score = score * duration
+        # MySQL DECIMAL durations come back as Decimal, which does not multiply with the float points
+        total_score = score * float(duration)
 
         if total_score < KIM_MHO_RISK_MAX_SCORE["LOW"]:
             return KIM_MHO_RISK["LOW"]
@@ -99,50 +111,24 @@ class RiskCalculator:
 
     @staticmethod
     def _calculate_kim_mho_score(report: Dict[str, Any]) -> float:
-        rating_points = KIM_MHO_RATING_POINTS
         subtotal_points = 0
-        
-        for key in rating_points:
-            value = report.get(key)
-            if value is not None and value in rating_points[key]:
-                subtotal_points += rating_points[key][value]
-                
-        force_exertion_points = [
+        for key, points in RATING_POINTS:
+            subtotal_points += points.get(report.get(key), 0)
+
+        return subtotal_points + max(
             RiskCalculator._calculate_force_exertion_points(report, side="left"),
             RiskCalculator._calculate_force_exertion_points(report, side="right"),
-        ]
-
-        return subtotal_points + max(force_exertion_points)
+        )
 
     @staticmethod
     def _calculate_force_exertion_points(report: Dict[str, Any], side: str) -> float:
-        intensity = report.get(f"{side}_force_intensity")
-        frequency = report.get(f"{side}_force_frequency")
-        type_ = report.get(f"{side}_force_type")
-
-        if intensity is None or frequency is None or type_ is None:
-            return 0
-
-        if type_ == "HOLDING":
-            points_table = KIM_MHO_HOLDING_MATRIX
-            frequencies = KIM_MHO_HOLDING_FREQUENCIES
-        elif type_ == "MOVING":
-            points_table = KIM_MHO_MATRIX
-            frequencies = KIM_MHO_MOVING_FREQUENCIES
-        else:
-            return 0
-
-        try:
-            intensity_index = KIM_MHO_INTENSITIES.index(intensity)
-        except ValueError:
-            return 0
-
-        frequency_index = next((i for i, f in enumerate(frequencies) if f >= frequency), None)
-        if frequency_index is None:
-            return 0
-
-        points = points_table[intensity_index][frequency_index]
-        if points is None:
-            return 0
-
-        return points
\ No newline at end of file
+        type_key, intensity_key, frequency_key = FORCE_KEYS[side]
+        return force_points(report.get(type_key), report.get(intensity_key), report.get(frequency_key))
+
+RiskCalculator._map_report_to_risk = {
+    "reba": RiskCalculator._calculate_reba_risk,
+    "niosh": RiskCalculator._calculate_niosh_risk,
+    "kim_pp": RiskCalculator._calculate_kim_push_pull_risk,
+    "strain_index": RiskCalculator._calculate_strain_index_risk,
+    "kim_mho": RiskCalculator._calculate_kim_mho_risk
+}
@@ -0,0 +1,48 @@
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+from utils import (
+    KIM_MHO_HOLDING_MATRIX,
+    KIM_MHO_MATRIX,
+    KIM_MHO_HOLDING_FREQUENCIES,
+    KIM_MHO_MOVING_FREQUENCIES,
+    KIM_MHO_RATING_POINTS,
+    KIM_MHO_INTENSITIES,
+)
+
+ForceTable = Tuple[Tuple[Tuple[float, ...], ...], Tuple[float, ...]]
+
+def _compile_matrix(points_table: List[List[Any]]) -> Tuple[Tuple[float, ...], ...]:
+    # Missing cells score 0, the same as an unknown intensity or frequency
+    return tuple(tuple(0 if points is None else points for points in row) for row in points_table)
+
+INTENSITY_ROWS: Dict[str, int] = {intensity: index for index, intensity in enumerate(KIM_MHO_INTENSITIES)}
+
+FORCE_TABLES: Dict[str, ForceTable] = {
+    "HOLDING": (_compile_matrix(KIM_MHO_HOLDING_MATRIX), tuple(KIM_MHO_HOLDING_FREQUENCIES)),
+    "MOVING": (_compile_matrix(KIM_MHO_MATRIX), tuple(KIM_MHO_MOVING_FREQUENCIES)),
+}
+
+RATING_POINTS: Tuple[Tuple[str, Dict[Any, Any]], ...] = tuple(KIM_MHO_RATING_POINTS.items())
+
+# (type, intensity, frequency) report keys per side, built once instead of per row
+FORCE_KEYS: Dict[str, Tuple[str, str, str]] = {
+    side: (f"{side}_force_type", f"{side}_force_intensity", f"{side}_force_frequency") for side in ("left", "right")
+}
+
+@lru_cache(maxsize=4096)
+def force_points(type_: Any, intensity: Any, frequency: Any) -> float:
+    """Pontos de força de um lado, memorizados por (tipo, intensidade, frequência)"""
+    table = FORCE_TABLES.get(type_)
+    row = INTENSITY_ROWS.get(intensity)
+    # NaN never matches a frequency bucket, as in the linear scan
+    if table is None or row is None or frequency is None or frequency != frequency:
+        return 0
+
+    matrix, frequencies = table
+    # First frequency >= value
+    column = bisect_left(frequencies, frequency)
+    if column == len(frequencies):
+        return 0
+    return matrix[row][column]
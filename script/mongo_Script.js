@@ -29,6 +29,7 @@ db.createCollection("reports", {
   });
 
   db.reports.createIndex({ created_at: 1 });
+  db.reports.createIndex({ report_id: 1, type: 1, created_at: 1, client: 1 }, { name: "report_upsert", unique: true });
 
 
   db.createCollection("realtime_reports", {
@@ -57,7 +58,7 @@ db.createCollection("reports", {
 
   db.realtime_reports.createIndex({ created_at: 1 });
 
-  db.createCollection("report_control", {
+  db.createCollection("reports_control", {
     validator: {
       $jsonSchema: {
         bsonType: "object",
@@ -73,7 +74,7 @@ db.createCollection("reports", {
     }
   });
 
-  db.report_control.createIndex({ extracted_at: 1 });
+  db.reports_control.createIndex({ extracted_at: -1 }, { name: "extracted_at_desc" });
 
   db.createCollection("files", {
     validator: {
@@ -137,7 +138,8 @@ db.createCollection("reports", {
     }
   });
     
-  db.file_risks.createIndex({ created_at: 1 });
+  db.files.createIndex({ created_at: 1 });
+  db.files.createIndex({ file_id: 1, created_at: 1, client: 1 }, { name: "file_upsert", unique: true });
   
   db.createCollection("realtime_files", {
     validator: {
@@ -177,7 +179,7 @@ db.createCollection("reports", {
     }
   });
   
-  db.createCollection("file_control", {
+  db.createCollection("files_control", {
     validator: {
       $jsonSchema: {
         bsonType: "object",
@@ -193,7 +195,7 @@ db.createCollection("reports", {
     }
   });
 
-  db.file_control.createIndex({ extracted_at: 1 });
+  db.files_control.createIndex({ extracted_at: -1 }, { name: "extracted_at_desc" });
   
   db.createCollection("action_plans", {
     validator: {
@@ -262,6 +264,7 @@ db.createCollection("reports", {
   });
     
   db.action_plans.createIndex({ created_at: 1 });
+  db.action_plans.createIndex({ action_plan_id: 1, created_at: 1, client: 1 }, { name: "action_plan_upsert", unique: true });
   
   db.createCollection("realtime_action_plans_actions", {
     validator: {
@@ -336,5 +339,5 @@ db.createCollection("reports", {
     }
   });
 
-  db.action_plans_control.createIndex({ extracted_at: 1 });
+  db.action_plans_control.createIndex({ extracted_at: -1 }, { name: "extracted_at_desc" });
   
\ No newline at end of file
@@ -2,10 +2,14 @@ from .base import BaseOrchestrator
 from .reports_orchestrator import ReportsOrchestrator
 from .files_orchestrator import FilesOrchestrator
 from .action_plan_orchestrator import ActionPlanOrchestrator
+from .pipeline import PipelineRunner
+from .job_graph import JobGraph
 
 __all__ = [
     "BaseOrchestrator",
     "ReportsOrchestrator", 
     "FilesOrchestrator",
-    "ActionPlanOrchestrator"
+    "ActionPlanOrchestrator",
+    "PipelineRunner",
+    "JobGraph"
 ]
@@ -1,35 +1,74 @@
 import asyncio
+import time
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from repositories import MysqlRepository, MongoRepository
+from sinks import SinkFanOut
 from services import ActionPlanService
 from _types import BaseParams
+from utils import env
 from .base import BaseOrchestrator
+from .pipeline import PipelineRunner
 
 class ActionPlanOrchestrator(BaseOrchestrator):
-    def __init__(self, mongo_repository: MongoRepository):
-        super().__init__(mongo_repository)
+    def __init__(self, mongo_repository: MongoRepository, sinks: Optional[SinkFanOut] = None):
+        super().__init__(mongo_repository, sinks)
         self.action_plans_collection = "action_plans"
         self.realtime_action_plans_collection = "realtime_action_plans_actions"
+        self.realtime_action_plans_key = ("action_plan_history_id", "client")
         self.action_plans_control_collection = "action_plans_control"
+        self.default_start = datetime(2023, 1, 1, 0, 0, 0, 0)
+        self.default_end = datetime(2023, 1, 1, 23, 59, 59, 999999)
     
     async def run_action_plans_etl(self, repository_standard: MysqlRepository, repository_john_deere: MysqlRepository) -> None:
+        self.sinks.reset_errors(self.action_plans_collection)
         last_action_plan_control = await self.mongo_repository.base_get_last_control(self.action_plans_control_collection)
         
-        default_start = datetime(2023, 1, 1, 0, 0, 0, 0)
-        default_end = datetime(2023, 1, 1, 23, 59, 59, 999999)
-        start_date, end_date = self._calculate_date_range(last_action_plan_control, default_start, default_end)
+        if env.BACKFILL_AUTO and self._is_lagging(last_action_plan_control, self.default_start, self.default_end):
+            self._log_with_timestamp("Action plans: Control is lagging behind. Running backfill.")
+            await self.run_action_plans_backfill(repository_standard, repository_john_deere)
+            return
+        
+        start_date, end_date = self._calculate_date_range(last_action_plan_control, self.default_start, self.default_end)
         
         if self._should_skip_etl(end_date):
             self._log_with_timestamp("Action plans: Difference less than 5 minutes. Skipping ETL.")
             return
         
-        self._log_with_timestamp(f"Starting ETL action plans for the period of {start_date} to {end_date}")
+        parts = self._calculate_window_parts(last_action_plan_control, start_date, end_date)
+        self._log_with_timestamp(f"Starting ETL action plans for the period of {start_date} to {end_date} in {parts} sub-window(s)")
         params = BaseParams(start_date=start_date, end_date=end_date)
         
-        all_action_plans = await self._execute_all_action_plans(params, repository_standard, repository_john_deere)
-        
-        await self._save_action_plans(all_action_plans, start_date, end_date)
+        started = time.perf_counter()
+        rows = await self._extract_and_load_action_plans(params, repository_standard, repository_john_deere, parts)
+        await self._insert_control(self.action_plans_control_collection, start_date, end_date, rows, time.perf_counter() - started)
+    
+    async def run_action_plans_backfill(self, repository_standard: MysqlRepository, repository_john_deere: MysqlRepository, max_windows: Optional[int] = None) -> int:
+        self.sinks.reset_errors(self.action_plans_collection)
+        last_action_plan_control = await self.mongo_repository.base_get_last_control(self.action_plans_control_collection)
+        windows = self._plan_windows(last_action_plan_control, self.default_start, self.default_end, max_windows or env.BACKFILL_MAX_WINDOWS)
+        if not windows:
+            self._log_with_timestamp("Action plans: Nothing to backfill.")
+            return 0
+        
+        parts = self._calculate_window_parts(last_action_plan_control, windows[0]["start_date"], windows[0]["end_date"])
+        self._log_with_timestamp(f"Starting backfill action plans for {len(windows)} window(s) from {windows[0]['start_date']} to {windows[-1]['end_date']}")
+        return await self._run_backfill(
+            windows,
+            lambda params: self._extract_and_load_action_plans(params, repository_standard, repository_john_deere, parts),
+            self.action_plans_control_collection
+        )
+    
+    async def _extract_and_load_action_plans(self, params: BaseParams, repo_standard: MysqlRepository, repo_john_deere: MysqlRepository, parts: int = 1) -> int:
+        if env.ETL_PIPELINE:
+            rows = await self._run_action_plans_pipeline(params, repo_standard, repo_john_deere, parts)
+            await self._flush_sinks(self.action_plans_collection)
+            self._log_with_timestamp(f"Total action plans: {rows}")
+            return rows
+        
+        rows = await self._stream_all_action_plans(params, repo_standard, repo_john_deere, parts)
+        await self._flush_sinks(self.action_plans_collection)
+        return rows
     
     async def run_realtime_action_plans_etl(self, repository_standard: MysqlRepository, repository_john_deere: MysqlRepository) -> None:
         self._log_with_timestamp("Starting ETL real time action plans")
@@ -38,25 +77,31 @@ class ActionPlanOrchestrator(BaseOrchestrator):
         
         await self._save_realtime_action_plans(all_action_plans)
     
-    async def _execute_all_action_plans(self, params: BaseParams, repo_standard: MysqlRepository, repo_john_deere: MysqlRepository) -> List:
+    async def _stream_all_action_plans(self, params: BaseParams, repo_standard: MysqlRepository, repo_john_deere: MysqlRepository, parts: int = 1) -> int:
         tasks = []
         
-        tasks.append(self._run_action_plans_for_client(params, repo_standard, "standard"))
+        tasks.append(self._run_action_plans_for_client(params, repo_standard, "standard", parts))
         
-        tasks.append(self._run_action_plans_for_client(params, repo_john_deere, "john_deere"))
+        tasks.append(self._run_action_plans_for_client(params, repo_john_deere, "john_deere", parts))
         
-        results = await asyncio.gather(*tasks)
+        standard_action_plans, john_deere_action_plans = await asyncio.gather(*tasks)
         
-        standard_action_plans = results[0]
-        john_deere_action_plans = results[1]
+        self._log_with_timestamp(f"Action plans standard: {standard_action_plans}")
+        self._log_with_timestamp(f"Action plans john_deere: {john_deere_action_plans}")
         
-        self._log_with_timestamp(f"Action plans standard: {len(standard_action_plans)}")
-        self._log_with_timestamp(f"Action plans john_deere: {len(john_deere_action_plans)}")
+        total_action_plans = standard_action_plans + john_deere_action_plans
         
-        all_action_plans = standard_action_plans + john_deere_action_plans
+        self._log_with_timestamp(f"Total action plans: {total_action_plans}")
+        return total_action_plans
+    
+    async def _run_action_plans_pipeline(self, params: BaseParams, repo_standard: MysqlRepository, repo_john_deere: MysqlRepository, parts: int = 1) -> int:
+        sources = []
+        for repository in (repo_standard, repo_john_deere):
+            service = ActionPlanService(repository)
+            for window in self._split_params(params, parts):
+                sources.append((service.get_batches(window), service.transform_async))
         
-        self._log_with_timestamp(f"Total action plans: {len(all_action_plans)}")
-        return all_action_plans
+        return await PipelineRunner().run(sources, self._load_action_plans)
     
     async def _execute_all_realtime_action_plans(self, repo_standard: MysqlRepository, repo_john_deere: MysqlRepository) -> List:
         tasks = []
@@ -78,10 +123,10 @@ class ActionPlanOrchestrator(BaseOrchestrator):
         self._log_with_timestamp(f"Total realtime action plans: {len(all_action_plans)}")
         return all_action_plans
     
-    async def _run_action_plans_for_client(self, params: BaseParams, repository: MysqlRepository, client_name: str) -> List:
+    async def _run_action_plans_for_client(self, params: BaseParams, repository: MysqlRepository, client_name: str, parts: int = 1) -> int:
         try:
             service = ActionPlanService(repository)
-            return await service.get_action_plan(params)
+            return await self._stream_fan_out(service.iter_action_plans, self._split_params(params, parts), self._load_action_plans)
         except Exception as e:
             self._log_with_timestamp(f"Error in action plans for {client_name}: {e}")
             raise e
@@ -94,17 +139,14 @@ class ActionPlanOrchestrator(BaseOrchestrator):
             self._log_with_timestamp(f"Error in realtime action plans for {client_name}: {e}")
             raise e
     
-    async def _save_action_plans(self, all_action_plans: List, start_date: datetime, end_date: datetime) -> None:
-        await self.mongo_repository.bulk_upsert_action_plans(self.action_plans_collection, all_action_plans)
-        
-        data = {
-            "start_date": start_date,
-            "end_date": end_date,
-            "extracted_at": datetime.now(),
-            "rows": len(all_action_plans)
-        }
-        await self.mongo_repository.base_insert_control(self.action_plans_control_collection, data)
+    async def _load_action_plans(self, action_plans: List) -> None:
+        await self.sinks.write(self.action_plans_collection, action_plans)
     
     async def _save_realtime_action_plans(self, all_action_plans: List) -> None:
+        if env.REALTIME_SYNC_MODE == "diff":
+            result = await self.mongo_repository.diff_sync_realtime(self.realtime_action_plans_collection, all_action_plans, self.realtime_action_plans_key)
+            self._log_with_timestamp(f"Synced {len(all_action_plans)} realtime action plans: {result}")
+            return
+        
         self._log_with_timestamp(f"Inserting {len(all_action_plans)} realtime action plans")
         await self.mongo_repository.base_bulk_insert_realtime(self.realtime_action_plans_collection, all_action_plans)
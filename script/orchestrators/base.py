@@ -1,28 +1,175 @@
+import asyncio
+import math
+import time
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
 from repositories import MongoRepository
+from sinks import MongoSink, SinkFanOut
+from _types import BaseParams
 from utils import env
 
+# Windows must end at least this far in the past to be extracted
+SKIP_THRESHOLD_MINUTES = 5
+
 class BaseOrchestrator:
     """Classe base para orquestradores ETL"""
     
-    def __init__(self, mongo_repository: MongoRepository):
+    def __init__(self, mongo_repository: MongoRepository, sinks: Optional[SinkFanOut] = None):
         self.mongo_repository = mongo_repository
+        self.sinks = sinks or SinkFanOut([MongoSink(mongo_repository)])
     
     def _calculate_date_range(self, last_control: Optional[Dict], default_start: datetime, default_end: datetime) -> tuple[datetime, datetime]:
         """Calcula o range de datas baseado no último controle"""
-        diff_type = env.DIFF_TYPE
-        offset = int(env.OFFSET)
         if last_control:
             start_date = last_control["end_date"] + timedelta(seconds=1)
-            end_date = last_control["end_date"] + timedelta(**{diff_type: offset})
+            end_date = self._clamp_end_date(start_date, last_control["end_date"] + self._calculate_window_size(last_control))
         else:
             start_date = default_start
             end_date = default_end
         
         return start_date, end_date
     
-    def _should_skip_etl(self, end_date: datetime, minutes_threshold: int = 5) -> bool:
+    def _clamp_end_date(self, start_date: datetime, end_date: datetime) -> datetime:
+        """Impede que a janela termine depois de agora menos o limite de espera, encurtando-a perto do presente"""
+        latest = datetime.now() - timedelta(minutes=SKIP_THRESHOLD_MINUTES)
+        # A window that cannot end after its start is left ending at the start, which _should_skip_etl skips
+        return min(end_date, max(latest, start_date))
+    
+    def _calculate_window_size(self, last_control: Dict) -> timedelta:
+        """Calcula o tamanho da próxima janela a partir das linhas e do tempo da última"""
+        window_size = timedelta(**{env.DIFF_TYPE: int(env.OFFSET)})
+        if not env.ADAPTIVE_WINDOW or "start_date" not in last_control:
+            return window_size
+
+        previous_size = last_control["end_date"] - last_control["start_date"]
+        if previous_size.total_seconds() <= 0:
+            return window_size
+
+        max_growth = env.ADAPTIVE_WINDOW_MAX_GROWTH
+        rows = last_control.get("rows")
+        duration_seconds = last_control.get("duration_seconds")
+        factors = [env.WINDOW_TARGET_ROWS / rows if rows else max_growth]
+        if duration_seconds:
+            factors.append(env.WINDOW_TARGET_SECONDS / duration_seconds)
+
+        factor = min(max(min(factors), 1 / max_growth), max_growth)
+        seconds = previous_size.total_seconds() * factor
+        seconds = min(max(seconds, env.ADAPTIVE_WINDOW_MIN_SECONDS), env.ADAPTIVE_WINDOW_MAX_SECONDS)
+        return timedelta(seconds=seconds)
+    
+    def _calculate_window_parts(self, last_control: Optional[Dict], start_date: datetime, end_date: datetime) -> int:
+        """Calcula em quantas sub-janelas a janela deve ser dividida"""
+        if env.WINDOW_SPLIT_MODE == "rows":
+            if not last_control or not last_control.get("rows"):
+                return 1
+            control_seconds = (last_control["end_date"] - last_control["start_date"]).total_seconds()
+            if control_seconds <= 0:
+                return 1
+            rows_per_second = last_control["rows"] / control_seconds
+            estimated_rows = rows_per_second * (end_date - start_date).total_seconds()
+            parts = math.ceil(estimated_rows / env.WINDOW_TARGET_ROWS)
+        else:
+            parts = env.WINDOW_PARTS
+
+        return max(1, min(parts, env.WINDOW_MAX_PARTS))
+    
+    def _split_params(self, params: BaseParams, parts: int) -> List[BaseParams]:
+        """Divide a janela em sub-janelas contíguas e sem sobreposição"""
+        if parts <= 1:
+            return [params]
+
+        start_date = params["start_date"]
+        end_date = params["end_date"]
+        step = (end_date - start_date) / parts
+        windows = []
+        for i in range(parts):
+            sub_start = start_date + step * i
+            sub_end = end_date if i == parts - 1 else start_date + step * (i + 1) - timedelta(microseconds=1)
+            windows.append(BaseParams(start_date=sub_start, end_date=sub_end))
+        return windows
+    
+    async def _stream_fan_out(self, iterate: Callable[[BaseParams], AsyncIterator[List[Any]]], windows: List[BaseParams], load: Callable[[List[Any]], Awaitable[Any]]) -> int:
+        """Executa as sub-janelas concorrentemente, carregando cada lote assim que é transformado"""
+        async def run(window: BaseParams) -> int:
+            rows = 0
+            async for batch in iterate(window):
+                await load(batch)
+                rows += len(batch)
+            return rows
+
+        # Each query takes a slot of the repository budget, so the fan-out is bounded per source
+        return sum(await asyncio.gather(*(run(window) for window in windows)))
+    
+    def _plan_windows(self, last_control: Optional[Dict], default_start: datetime, default_end: datetime, max_windows: int) -> List[BaseParams]:
+        """Planeja as janelas pendentes entre o último controle e agora"""
+        windows = []
+        start_date, end_date = self._calculate_date_range(last_control, default_start, default_end)
+        window_size = self._calculate_window_size(last_control) if last_control else timedelta(**{env.DIFF_TYPE: int(env.OFFSET)})
+        while len(windows) < max_windows and not self._should_skip_etl(end_date):
+            windows.append(BaseParams(start_date=start_date, end_date=end_date))
+            start_date = end_date + timedelta(seconds=1)
+            end_date = self._clamp_end_date(start_date, end_date + window_size)
+        return windows
+    
+    def _is_lagging(self, last_control: Optional[Dict], default_start: datetime, default_end: datetime) -> bool:
+        """Verifica se o controle está atrasado o suficiente para o backfill"""
+        lag_windows = env.BACKFILL_LAG_WINDOWS
+        return len(self._plan_windows(last_control, default_start, default_end, lag_windows)) >= lag_windows
+    
+    async def _run_backfill(self, windows: List[BaseParams], process: Callable[[BaseParams], Awaitable[int]], control_collection: str) -> int:
+        """Processa as janelas em paralelo e grava os controles na ordem das janelas"""
+        semaphore = asyncio.Semaphore(env.BACKFILL_CONCURRENCY)
+        commit_lock = asyncio.Lock()
+        finished: Dict[int, tuple[int, float]] = {}
+        committed = 0
+        failed = False
+
+        async def run(index: int, window: BaseParams) -> None:
+            nonlocal committed, failed
+            async with semaphore:
+                if failed:
+                    return
+                try:
+                    started = time.perf_counter()
+                    rows = await process(window)
+                    duration_seconds = time.perf_counter() - started
+                except Exception:
+                    failed = True
+                    raise
+
+            async with commit_lock:
+                finished[index] = (rows, duration_seconds)
+                # Only the contiguous prefix is committed, so the control never skips a window
+                while committed in finished:
+                    done = windows[committed]
+                    rows, duration_seconds = finished.pop(committed)
+                    await self._insert_control(control_collection, done["start_date"], done["end_date"], rows, duration_seconds)
+                    committed += 1
+
+        results = await asyncio.gather(*(run(index, window) for index, window in enumerate(windows)), return_exceptions=True)
+        self._log_with_timestamp(f"Backfill committed {committed} of {len(windows)} window(s) in {control_collection}")
+
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            raise errors[0]
+        return committed
+    
+    async def _flush_sinks(self, entity: str) -> None:
+        """Garante que a janela chegou a todos os sinks antes do controle ser gravado"""
+        await self.sinks.flush(entity)
+    
+    async def _insert_control(self, collection: str, start_date: datetime, end_date: datetime, rows: int, duration_seconds: Optional[float] = None) -> None:
+        """Registra a janela processada na coleção de controle"""
+        data = {
+            "start_date": start_date,
+            "end_date": end_date,
+            "extracted_at": datetime.now(),
+            "rows": rows,
+            "duration_seconds": duration_seconds
+        }
+        await self.mongo_repository.base_insert_control(collection, data)
+    
+    def _should_skip_etl(self, end_date: datetime, minutes_threshold: int = SKIP_THRESHOLD_MINUTES) -> bool:
         """Verifica se deve pular o ETL baseado no tempo"""
         now = datetime.now()
         return (now - end_date) < timedelta(minutes=minutes_threshold)
@@ -1,35 +1,74 @@
 import asyncio
+import time
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from repositories import MysqlRepository, MongoRepository
+from sinks import SinkFanOut
 from services import FileService
 from _types import BaseParams
+from utils import env
 from .base import BaseOrchestrator
+from .pipeline import PipelineRunner
 
 class FilesOrchestrator(BaseOrchestrator):
-    def __init__(self, mongo_repository: MongoRepository):
-        super().__init__(mongo_repository)
+    def __init__(self, mongo_repository: MongoRepository, sinks: Optional[SinkFanOut] = None):
+        super().__init__(mongo_repository, sinks)
         self.files_collection = "files"
         self.realtime_files_collection = "realtime_files"
+        self.realtime_files_key = ("organization_id", "company_id", "workstation_id", "client")
         self.files_control_collection = "files_control"
+        self.default_start = datetime(2023, 1, 1, 0, 0, 0, 0)
+        self.default_end = datetime(2023, 1, 1, 23, 59, 59, 999999)
     
     async def run_files_etl(self, repository_standard: MysqlRepository, repository_john_deere: MysqlRepository) -> None:
+        self.sinks.reset_errors(self.files_collection)
         last_file_control = await self.mongo_repository.base_get_last_control(self.files_control_collection)
         
-        default_start = datetime(2023, 1, 1, 0, 0, 0, 0)
-        default_end = datetime(2023, 1, 1, 23, 59, 59, 999999)
-        start_date, end_date = self._calculate_date_range(last_file_control, default_start, default_end)
+        if env.BACKFILL_AUTO and self._is_lagging(last_file_control, self.default_start, self.default_end):
+            self._log_with_timestamp("Files: Control is lagging behind. Running backfill.")
+            await self.run_files_backfill(repository_standard, repository_john_deere)
+            return
+        
+        start_date, end_date = self._calculate_date_range(last_file_control, self.default_start, self.default_end)
         
         if self._should_skip_etl(end_date):
             self._log_with_timestamp("Files: Difference less than 5 minutes. Skipping ETL.")
             return
         
-        self._log_with_timestamp(f"Starting ETL files for the period of {start_date} to {end_date}")
+        parts = self._calculate_window_parts(last_file_control, start_date, end_date)
+        self._log_with_timestamp(f"Starting ETL files for the period of {start_date} to {end_date} in {parts} sub-window(s)")
         params = BaseParams(start_date=start_date, end_date=end_date)
         
-        all_files = await self._execute_all_files(params, repository_standard, repository_john_deere)
-        
-        await self._save_files(all_files, start_date, end_date)
+        started = time.perf_counter()
+        rows = await self._extract_and_load_files(params, repository_standard, repository_john_deere, parts)
+        await self._insert_control(self.files_control_collection, start_date, end_date, rows, time.perf_counter() - started)
+    
+    async def run_files_backfill(self, repository_standard: MysqlRepository, repository_john_deere: MysqlRepository, max_windows: Optional[int] = None) -> int:
+        self.sinks.reset_errors(self.files_collection)
+        last_file_control = await self.mongo_repository.base_get_last_control(self.files_control_collection)
+        windows = self._plan_windows(last_file_control, self.default_start, self.default_end, max_windows or env.BACKFILL_MAX_WINDOWS)
+        if not windows:
+            self._log_with_timestamp("Files: Nothing to backfill.")
+            return 0
+        
+        parts = self._calculate_window_parts(last_file_control, windows[0]["start_date"], windows[0]["end_date"])
+        self._log_with_timestamp(f"Starting backfill files for {len(windows)} window(s) from {windows[0]['start_date']} to {windows[-1]['end_date']}")
+        return await self._run_backfill(
+            windows,
+            lambda params: self._extract_and_load_files(params, repository_standard, repository_john_deere, parts),
+            self.files_control_collection
+        )
+    
+    async def _extract_and_load_files(self, params: BaseParams, repo_standard: MysqlRepository, repo_john_deere: MysqlRepository, parts: int = 1) -> int:
+        if env.ETL_PIPELINE:
+            rows = await self._run_files_pipeline(params, repo_standard, repo_john_deere, parts)
+            await self._flush_sinks(self.files_collection)
+            self._log_with_timestamp(f"Total files: {rows}")
+            return rows
+        
+        rows = await self._stream_all_files(params, repo_standard, repo_john_deere, parts)
+        await self._flush_sinks(self.files_collection)
+        return rows
     
     async def run_realtime_files_etl(self, repository_standard: MysqlRepository, repository_john_deere: MysqlRepository) -> None:
         self._log_with_timestamp("Starting ETL real time files")
@@ -38,25 +77,31 @@ class FilesOrchestrator(BaseOrchestrator):
         
         await self._save_realtime_files(all_files)
     
-    async def _execute_all_files(self, params: BaseParams, repo_standard: MysqlRepository, repo_john_deere: MysqlRepository) -> List:
+    async def _stream_all_files(self, params: BaseParams, repo_standard: MysqlRepository, repo_john_deere: MysqlRepository, parts: int = 1) -> int:
         tasks = []
         
-        tasks.append(self._run_files_for_client(params, repo_standard, "standard"))
+        tasks.append(self._run_files_for_client(params, repo_standard, "standard", parts))
         
-        tasks.append(self._run_files_for_client(params, repo_john_deere, "john_deere"))
+        tasks.append(self._run_files_for_client(params, repo_john_deere, "john_deere", parts))
         
-        results = await asyncio.gather(*tasks)
+        standard_files, john_deere_files = await asyncio.gather(*tasks)
         
-        standard_files = results[0]
-        john_deere_files = results[1]
+        self._log_with_timestamp(f"Files standard: {standard_files}")
+        self._log_with_timestamp(f"Files john_deere: {john_deere_files}")
         
-        self._log_with_timestamp(f"Files standard: {len(standard_files)}")
-        self._log_with_timestamp(f"Files john_deere: {len(john_deere_files)}")
+        total_files = standard_files + john_deere_files
         
-        all_files = standard_files + john_deere_files
+        self._log_with_timestamp(f"Total files: {total_files}")
+        return total_files
+    
+    async def _run_files_pipeline(self, params: BaseParams, repo_standard: MysqlRepository, repo_john_deere: MysqlRepository, parts: int = 1) -> int:
+        sources = []
+        for repository in (repo_standard, repo_john_deere):
+            service = FileService(repository)
+            for window in self._split_params(params, parts):
+                sources.append((service.get_batches(window), service.transform_async))
         
-        self._log_with_timestamp(f"Total files: {len(all_files)}")
-        return all_files
+        return await PipelineRunner().run(sources, self._load_files)
     
     async def _execute_all_realtime_files(self, repo_standard: MysqlRepository, repo_john_deere: MysqlRepository) -> List:
         tasks = []
@@ -78,10 +123,10 @@ class FilesOrchestrator(BaseOrchestrator):
         self._log_with_timestamp(f"Total realtime files: {len(all_files)}")
         return all_files
     
-    async def _run_files_for_client(self, params: BaseParams, repository: MysqlRepository, client_name: str) -> List:
+    async def _run_files_for_client(self, params: BaseParams, repository: MysqlRepository, client_name: str, parts: int = 1) -> int:
         try:
             service = FileService(repository)
-            return await service.get_files(params)
+            return await self._stream_fan_out(service.iter_files, self._split_params(params, parts), self._load_files)
         except Exception as e:
             self._log_with_timestamp(f"Error in files for {client_name}: {e}")
             raise e
@@ -94,17 +139,14 @@ class FilesOrchestrator(BaseOrchestrator):
             self._log_with_timestamp(f"Error in realtime files for {client_name}: {e}")
             raise e
     
-    async def _save_files(self, all_files: List, start_date: datetime, end_date: datetime) -> None:
-        await self.mongo_repository.bulk_upsert_files(self.files_collection, all_files)
-        
-        data = {
-            "start_date": start_date,
-            "end_date": end_date,
-            "extracted_at": datetime.now(),
-            "rows": len(all_files)
-        }
-        await self.mongo_repository.base_insert_control(self.files_control_collection, data)
+    async def _load_files(self, files: List) -> None:
+        await self.sinks.write(self.files_collection, files)
     
     async def _save_realtime_files(self, all_files: List) -> None:
+        if env.REALTIME_SYNC_MODE == "diff":
+            result = await self.mongo_repository.diff_sync_realtime(self.realtime_files_collection, all_files, self.realtime_files_key)
+            self._log_with_timestamp(f"Synced {len(all_files)} realtime files: {result}")
+            return
+        
         self._log_with_timestamp(f"Inserting {len(all_files)} realtime files")
         await self.mongo_repository.base_bulk_insert_realtime(self.realtime_files_collection, all_files)
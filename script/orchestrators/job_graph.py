@@ -0,0 +1,62 @@
+import asyncio
+import time
+import traceback
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, Tuple
+from utils import env
+
+Job = Callable[[], Awaitable[Any]]
+
+class JobGraph:
+    """Executa jobs independentes em paralelo respeitando dependências declaradas"""
+
+    def __init__(self, max_concurrency: Optional[int] = None):
+        self.max_concurrency = max_concurrency or env.JOB_MAX_CONCURRENCY
+        self._jobs: Dict[str, Tuple[Job, Tuple[str, ...]]] = {}
+
+    def add(self, name: str, job: Job, depends_on: Sequence[str] = ()) -> None:
+        """Adiciona um job; dependências precisam ter sido adicionadas antes"""
+        if name in self._jobs:
+            raise ValueError(f"Job {name} already exists")
+        missing = [dependency for dependency in depends_on if dependency not in self._jobs]
+        if missing:
+            raise ValueError(f"Job {name} depends on unknown jobs: {missing}")
+        self._jobs[name] = (job, tuple(depends_on))
+
+    async def run(self) -> Dict[str, BaseException]:
+        """Executa o grafo e retorna os erros por job"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks: Dict[str, asyncio.Task] = {}
+        errors: Dict[str, BaseException] = {}
+
+        for name in self._jobs:
+            tasks[name] = asyncio.create_task(self._run_job(name, semaphore, tasks, errors))
+
+        await asyncio.gather(*tasks.values())
+        return errors
+
+    async def _run_job(self, name: str, semaphore: asyncio.Semaphore, tasks: Dict[str, asyncio.Task], errors: Dict[str, BaseException]) -> None:
+        job, depends_on = self._jobs[name]
+        if depends_on:
+            await asyncio.wait([tasks[dependency] for dependency in depends_on])
+
+        failed = [dependency for dependency in depends_on if dependency in errors]
+        if failed:
+            errors[name] = RuntimeError(f"Skipped because {failed} failed")
+            self._log_with_timestamp(f"Job {name} skipped: dependencies {failed} failed")
+            return
+
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await job()
+            except Exception as e:
+                errors[name] = e
+                self._log_with_timestamp(f"Job {name} failed: {e}")
+                traceback.print_exc()
+                return
+
+        self._log_with_timestamp(f"Job {name} completed in {time.perf_counter() - started:.2f}s")
+
+    def _log_with_timestamp(self, message: str) -> None:
+        print(f"[{datetime.now()}] {message}", flush=True)
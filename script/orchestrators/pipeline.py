@@ -0,0 +1,72 @@
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional, Tuple
+from services import get_transform_executor
+from utils import env
+
+Transform = Callable[[List[Any]], Awaitable[List[Any]]]
+Source = Tuple[AsyncIterator[List[Any]], Transform]
+
+_DONE = object()
+
+class PipelineRunner:
+    """Executa extract -> transform -> load com filas limitadas entre os estágios"""
+
+    def __init__(self, queue_size: Optional[int] = None, loaders: Optional[int] = None, transformers: Optional[int] = None):
+        self.queue_size = queue_size or env.PIPELINE_QUEUE_SIZE
+        self.loaders = loaders or env.PIPELINE_LOADERS
+        # One transformer per pool worker keeps every core busy while the loop only awaits
+        self.transformers = transformers or get_transform_executor().concurrency
+
+    async def run(self, sources: List[Source], load: Callable[[List[Any]], Awaitable[Any]]) -> int:
+        """Executa o pipeline e retorna o total de linhas carregadas"""
+        extracted: asyncio.Queue = asyncio.Queue(self.queue_size)
+        transformed: asyncio.Queue = asyncio.Queue(self.queue_size)
+        loaded_rows = 0
+
+        async def extract(batches: AsyncIterator[List[Any]], transform: Transform) -> None:
+            async for batch in batches:
+                await extracted.put((transform, batch))
+
+        async def extract_stage() -> None:
+            await asyncio.gather(*(extract(batches, transform) for batches, transform in sources))
+            for _ in range(self.transformers):
+                await extracted.put(_DONE)
+
+        async def transformer() -> None:
+            while True:
+                item = await extracted.get()
+                if item is _DONE:
+                    return
+                transform, batch = item
+                result = await transform(batch)
+                if result:
+                    await transformed.put(result)
+
+        async def transform_stage() -> None:
+            await asyncio.gather(*(transformer() for _ in range(self.transformers)))
+            for _ in range(self.loaders):
+                await transformed.put(_DONE)
+
+        async def load_stage() -> None:
+            nonlocal loaded_rows
+            while True:
+                batch = await transformed.get()
+                if batch is _DONE:
+                    return
+                await load(batch)
+                loaded_rows += len(batch)
+
+        tasks = [
+            asyncio.create_task(extract_stage()),
+            asyncio.create_task(transform_stage()),
+            *(asyncio.create_task(load_stage()) for _ in range(self.loaders)),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        return loaded_rows
@@ -1,23 +1,30 @@
 import asyncio
+import time
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from repositories import MysqlRepository, MongoRepository
+from sinks import SinkFanOut
 from services import ReportService
 from _types import BaseParams
+from utils import env
 from .base import BaseOrchestrator
+from .pipeline import PipelineRunner
 
 class ReportsOrchestrator(BaseOrchestrator):
-    def __init__(self, mongo_repository: MongoRepository):
-        super().__init__(mongo_repository)
+    def __init__(self, mongo_repository: MongoRepository, sinks: Optional[SinkFanOut] = None):
+        super().__init__(mongo_repository, sinks)
         self.report_types = ["reba", "kim_mho", "kim_pp", "niosh", "strain_index"]
         self.reports_collection = "reports"
         self.realtime_reports_collection = "realtime_reports"
+        self.realtime_reports_key = ("report_id", "type", "client")
         self.reports_control_collection = "reports_control"
+        self.default_start = datetime(2023, 1, 1, 0, 0, 0, 0)
+        self.default_end = datetime(2023, 2, 28, 23, 59, 59, 999999)
     
-    async def _run_report(self, report_type: str, params: BaseParams, repository: MysqlRepository) -> List:
+    async def _run_report(self, report_type: str, params: BaseParams, repository: MysqlRepository, parts: int = 1) -> int:
         try:
             service = ReportService(repository, report_type)
-            return await service.get_reports(params)
+            return await self._stream_fan_out(service.iter_reports, self._split_params(params, parts), self._load_reports)
         except Exception as e:
             self._log_with_timestamp(f"Error in {report_type}: {e}")
             raise e
@@ -31,23 +38,54 @@ class ReportsOrchestrator(BaseOrchestrator):
             raise e
     
     async def run_reports_etl(self, repository_standard: MysqlRepository, repository_john_deere: MysqlRepository) -> None:
+        self.sinks.reset_errors(self.reports_collection)
         last_report_control = await self.mongo_repository.base_get_last_control(self.reports_control_collection)
         
-        default_start = datetime(2023, 1, 1, 0, 0, 0, 0)
-        default_end = datetime(2023, 2, 28, 23, 59, 59, 999999)
-        start_date, end_date = self._calculate_date_range(last_report_control, default_start, default_end)
+        if env.BACKFILL_AUTO and self._is_lagging(last_report_control, self.default_start, self.default_end):
+            self._log_with_timestamp("Reports: Control is lagging behind. Running backfill.")
+            await self.run_reports_backfill(repository_standard, repository_john_deere)
+            return
+        
+        start_date, end_date = self._calculate_date_range(last_report_control, self.default_start, self.default_end)
         
         if self._should_skip_etl(end_date):
             self._log_with_timestamp("Reports: Difference less than 5 minutes. Skipping ETL.")
             return
         
-        self._log_with_timestamp(f"Starting ETL reports for the period of {start_date} to {end_date}")
+        parts = self._calculate_window_parts(last_report_control, start_date, end_date)
+        self._log_with_timestamp(f"Starting ETL reports for the period of {start_date} to {end_date} in {parts} sub-window(s)")
         params = BaseParams(start_date=start_date, end_date=end_date)
         
-        all_reports = await self._execute_all_reports(params, repository_standard, repository_john_deere)
-        
-        
-        await self._save_reports(all_reports, start_date, end_date)
+        started = time.perf_counter()
+        rows = await self._extract_and_load_reports(params, repository_standard, repository_john_deere, parts)
+        await self._insert_control(self.reports_control_collection, start_date, end_date, rows, time.perf_counter() - started)
+    
+    async def run_reports_backfill(self, repository_standard: MysqlRepository, repository_john_deere: MysqlRepository, max_windows: Optional[int] = None) -> int:
+        self.sinks.reset_errors(self.reports_collection)
+        last_report_control = await self.mongo_repository.base_get_last_control(self.reports_control_collection)
+        windows = self._plan_windows(last_report_control, self.default_start, self.default_end, max_windows or env.BACKFILL_MAX_WINDOWS)
+        if not windows:
+            self._log_with_timestamp("Reports: Nothing to backfill.")
+            return 0
+        
+        parts = self._calculate_window_parts(last_report_control, windows[0]["start_date"], windows[0]["end_date"])
+        self._log_with_timestamp(f"Starting backfill reports for {len(windows)} window(s) from {windows[0]['start_date']} to {windows[-1]['end_date']}")
+        return await self._run_backfill(
+            windows,
+            lambda params: self._extract_and_load_reports(params, repository_standard, repository_john_deere, parts),
+            self.reports_control_collection
+        )
+    
+    async def _extract_and_load_reports(self, params: BaseParams, repo_standard: MysqlRepository, repo_john_deere: MysqlRepository, parts: int = 1) -> int:
+        if env.ETL_PIPELINE:
+            rows = await self._run_reports_pipeline(params, repo_standard, repo_john_deere, parts)
+            await self._flush_sinks(self.reports_collection)
+            self._log_with_timestamp(f"Total reports: {rows}")
+            return rows
+        
+        rows = await self._stream_all_reports(params, repo_standard, repo_john_deere, parts)
+        await self._flush_sinks(self.reports_collection)
+        return rows
     
     async def run_realtime_reports_etl(self, repository_standard: MysqlRepository, repository_john_deere: MysqlRepository) -> None:
         self._log_with_timestamp("Starting ETL real time reports")
@@ -56,14 +94,14 @@ class ReportsOrchestrator(BaseOrchestrator):
         
         await self._save_realtime_reports(all_reports)
     
-    async def _execute_all_reports(self, params: BaseParams, repo_standard: MysqlRepository, repo_john_deere: MysqlRepository) -> List:
+    async def _stream_all_reports(self, params: BaseParams, repo_standard: MysqlRepository, repo_john_deere: MysqlRepository, parts: int = 1) -> int:
         tasks = []
         
         for report_type in self.report_types:
-            tasks.append(self._run_report(report_type, params, repo_standard))
+            tasks.append(self._run_report(report_type, params, repo_standard, parts))
         
         for report_type in self.report_types:
-            tasks.append(self._run_report(report_type, params, repo_john_deere))
+            tasks.append(self._run_report(report_type, params, repo_john_deere, parts))
         
         results = await asyncio.gather(*tasks)
         
@@ -71,15 +109,25 @@ class ReportsOrchestrator(BaseOrchestrator):
         john_deere_reports = results[5:] 
         
         for i, report_type in enumerate(self.report_types):
-            self._log_with_timestamp(f"Reports {report_type} standard: {len(standard_reports[i])}")
-            self._log_with_timestamp(f"Reports {report_type} john_deere: {len(john_deere_reports[i])}")
+            self._log_with_timestamp(f"Reports {report_type} standard: {standard_reports[i]}")
+            self._log_with_timestamp(f"Reports {report_type} john_deere: {john_deere_reports[i]}")
         
-        all_reports = []
-        for reports in results:
-            all_reports.extend(reports)
-        
-        self._log_with_timestamp(f"Total reports: {len(all_reports)}")
-        return all_reports
+        total_reports = sum(results)
+        self._log_with_timestamp(f"Total reports: {total_reports}")
+        return total_reports
+    
+    async def _run_reports_pipeline(self, params: BaseParams, repo_standard: MysqlRepository, repo_john_deere: MysqlRepository, parts: int = 1) -> int:
+        sources = []
+        for repository in (repo_standard, repo_john_deere):
+            for report_type in self.report_types:
+                service = ReportService(repository, report_type)
+                for window in self._split_params(params, parts):
+                    sources.append((service.get_batches(window), service.transform_async))
+        
+        return await PipelineRunner().run(sources, self._load_reports)
+    
+    async def _load_reports(self, reports: List) -> None:
+        await self.sinks.write(self.reports_collection, reports)
     
     async def _execute_all_realtime_reports(self, repo_standard: MysqlRepository, repo_john_deere: MysqlRepository) -> List:
         tasks = []
@@ -106,17 +154,11 @@ class ReportsOrchestrator(BaseOrchestrator):
         self._log_with_timestamp(f"Total realtime reports: {len(all_reports)}")
         return all_reports
     
-    async def _save_reports(self, all_reports: List, start_date: datetime, end_date: datetime) -> None:
-        await self.mongo_repository.bulk_upsert_reports(self.reports_collection, all_reports)
-        
-        data = {
-            "start_date": start_date,
-            "end_date": end_date,
-            "extracted_at": datetime.now(),
-            "rows": len(all_reports)
-        }
-        await self.mongo_repository.base_insert_control(self.reports_control_collection, data)
-    
     async def _save_realtime_reports(self, all_reports: List) -> None:
+        if env.REALTIME_SYNC_MODE == "diff":
+            result = await self.mongo_repository.diff_sync_realtime(self.realtime_reports_collection, all_reports, self.realtime_reports_key)
+            self._log_with_timestamp(f"Synced {len(all_reports)} realtime reports: {result}")
+            return
+        
         self._log_with_timestamp(f"Inserting {len(all_reports)} realtime reports")
         await self.mongo_repository.bulk_insert_realtime_reports(self.realtime_reports_collection, all_reports)
@@ -1,4 +1,6 @@
 from .mongo import MongoRepository
 from .mysql import MysqlRepository
+from .clickhouse import ClickHouseRepository
+from .clickhouse_writer import ClickHouseBufferedWriter
 
-__all__ = ["MongoRepository", "MysqlRepository"]
\ No newline at end of file
+__all__ = ["MongoRepository", "MysqlRepository", "ClickHouseRepository", "ClickHouseBufferedWriter"]
\ No newline at end of file
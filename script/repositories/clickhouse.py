@@ -1,28 +1,65 @@
-from typing import Any, Dict, List
+import threading
+from typing import Any, Dict, List, Optional, Sequence
 from clickhouse_driver import Client as ClickHouseClient
+from .clickhouse_tables import CLICKHOUSE_TABLES
 
 class ClickHouseRepository:
-    def __init__(self, host: str, database: str, user: str = "default", password: str = ""):
+    def __init__(self, host: str, database: str, user: str = "default", password: str = "", port: int = 9000, compression: Optional[str] = None):
         self.host = host
         self.database = database
         self.user = user
         self.password = password
+        self.port = port
+        # "none" turns compression off; lz4 needs the clickhouse-driver[lz4] extra
+        self.compression = False if compression in (None, "", "none") else compression
+        self._client: Optional[ClickHouseClient] = None
+        # The native client keeps one connection and is not thread-safe
+        self._lock = threading.Lock()
 
     def _get_client(self) -> ClickHouseClient:
-        return ClickHouseClient(host=self.host, database=self.database, user=self.user, password=self.password)
+        if self._client is None:
+            self._client = ClickHouseClient(
+                host=self.host,
+                port=self.port,
+                database=self.database,
+                user=self.user,
+                password=self.password,
+                compression=self.compression
+            )
+        return self._client
+
+    def _execute(self, query: str, params: Any = None, **kwargs):
+        with self._lock:
+            return self._get_client().execute(query, params, **kwargs)
+
+    def ensure_tables(self) -> List[str]:
+        for table in CLICKHOUSE_TABLES.values():
+            self._execute(table.ddl())
+        return list(CLICKHOUSE_TABLES)
 
     def insert_one(self, table: str, data: Dict[str, Any]):
-        cols = ", ".join(data.keys())
-        values = [tuple(data.values())]
-        client = self._get_client()
-        client.execute(f"INSERT INTO {table} ({cols}) VALUES", values)
-        return 1
+        return self.insert_many(table, [data])
 
     def insert_many(self, table: str, data: List[Dict[str, Any]]):
         if not data:
             return 0
-        cols = ", ".join(data[0].keys())
-        values = [tuple(d.values()) for d in data]
-        client = self._get_client()
-        client.execute(f"INSERT INTO {table} ({cols}) VALUES", values)
-        return len(values)
+        columns = list(data[0].keys())
+        return self.insert_columns(table, columns, [[d[column] for d in data] for column in columns])
+
+    def insert_columns(self, table: str, columns: Sequence[str], data: List[List[Any]]) -> int:
+        """Insere dados já organizados por coluna pelo protocolo nativo"""
+        if not data or not data[0]:
+            return 0
+        self._execute(f"INSERT INTO {table} ({', '.join(columns)}) VALUES", data, columnar=True)
+        return len(data[0])
+
+    def insert_documents(self, table: str, documents: List[Dict[str, Any]]) -> int:
+        """Converte os documentos do Mongo para as colunas da tabela e insere"""
+        to_row = CLICKHOUSE_TABLES[table].to_row
+        return self.insert_many(table, [to_row(document) for document in documents])
+
+    def close(self) -> None:
+        with self._lock:
+            if self._client is not None:
+                self._client.disconnect()
+                self._client = None
@@ -0,0 +1,156 @@
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+Row = Dict[str, Any]
+
+_EPOCH = datetime(1970, 1, 1)
+
+@dataclass(frozen=True)
+class ClickHouseTable:
+    name: str
+    columns: Tuple[Tuple[str, str], ...]
+    order_by: Tuple[str, ...]
+    to_row: Callable[[Dict[str, Any]], Row]
+    partition_by: str = "toYYYYMM(created_at)"
+
+    @property
+    def column_names(self) -> Tuple[str, ...]:
+        return tuple(name for name, _ in self.columns)
+
+    def ddl(self) -> str:
+        columns = ",\n    ".join(f"{name} {type_}" for name, type_ in self.columns)
+        return (
+            f"CREATE TABLE IF NOT EXISTS {self.name} (\n    {columns}\n)\n"
+            f"ENGINE = ReplacingMergeTree(_version)\n"
+            f"PARTITION BY {self.partition_by}\n"
+            f"ORDER BY ({', '.join(self.order_by)})"
+        )
+
+def _text(value: Any) -> str:
+    return "" if value is None else str(value)
+
+def _datetime(value: Any) -> datetime:
+    return value if isinstance(value, datetime) else _EPOCH
+
+def _optional_datetime(value: Any) -> Optional[datetime]:
+    return value if isinstance(value, datetime) else None
+
+def _dimension(document: Dict[str, Any], name: str, field: str = "name") -> str:
+    value = document.get(name)
+    return _text(value.get(field)) if isinstance(value, dict) else ""
+
+def _dimension_columns(*names: str) -> Tuple[Tuple[str, str], ...]:
+    columns = []
+    for name in names:
+        columns.append((f"{name}_id", "String"))
+        columns.append((f"{name}_name", "LowCardinality(String)" if name != "file" else "String"))
+    return tuple(columns)
+
+def _dimension_values(document: Dict[str, Any], *names: str) -> Row:
+    values = {}
+    for name in names:
+        values[f"{name}_id"] = _dimension(document, name, "id")
+        values[f"{name}_name"] = _dimension(document, name, "original_name" if name == "file" else "name")
+    return values
+
+def _report_row(report: Dict[str, Any]) -> Row:
+    return {
+        "report_id": _text(report["report_id"]),
+        "client": _text(report["client"]),
+        "type": _text(report["type"]),
+        "risk": _text(report.get("risk")),
+        "name": _text(report.get("name")),
+        "is_active": int(bool(report.get("is_active"))),
+        "created_at": _datetime(report.get("created_at")),
+        "updated_at": _datetime(report.get("updated_at")),
+        **_dimension_values(report, "file", "organization", "company", "workstation"),
+        "_version": time.time_ns(),
+    }
+
+def _file_row(file: Dict[str, Any]) -> Row:
+    return {
+        "file_id": _text(file["file_id"]),
+        "client": _text(file["client"]),
+        "status": _text(file.get("status")),
+        "original_name": _text(file.get("original_name")),
+        "generated_name": _text(file.get("generated_name")),
+        "duration": float(file.get("duration") or 0),
+        "is_active": int(bool(file.get("is_active"))),
+        "created_at": _datetime(file.get("created_at")),
+        **_dimension_values(file, "organization", "company", "workstation", "user"),
+        "_version": time.time_ns(),
+    }
+
+def _action_plan_row(action_plan: Dict[str, Any]) -> Row:
+    return {
+        "action_plan_id": _text(action_plan["action_plan_id"]),
+        "client": _text(action_plan["client"]),
+        "status": _text(action_plan.get("status")),
+        "priority": _text(action_plan.get("priority")),
+        "title": _text(action_plan.get("title")),
+        "description": _text(action_plan.get("description")),
+        "created_at": _datetime(action_plan.get("created_at")),
+        "updated_at": _datetime(action_plan.get("updated_at")),
+        "completed_at": _optional_datetime(action_plan.get("completed_at")),
+        **_dimension_values(action_plan, "file", "organization", "company", "workstation"),
+        "_version": time.time_ns(),
+    }
+
+# ReplacingMergeTree keeps the row with the highest _version per sorting key,
+# so the natural id closes the key and re-sent windows collapse on merge
+CLICKHOUSE_TABLES: Dict[str, ClickHouseTable] = {
+    "reports": ClickHouseTable(
+        name="reports",
+        columns=(
+            ("report_id", "String"),
+            ("client", "LowCardinality(String)"),
+            ("type", "LowCardinality(String)"),
+            ("risk", "LowCardinality(String)"),
+            ("name", "String"),
+            ("is_active", "UInt8"),
+            ("created_at", "DateTime64(3)"),
+            ("updated_at", "DateTime64(3)"),
+            *_dimension_columns("file", "organization", "company", "workstation"),
+            ("_version", "UInt64"),
+        ),
+        order_by=("client", "type", "created_at", "report_id"),
+        to_row=_report_row,
+    ),
+    "files": ClickHouseTable(
+        name="files",
+        columns=(
+            ("file_id", "String"),
+            ("client", "LowCardinality(String)"),
+            ("status", "LowCardinality(String)"),
+            ("original_name", "String"),
+            ("generated_name", "String"),
+            ("duration", "Float64"),
+            ("is_active", "UInt8"),
+            ("created_at", "DateTime64(3)"),
+            *_dimension_columns("organization", "company", "workstation", "user"),
+            ("_version", "UInt64"),
+        ),
+        order_by=("client", "created_at", "file_id"),
+        to_row=_file_row,
+    ),
+    "action_plans": ClickHouseTable(
+        name="action_plans",
+        columns=(
+            ("action_plan_id", "String"),
+            ("client", "LowCardinality(String)"),
+            ("status", "LowCardinality(String)"),
+            ("priority", "LowCardinality(String)"),
+            ("title", "String"),
+            ("description", "String"),
+            ("created_at", "DateTime64(3)"),
+            ("updated_at", "DateTime64(3)"),
+            ("completed_at", "Nullable(DateTime64(3))"),
+            *_dimension_columns("file", "organization", "company", "workstation"),
+            ("_version", "UInt64"),
+        ),
+        order_by=("client", "created_at", "action_plan_id"),
+        to_row=_action_plan_row,
+    ),
+}
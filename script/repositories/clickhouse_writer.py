@@ -0,0 +1,116 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from utils import env
+from .clickhouse import ClickHouseRepository
+from .clickhouse_tables import CLICKHOUSE_TABLES
+
+class _TableBuffer:
+    def __init__(self, column_count: int):
+        self.columns: List[List[Any]] = [[] for _ in range(column_count)]
+        self.rows = 0
+        self.since: Optional[float] = None
+
+class ClickHouseBufferedWriter:
+    """Acumula linhas por tabela em colunas e insere em lote por tamanho ou idade"""
+
+    def __init__(self, repository: ClickHouseRepository, max_rows: Optional[int] = None, max_age_seconds: Optional[float] = None):
+        self.repository = repository
+        self.max_rows = max_rows or env.CLICKHOUSE_BUFFER_ROWS
+        self.max_age_seconds = max_age_seconds or env.CLICKHOUSE_BUFFER_SECONDS
+        self._buffers = {table: _TableBuffer(len(spec.columns)) for table, spec in CLICKHOUSE_TABLES.items()}
+        self._locks = {table: asyncio.Lock() for table in CLICKHOUSE_TABLES}
+        # A single worker keeps inserts ordered on the repository's one connection
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="clickhouse")
+        self._ticker: Optional[asyncio.Task] = None
+        self._stats = {"rows": 0, "flushes": 0, "seconds": 0.0}
+
+    async def start(self) -> None:
+        if self._ticker is None:
+            self._ticker = asyncio.create_task(self._flush_aged())
+
+    async def add(self, table: str, documents: List[Dict[str, Any]]) -> None:
+        """Converte os documentos para linhas e agenda a inserção"""
+        if not documents:
+            return
+        spec = CLICKHOUSE_TABLES[table]
+        buffer = self._buffers[table]
+        for document in documents:
+            row = spec.to_row(document)
+            for column, name in zip(buffer.columns, spec.column_names):
+                column.append(row[name])
+        buffer.rows += len(documents)
+        if buffer.since is None:
+            buffer.since = time.monotonic()
+
+        if buffer.rows >= self.max_rows:
+            await self.flush(table)
+
+    async def flush(self, table: Optional[str] = None) -> int:
+        """Insere o que estiver no buffer; sem tabela, esvazia todas"""
+        if table is None:
+            return sum([await self.flush(name) for name in self._buffers])
+
+        async with self._locks[table]:
+            buffer = self._buffers[table]
+            if not buffer.rows:
+                return 0
+            spec = CLICKHOUSE_TABLES[table]
+            self._buffers[table] = _TableBuffer(len(spec.columns))
+
+            started = time.perf_counter()
+            loop = asyncio.get_running_loop()
+            try:
+                rows = await loop.run_in_executor(self._executor, self.repository.insert_columns, table, spec.column_names, buffer.columns)
+            except Exception:
+                self._restore(table, buffer)
+                raise
+            self._stats["rows"] += rows
+            self._stats["flushes"] += 1
+            self._stats["seconds"] += time.perf_counter() - started
+            return rows
+
+    def pop_stats(self) -> Dict[str, Any]:
+        """Retorna e zera os contadores de inserção desde a última chamada"""
+        stats = {**self._stats, "seconds": round(self._stats["seconds"], 3)}
+        self._stats = {"rows": 0, "flushes": 0, "seconds": 0.0}
+        return stats
+
+    async def close(self) -> None:
+        if self._ticker is not None:
+            self._ticker.cancel()
+            await asyncio.gather(self._ticker, return_exceptions=True)
+            self._ticker = None
+        await self.flush()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self.repository.close)
+        self._executor.shutdown(wait=True)
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def _flush_aged(self) -> None:
+        interval = max(self.max_age_seconds / 2, 0.1)
+        while True:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            for table, buffer in list(self._buffers.items()):
+                if buffer.since is not None and now - buffer.since >= self.max_age_seconds:
+                    try:
+                        await self.flush(table)
+                    except Exception as e:
+                        # The rows stay buffered and the next tick retries them
+                        print(f"ClickHouse flush of {table} failed: {e}", flush=True)
+
+    def _restore(self, table: str, buffer: _TableBuffer) -> None:
+        """Devolve ao buffer as linhas de uma inserção que falhou, antes das que chegaram depois"""
+        current = self._buffers[table]
+        for column, newer in zip(buffer.columns, current.columns):
+            column.extend(newer)
+        buffer.rows += current.rows
+        self._buffers[table] = buffer
@@ -0,0 +1,108 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from sqlalchemy import bindparam, text
+from utils import env
+
+DimensionSpec = Tuple[Tuple[str, str, str, bool], ...]
+
+BASE_DIMENSIONS: DimensionSpec = (
+    ("company", "companies", "dim_company_id", True),
+    ("organization", "organizations", "dim_organization_id", True),
+    ("workstation", "workstations", "dim_workstation_id", True),
+)
+
+FILES_DIMENSIONS: DimensionSpec = (
+    ("organization", "organizations", "dim_organization_id", True),
+    ("company", "companies", "dim_company_id", True),
+    ("workstation", "workstations", "dim_workstation_id", False),
+    ("user", "users", "dim_user_id", False),
+)
+
+class DimensionCache:
+    def __init__(self, fetchall: Callable[[str, Optional[Dict[str, Any]]], Awaitable[List[Dict[str, Any]]]]):
+        self._fetchall = fetchall
+        self.tables: Dict[str, Dict[Any, Dict[str, Any]]] = {
+            "companies": {},
+            "organizations": {},
+            "workstations": {},
+            "users": {},
+        }
+        self._watermarks: Dict[str, Optional[datetime]] = {table: None for table in self.tables}
+        self._refreshed_at: Optional[datetime] = None
+        self._lock = asyncio.Lock()
+
+    async def refresh(self, force: bool = False) -> None:
+        async with self._lock:
+            ttl = timedelta(seconds=env.DIMENSION_CACHE_TTL_SECONDS)
+            if not force and self._refreshed_at and datetime.now() - self._refreshed_at < ttl:
+                return
+
+            for table in self.tables:
+                await self._load(table)
+            self._refreshed_at = datetime.now()
+
+    async def _load(self, table: str) -> None:
+        watermark = self._watermarks[table]
+        query = f"SELECT id, name, updated_at FROM {table}"
+        params = {}
+        if watermark is not None:
+            # Rows never touched since creation have no updated_at and would never match the watermark
+            query += " WHERE updated_at >= :since OR updated_at IS NULL"
+            params["since"] = watermark
+
+        lookup = self.tables[table]
+        for row in await self._fetchall(query, params):
+            lookup[row["id"]] = {"id": row["id"], "name": row["name"]}
+            if row["updated_at"] and (watermark is None or row["updated_at"] > watermark):
+                watermark = row["updated_at"]
+        self._watermarks[table] = watermark
+
+    async def load_ids(self, table: str, ids: Set[Any]) -> None:
+        """Carrega apenas os ids informados, para dimensões criadas depois do último refresh"""
+        if not ids:
+            return
+        statement = text(f"SELECT id, name FROM {table} WHERE id IN :ids").bindparams(bindparam("ids", expanding=True))
+        lookup = self.tables[table]
+        for row in await self._fetchall(statement, {"ids": list(ids)}):
+            lookup[row["id"]] = {"id": row["id"], "name": row["name"]}
+
+    def enrich(self, rows: List[Dict[str, Any]], dimensions: DimensionSpec) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Preenche as dimensões a partir do cache; linhas com ids fora do cache voltam como pendentes"""
+        enriched = []
+        pending = []
+        for row in rows:
+            if any(row.get(id_key) is not None and row[id_key] not in self.tables[table] for _, table, id_key, _ in dimensions):
+                pending.append(row)
+                continue
+
+            if "dim_file_id" in row:
+                row["file"] = {"id": row.pop("dim_file_id"), "original_name": row.pop("dim_file_original_name")}
+
+            # Required dimensions keep the INNER JOIN semantics of the joined queries
+            keep = True
+            for field, table, id_key, required in dimensions:
+                value = self.tables[table].get(row.pop(id_key, None))
+                if value is None and required:
+                    keep = False
+                    break
+                row[field] = value
+
+            if keep:
+                enriched.append(row)
+        return enriched, pending
+
+    async def resolve(self, rows: List[Dict[str, Any]], dimensions: DimensionSpec) -> List[Dict[str, Any]]:
+        """Busca os ids que faltam no cache e enriquece as linhas pendentes"""
+        for _, table, id_key, _ in dimensions:
+            await self.load_ids(table, {row[id_key] for row in rows if row.get(id_key) is not None and row[id_key] not in self.tables[table]})
+
+        enriched, missing = self.enrich(rows, dimensions)
+        if missing:
+            # Ids that do not exist in MySQL either; the joined queries would not return these rows
+            for row in missing:
+                for _, table, id_key, _ in dimensions:
+                    if row.get(id_key) is not None and row[id_key] not in self.tables[table]:
+                        row[id_key] = None
+            enriched.extend(self.enrich(missing, dimensions)[0])
+        return enriched
@@ -0,0 +1,89 @@
+import hashlib
+import json
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from utils import env
+
+FINGERPRINT_FIELD = "_fingerprint"
+
+def document_key(document: Dict[str, Any], key_fields: Sequence[str]) -> str:
+    """Chave natural do documento; datas em milissegundos como o Mongo as guarda"""
+    values = []
+    for field in key_fields:
+        value = document.get(field)
+        if isinstance(value, datetime):
+            value = value.isoformat(timespec="milliseconds")
+        values.append(str(value))
+    return "|".join(values)
+
+def content_hash(document: Dict[str, Any]) -> str:
+    content = json.dumps(document, sort_keys=True, default=str)
+    return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+
+class FingerprintCache:
+    """Guarda o updated_at e o hash do conteúdo já gravado, por chave natural"""
+
+    def __init__(self, db, max_entries: Optional[int] = None):
+        self.db = db
+        self.max_entries = max_entries or env.FINGERPRINT_CACHE_SIZE
+        self._entries: Dict[str, OrderedDict] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    async def filter_changed(self, collection: str, documents: List[Dict[str, Any]], key_fields: Sequence[str]) -> Tuple[List[Dict[str, Any]], int]:
+        """Retorna os documentos que mudaram, já com o fingerprint, e quantos foram pulados"""
+        entries = self._entries.setdefault(collection, OrderedDict())
+        fingerprinted = []
+        for document in documents:
+            fingerprint = {"updated_at": document.get("updated_at"), "hash": content_hash(document)}
+            fingerprinted.append((document_key(document, key_fields), {**document, FINGERPRINT_FIELD: fingerprint}))
+
+        unknown = {key for key, _ in fingerprinted if key not in entries}
+        if unknown:
+            await self._load(collection, entries, key_fields, [document for key, document in fingerprinted if key in unknown])
+
+        changed = []
+        for key, document in fingerprinted:
+            stored = entries.get(key)
+            if stored is not None:
+                entries.move_to_end(key)
+            if stored != self._entry(document[FINGERPRINT_FIELD]):
+                changed.append(document)
+
+        skipped = len(documents) - len(changed)
+        stats = self._stats.setdefault(collection, {"checked": 0, "skipped": 0})
+        stats["checked"] += len(documents)
+        stats["skipped"] += skipped
+        return changed, skipped
+
+    def remember(self, collection: str, documents: List[Dict[str, Any]], key_fields: Sequence[str]) -> None:
+        """Registra os fingerprints depois que a escrita foi confirmada"""
+        entries = self._entries.setdefault(collection, OrderedDict())
+        for document in documents:
+            self._put(entries, document_key(document, key_fields), document[FINGERPRINT_FIELD])
+
+    def pop_stats(self) -> Dict[str, Dict[str, int]]:
+        """Retorna e zera os contadores acumulados desde a última chamada"""
+        stats, self._stats = self._stats, {}
+        return stats
+
+    async def _load(self, collection: str, entries: OrderedDict, key_fields: Sequence[str], documents: List[Dict[str, Any]]) -> None:
+        # The leading key field is the prefix of the upsert index, so the lookup stays indexed
+        lead = key_fields[0]
+        query = {lead: {"$in": list({document[lead] for document in documents})}, FINGERPRINT_FIELD: {"$exists": True}}
+        projection = {field: 1 for field in key_fields}
+        projection[FINGERPRINT_FIELD] = 1
+        async for stored in self.db[collection].find(query, projection):
+            self._put(entries, document_key(stored, key_fields), stored[FINGERPRINT_FIELD])
+
+    def _put(self, entries: OrderedDict, key: str, fingerprint: Dict[str, Any]) -> None:
+        entries[key] = self._entry(fingerprint)
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def _entry(self, fingerprint: Dict[str, Any]) -> Tuple[Any, str]:
+        updated_at = fingerprint.get("updated_at")
+        if isinstance(updated_at, datetime):
+            updated_at = updated_at.isoformat(timespec="milliseconds")
+        return updated_at, fingerprint["hash"]
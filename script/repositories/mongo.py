@@ -1,13 +1,41 @@
-from typing import Any, Dict, List
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
 import motor.motor_asyncio
-from pymongo import UpdateOne
+from pymongo import DeleteMany, ReplaceOne, UpdateOne
+from .mongo_bulk import MongoBulkWriter
+from .mongo_indexes import MongoIndexManager
+from .fingerprint_cache import FingerprintCache, content_hash
+from .rollups import RollupManager
+from .timeseries import TimeSeriesManager
+from utils import env
+
+STORAGE_MODES = ("collection", "both", "timeseries")
+
+def check_storage_mode() -> None:
+    """Recusa combinações de MONGO_STORAGE_MODE que dependem da coleção comum"""
+    if env.MONGO_STORAGE_MODE not in STORAGE_MODES:
+        raise ValueError(f"Unknown MONGO_STORAGE_MODE {env.MONGO_STORAGE_MODE}; available: {list(STORAGE_MODES)}")
+    if env.MONGO_STORAGE_MODE != "timeseries":
+        return
+    # Rollup deltas and stored fingerprints are read back from the plain reports and files collections
+    enabled = [name for name, value in (("ROLLUPS", env.ROLLUPS), ("SKIP_UNCHANGED_UPSERTS", env.SKIP_UNCHANGED_UPSERTS)) if value]
+    if enabled:
+        raise ValueError(
+            f"MONGO_STORAGE_MODE=timeseries does not write the plain reports and files collections that {' and '.join(enabled)} read; "
+            f"use MONGO_STORAGE_MODE=both or set {'=false and '.join(enabled)}=false"
+        )
 
 class MongoRepository:
     def __init__(self, uri: str, database: str):
+        check_storage_mode()
         self.uri = uri
         self.database = database
         self.client = motor.motor_asyncio.AsyncIOMotorClient(self.uri)
         self.db = self.client[self.database]
+        self._sync_indexes = set()
+        self.fingerprints = FingerprintCache(self.db)
+        self.rollups = RollupManager(self.db)
+        self.timeseries = TimeSeriesManager(self.db)
 
     async def __aenter__(self):
         return self
@@ -18,6 +46,20 @@ class MongoRepository:
     def _get_collection(self, collection: str):
         return self.db[collection]
 
+    async def ensure_indexes(self, create: bool = True) -> Dict[str, Dict[str, List[str]]]:
+        return await MongoIndexManager(self.db).ensure(create)
+
+    async def ensure_rollups(self) -> List[str]:
+        return await self.rollups.ensure()
+
+    async def rebuild_rollups(self, collections: Optional[Sequence[str]] = None) -> List[str]:
+        """Recalcula os rollups a partir das coleções de origem e retorna quais foram reconstruídos"""
+        rebuilt = []
+        for collection in collections or list(self.rollups.rollups):
+            await self.rollups.rebuild(collection)
+            rebuilt.append(self.rollups.rollups[collection].collection)
+        return rebuilt
+
     async def start_session(self):
         session = await self.client.start_session()
         return session
@@ -34,25 +76,12 @@ class MongoRepository:
         result = await col.insert_many(data)
         return result.inserted_ids
 
-    async def bulk_upsert_reports(self, collection: str, reports: List[Any]):
+    async def bulk_upsert_reports(self, collection: str, reports: List[Any]) -> Dict[str, Any]:
         if not reports:
-            return
-
-        col = self._get_collection(collection)
-        bulk_ops = []
+            return {}
 
-        for report in reports:
-            filter_query = {
-                "report_id": report.report_id,
-                "type": report.type,
-                "created_at": report.created_at,
-                "client": report.client
-            }
-            update_query = {"$set": report.create()}
-            bulk_ops.append(UpdateOne(filter_query, update_query, upsert=True))
-
-        if bulk_ops:
-            await col.bulk_write(bulk_ops)
+        documents = [report.create() for report in reports]
+        return await self._bulk_upsert(collection, documents, ("report_id", "type", "created_at", "client"))
 
     
     async def bulk_insert_realtime_reports(self, collection: str, reports: List[Any]):
@@ -63,49 +92,73 @@ class MongoRepository:
     
         await col.delete_many({})
         
-        if reports:
-            await col.insert_many([report.create() for report in reports])
+        # Documents are built one chunk at a time, so only the records stay in memory
+        batch_size = env.MONGO_BULK_BATCH_SIZE
+        for start in range(0, len(reports), batch_size):
+            await col.insert_many([report.create() for report in reports[start:start + batch_size]])
 
-    async def bulk_upsert_files(self, collection: str, files: List[Any]):
+    async def bulk_upsert_files(self, collection: str, files: List[Any]) -> Dict[str, Any]:
         if not files:
-            return
-
-        col = self._get_collection(collection)
-        bulk_ops = []
-
-        for file in files:
-            
-            filter_query = {
-                "file_id": file["file_id"],
-                "created_at": file["created_at"],
-                "client": file["client"]
-            }
-
-            update_query = {"$set": file}  
-            bulk_ops.append(UpdateOne(filter_query, update_query, upsert=True))
+            return {}
 
-        if bulk_ops:
-            await col.bulk_write(bulk_ops)
+        return await self._bulk_upsert(collection, files, ("file_id", "created_at", "client"))
     
-    async def bulk_upsert_action_plans(self, collection: str, action_plans: List[Any]):
+    async def bulk_upsert_action_plans(self, collection: str, action_plans: List[Any]) -> Dict[str, Any]:
         if not action_plans:
-            return
+            return {}
+
+        return await self._bulk_upsert(collection, action_plans, ("action_plan_id", "created_at", "client"))
 
+    async def _bulk_upsert(self, collection: str, documents: List[Dict[str, Any]], key_fields: Sequence[str]) -> Dict[str, Any]:
         col = self._get_collection(collection)
-        bulk_ops = []
+        skipped = 0
+        if env.SKIP_UNCHANGED_UPSERTS:
+            documents, skipped = await self.fingerprints.filter_changed(collection, documents, key_fields)
+
+        has_events = self.timeseries.tracks(collection)
+        write_collection = env.MONGO_STORAGE_MODE != "timeseries" or not has_events
+        write_events = bool(documents) and has_events and env.MONGO_STORAGE_MODE in ("timeseries", "both")
 
-        for action_plan in action_plans:
-            filter_query = {
-                "action_plan_id": action_plan["action_plan_id"],
-                "created_at": action_plan["created_at"],
-                "client": action_plan["client"]
-            }
-            update_query = {"$set": action_plan}
-            bulk_ops.append(UpdateOne(filter_query, update_query, upsert=True))
-
-        if bulk_ops:
-            await col.bulk_write(bulk_ops)
+        # Rollup deltas need the previous version, which only the plain collection keeps
+        track_rollups = bool(documents) and write_collection and env.ROLLUPS and self.rollups.tracks(collection)
+        if track_rollups:
+            previous = await self.rollups.snapshot(collection, documents, key_fields)
+
+        bulk_ops = []
+        for document in documents if write_collection else []:
+            filter_query = {field: document[field] for field in key_fields}
+            bulk_ops.append(UpdateOne(filter_query, {"$set": document}, upsert=True))
+
+        stats = await MongoBulkWriter(col).write(bulk_ops)
+        stats["events"] = (await self.timeseries.insert(collection, documents))["inserted"] if write_events else 0
+        stats["rollup_buckets"] = await self.rollups.apply(collection, previous, documents, key_fields) if track_rollups else 0
+        # Fingerprints are remembered last, so a failed write or rollup is retried on the next run
+        if env.SKIP_UNCHANGED_UPSERTS:
+            self.fingerprints.remember(collection, documents, key_fields)
+        stats["skipped"] = skipped
+        return stats
     
+    async def migrate_to_timeseries(self, collection: str, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None, batch_size: int = 5000) -> int:
+        """Copia os documentos da coleção para a coleção time-series; versões já migradas são ignoradas"""
+        query: Dict[str, Any] = {}
+        if start_date or end_date:
+            query["created_at"] = {}
+            if start_date:
+                query["created_at"]["$gte"] = start_date
+            if end_date:
+                query["created_at"]["$lte"] = end_date
+
+        migrated = 0
+        batch = []
+        async for document in self._get_collection(collection).find(query).sort("created_at", 1).batch_size(batch_size):
+            batch.append(document)
+            if len(batch) >= batch_size:
+                migrated += (await self.timeseries.insert(collection, batch))["inserted"]
+                batch = []
+        if batch:
+            migrated += (await self.timeseries.insert(collection, batch))["inserted"]
+        return migrated
+
     async def base_bulk_insert_realtime(self, collection: str, data: List[Any]):
         if not data:
             return
@@ -115,6 +168,53 @@ class MongoRepository:
         if data:
             await col.insert_many(data)
 
+    async def diff_sync_realtime(self, collection: str, data: List[Any], key_fields: Sequence[str]) -> Dict[str, int]:
+        if not data:
+            return {"upserted": 0, "deleted": 0, "unchanged": 0}
+
+        col = self._get_collection(collection)
+        await self._ensure_sync_index(collection)
+
+        existing = {}
+        async for document in col.find({"_sync_key": {"$exists": True}}, {"_sync_key": 1, "_sync_hash": 1}):
+            existing[document["_sync_key"]] = document["_sync_hash"]
+
+        # Only the hash of each desired document is kept; documents are built from records as they are read
+        desired = {}
+        replacements = {}
+        for item in data:
+            document = item.create() if hasattr(item, "create") else item
+            key = self._sync_key(document, key_fields)
+            desired[key] = self._content_hash(document)
+            if existing.get(key) != desired[key]:
+                replacements[key] = ReplaceOne({"_sync_key": key}, {**document, "_sync_key": key, "_sync_hash": desired[key]}, upsert=True)
+            else:
+                replacements.pop(key, None)
+
+        bulk_ops = list(replacements.values())
+        changed = len(bulk_ops)
+
+        vanished = [key for key in existing if key not in desired]
+        if vanished:
+            bulk_ops.append(DeleteMany({"_sync_key": {"$in": vanished}}))
+        # Documents written by the old delete/insert loader have no sync key
+        bulk_ops.append(DeleteMany({"_sync_key": {"$exists": False}}))
+
+        result = await col.bulk_write(bulk_ops, ordered=False)
+        return {"upserted": changed, "deleted": result.deleted_count, "unchanged": len(desired) - changed}
+
+    async def _ensure_sync_index(self, collection: str) -> None:
+        if collection in self._sync_indexes:
+            return
+        await self._get_collection(collection).create_index("_sync_key", unique=True, sparse=True)
+        self._sync_indexes.add(collection)
+
+    def _sync_key(self, document: Dict[str, Any], key_fields: Sequence[str]) -> str:
+        return "|".join(str(document.get(field)) for field in key_fields)
+
+    def _content_hash(self, document: Dict[str, Any]) -> str:
+        return content_hash(document)
+
     async def base_insert_control(self, collection: str, data: Dict[str, Any]):
         col = self._get_collection(collection)
         result = await col.insert_one(data)
@@ -0,0 +1,46 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+from utils import env
+
+class MongoBulkWriter:
+    def __init__(self, collection, batch_size: Optional[int] = None, concurrency: Optional[int] = None):
+        self.collection = collection
+        self.batch_size = batch_size or env.MONGO_BULK_BATCH_SIZE
+        self.concurrency = concurrency or env.MONGO_BULK_CONCURRENCY
+
+    def _split(self, ops: List[Any]) -> List[List[Any]]:
+        # Batches are cut by count only; PyMongo already splits each one into messages under the server size limit
+        return [ops[start:start + self.batch_size] for start in range(0, len(ops), self.batch_size)]
+
+    async def write(self, ops: List[Any]) -> Dict[str, Any]:
+        """Executa as operações em lotes não ordenados, alguns em paralelo"""
+        stats: Dict[str, Any] = {
+            "matched": 0,
+            "modified": 0,
+            "upserted": 0,
+            "inserted": 0,
+            "deleted": 0,
+            "batches": [],
+        }
+        if not ops:
+            return stats
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def write_batch(index: int, batch: List[Any]) -> None:
+            async with semaphore:
+                started = time.perf_counter()
+                result = await self.collection.bulk_write(batch, ordered=False)
+                seconds = time.perf_counter() - started
+
+            stats["matched"] += result.matched_count
+            stats["modified"] += result.modified_count
+            stats["upserted"] += result.upserted_count
+            stats["inserted"] += result.inserted_count
+            stats["deleted"] += result.deleted_count
+            stats["batches"].append({"batch": index, "ops": len(batch), "seconds": round(seconds, 3)})
+
+        await asyncio.gather(*(write_batch(index, batch) for index, batch in enumerate(self._split(ops))))
+        stats["batches"].sort(key=lambda batch: batch["batch"])
+        return stats
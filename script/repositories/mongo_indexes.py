@@ -0,0 +1,76 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+from pymongo.errors import OperationFailure
+
+@dataclass(frozen=True)
+class IndexSpec:
+    name: str
+    keys: Tuple[Tuple[str, int], ...]
+    unique: bool = False
+    sparse: bool = False
+
+    def matches(self, info: Dict[str, Any]) -> bool:
+        return (
+            tuple((field, int(direction)) for field, direction in info["key"]) == self.keys
+            and bool(info.get("unique")) == self.unique
+            and bool(info.get("sparse")) == self.sparse
+        )
+
+_CONTROL_INDEXES = (IndexSpec("extracted_at_desc", (("extracted_at", -1),)),)
+_SYNC_INDEXES = (IndexSpec("_sync_key_1", (("_sync_key", 1),), unique=True, sparse=True),)
+
+# Indexes matching the upsert filters of MongoRepository and the control lookups
+MONGO_INDEXES: Dict[str, Tuple[IndexSpec, ...]] = {
+    "reports": (
+        IndexSpec("report_upsert", (("report_id", 1), ("type", 1), ("created_at", 1), ("client", 1)), unique=True),
+        IndexSpec("created_at_1", (("created_at", 1),)),
+    ),
+    "files": (
+        IndexSpec("file_upsert", (("file_id", 1), ("created_at", 1), ("client", 1)), unique=True),
+        IndexSpec("created_at_1", (("created_at", 1),)),
+    ),
+    "action_plans": (
+        IndexSpec("action_plan_upsert", (("action_plan_id", 1), ("created_at", 1), ("client", 1)), unique=True),
+        IndexSpec("created_at_1", (("created_at", 1),)),
+    ),
+    "realtime_reports": _SYNC_INDEXES,
+    "realtime_files": _SYNC_INDEXES,
+    "realtime_action_plans_actions": _SYNC_INDEXES,
+    "reports_control": _CONTROL_INDEXES,
+    "files_control": _CONTROL_INDEXES,
+    "action_plans_control": _CONTROL_INDEXES,
+}
+
+class MongoIndexManager:
+    """Confere e cria os índices esperados pelas coleções do ETL"""
+
+    def __init__(self, db, indexes: Dict[str, Tuple[IndexSpec, ...]] = MONGO_INDEXES):
+        self.db = db
+        self.indexes = indexes
+
+    async def missing(self) -> Dict[str, List[IndexSpec]]:
+        """Retorna, por coleção, os índices esperados que não existem"""
+        missing = {}
+        for collection, specs in self.indexes.items():
+            existing = [info async for info in self.db[collection].list_indexes()]
+            absent = [spec for spec in specs if not any(spec.matches(info) for info in existing)]
+            if absent:
+                missing[collection] = absent
+        return missing
+
+    async def ensure(self, create: bool = True) -> Dict[str, Dict[str, List[str]]]:
+        """Cria os índices ausentes e retorna o que foi criado, o que falhou e o que segue ausente"""
+        report: Dict[str, Dict[str, List[str]]] = {"created": {}, "failed": {}, "missing": {}}
+        for collection, specs in (await self.missing()).items():
+            for spec in specs:
+                if not create:
+                    report["missing"].setdefault(collection, []).append(spec.name)
+                    continue
+                try:
+                    await self.db[collection].create_index(list(spec.keys), name=spec.name, unique=spec.unique, sparse=spec.sparse)
+                    report["created"].setdefault(collection, []).append(spec.name)
+                except OperationFailure as e:
+                    # Duplicated keys or a conflicting index with the same name
+                    report["failed"].setdefault(collection, []).append(f"{spec.name}: {e}")
+                    report["missing"].setdefault(collection, []).append(spec.name)
+        return report
@@ -1,7 +1,13 @@
-from typing import Any, Dict, List, Optional
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker, AsyncEngine
-from sqlalchemy import text
+import asyncio
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple, Union
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, AsyncEngine
+from sqlalchemy import text, TextClause
+from sqlalchemy.exc import SQLAlchemyError
 from _types import BaseParams
+from utils import env
+from .dimension_cache import DimensionCache, DimensionSpec, BASE_DIMENSIONS, FILES_DIMENSIONS
+from .pool_manager import pool_manager
+from .projections import get_columns
 
 class MysqlRepository:
     def __init__(self, url: str, client: str):
@@ -9,6 +15,27 @@ class MysqlRepository:
         self.client = client
         self._engine: Optional[AsyncEngine] = None
         self._session_factory: Optional[async_sessionmaker] = None
+        self.budget = pool_manager.get_budget(self.client)
+        self._keyset_columns = {
+            "reba": ("r.updated_at", "r.id", "updated_at", "id"),
+            "kim_push_pull": ("kpp.updated_at", "kpp.id", "updated_at", "id"),
+            "strain_index": ("si.updated_at", "si.id", "updated_at", "id"),
+            "niosh": ("n.updated_at", "n.id", "updated_at", "id"),
+            "kim_mho": ("kmho.updated_at", "kmho.id", "updated_at", "id"),
+            "files": ("f.created_at", "f.id", "created_at", "file_id"),
+            "action_plan": ("apv.updated_at", "apv.id", "updated_at", "action_plan_id"),
+        }
+        self._query_dimensions = {
+            "reba": BASE_DIMENSIONS,
+            "kim_push_pull": BASE_DIMENSIONS,
+            "strain_index": BASE_DIMENSIONS,
+            "niosh": BASE_DIMENSIONS,
+            "kim_mho": BASE_DIMENSIONS,
+            "files": FILES_DIMENSIONS,
+            "action_plan": BASE_DIMENSIONS,
+        }
+        self.dimensions = DimensionCache(self._fetchall)
+        self._statements: Dict[str, TextClause] = {}
 
     async def __aenter__(self):
         return self
@@ -17,6 +44,15 @@ class MysqlRepository:
         await self.close()
 
     def _get_base_query(self) -> str:
+        if env.DIMENSION_CACHE:
+            return """
+        f.id AS dim_file_id,
+        f.original_name AS dim_file_original_name,
+        f.company_id AS dim_company_id,
+        f.organization_id AS dim_organization_id,
+        f.workstation_id AS dim_workstation_id,
+        :client AS client
+        """
         return """
         JSON_OBJECT('id', f.id, 'original_name', f.original_name) AS file,
         JSON_OBJECT('id', c.id, 'name', c.name) AS company,
@@ -29,6 +65,8 @@ class MysqlRepository:
         """
 
     def _get_base_joins(self) -> str:
+        if env.DIMENSION_CACHE:
+            return ""
         return """
         JOIN companies c ON f.company_id = c.id
         JOIN organizations o ON f.organization_id = o.id
@@ -37,9 +75,7 @@ class MysqlRepository:
 
     def _get_engine(self) -> AsyncEngine:
         if self._engine is None:
-
-            async_url = self.url.replace("mysql+pymysql://", "mysql+aiomysql://")
-            self._engine = create_async_engine(async_url, future=True)
+            self._engine = pool_manager.get_engine(self.client, self.url)
         return self._engine
 
     def _get_session_factory(self) -> async_sessionmaker:
@@ -48,28 +84,126 @@ class MysqlRepository:
             self._session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
         return self._session_factory
 
-    async def _fetchall(self, query: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    def _get_statement(self, key: str, build_query: Callable[[], str]) -> TextClause:
+        statement = self._statements.get(key)
+        if statement is None:
+            statement = text(build_query()).bindparams(client=self.client)
+            self._statements[key] = statement
+        return statement
+
+    async def _fetchall(self, query: Union[str, TextClause], params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        statement = text(query) if isinstance(query, str) else query
         session_factory = self._get_session_factory()
-        async with session_factory() as session:
-            result = await session.execute(text(query), params or {})
+        async with self.budget, session_factory() as session:
+            result = await session.execute(statement, params or {})
             rows = []
             for row in result:
                 rows.append(dict(row._mapping))
             return rows
 
-    async def _fetchone(self, query: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    async def _stream(self, query: Union[str, TextClause], params: Optional[Dict[str, Any]] = None, batch_size: Optional[int] = None, dimensions: Optional[DimensionSpec] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        batch_size = batch_size or env.STREAM_BATCH_SIZE
+        # Refresh before taking a budget slot, the refresh itself needs one
+        await self._refresh_dimensions(dimensions)
+        session_factory = self._get_session_factory()
+        pending = []
+        async with self.budget, session_factory() as session:
+            statement = text(query) if isinstance(query, str) else query
+            statement = statement.execution_options(yield_per=batch_size)
+            result = await session.stream(statement, params or {})
+            async for partition in result.mappings().partitions(batch_size):
+                rows, missed = self._apply_dimensions([dict(row) for row in partition], dimensions)
+                pending.extend(missed)
+                yield rows
+
+        # Cache misses are resolved after the stream gives its budget slot back, the lookup needs one
+        if pending:
+            yield await self.dimensions.resolve(pending, dimensions)
+
+    async def _refresh_dimensions(self, dimensions: Optional[DimensionSpec]) -> None:
+        if env.DIMENSION_CACHE and dimensions:
+            await self.dimensions.refresh()
+
+    def _apply_dimensions(self, rows: List[Dict[str, Any]], dimensions: Optional[DimensionSpec]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        if not env.DIMENSION_CACHE or not dimensions:
+            return rows, []
+        return self.dimensions.enrich(rows, dimensions)
+
+    async def _enrich(self, rows: List[Dict[str, Any]], dimensions: Optional[DimensionSpec]) -> List[Dict[str, Any]]:
+        await self._refresh_dimensions(dimensions)
+        rows, missed = self._apply_dimensions(rows, dimensions)
+        if missed:
+            rows.extend(await self.dimensions.resolve(missed, dimensions))
+        return rows
+
+    def _get_range_params(self, params: BaseParams) -> Dict[str, Any]:
+        return {
+            "start_date": params["start_date"],
+            "end_date": params["end_date"]
+        }
+
+    async def _paginate(self, name: str, params: BaseParams, page_size: Optional[int] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        page_size = page_size or env.KEYSET_PAGE_SIZE
+        sort_column, id_column, sort_key, id_key = self._keyset_columns[name]
+        range_query = getattr(self, f"_get_{name}_range_query")
+        first_page_query = self._get_statement(f"{name}:first_page", lambda: f"""
+        {range_query()}
+        ORDER BY {sort_column}, {id_column}
+        LIMIT :page_size
+        """)
+        next_page_query = self._get_statement(f"{name}:next_page", lambda: f"""
+        {range_query()}
+            AND (
+                {sort_column} > :last_sort
+                OR ({sort_column} = :last_sort AND {id_column} > :last_id)
+            )
+        ORDER BY {sort_column}, {id_column}
+        LIMIT :page_size
+        """)
+
+        query = first_page_query
+        query_params = {**self._get_range_params(params), "page_size": page_size}
+        while True:
+            page = await self._fetch_page(query, query_params)
+            if not page:
+                return
+            last_sort = page[-1][sort_key]
+            last_id = page[-1][id_key]
+            yield await self._enrich(page, self._query_dimensions[name])
+            if len(page) < page_size:
+                return
+            query = next_page_query
+            query_params["last_sort"] = last_sort
+            query_params["last_id"] = last_id
+
+    async def _fetch_page(self, query: TextClause, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        retries = env.KEYSET_PAGE_RETRIES
+        for attempt in range(retries + 1):
+            try:
+                return await self._fetchall(query, params)
+            except SQLAlchemyError:
+                if attempt == retries:
+                    raise
+                await asyncio.sleep(2 ** attempt)
+
+    async def _fetchone(self, query: Union[str, TextClause], params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
         rows = await self._fetchall(query, params)
         return rows[0] if rows else None
 
+    def pool_stats(self) -> Dict[str, Any]:
+        return pool_manager.stats(self.client)
+
     async def close(self):
         if self._engine:
-            await self._engine.dispose()
+            await pool_manager.dispose(self.client)
+            self._engine = None
+            self._session_factory = None
 
     # REBA
     def _get_base_reba_query(self) -> str:
         return f"""
         SELECT
-            r.*,
+            {get_columns("reba", "r")},
             'REBA' AS type,
             :client AS client,
             {self._get_base_query()}
@@ -77,35 +211,43 @@ class MysqlRepository:
         JOIN files f ON r.file_id = f.id
         {self._get_base_joins()}
         """
-    async def get_reba(self, params: BaseParams) -> List[Dict[str, Any]]:
-        query = f"""
+    def _get_reba_range_query(self) -> str:
+        return f"""
         {self._get_base_reba_query()}
-        WHERE 
+        WHERE
             r.updated_at >= :start_date
             AND r.updated_at <= :end_date
         """
-        return await self._fetchall(
-            query,
-            params={
-                "client": self.client,
-                "start_date": params["start_date"],
-                "end_date": params["end_date"]
-            }
-        )
 
-    async def get_realtime_reba(self) -> List[Dict[str, Any]]:
-        query = f"""
+    async def get_reba(self, params: BaseParams) -> List[Dict[str, Any]]:
+        statement = self._get_statement("reba:range", self._get_reba_range_query)
+        rows = await self._fetchall(statement, self._get_range_params(params))
+        return await self._enrich(rows, self._query_dimensions["reba"])
+
+    def stream_reba(self, params: BaseParams, batch_size: Optional[int] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        statement = self._get_statement("reba:range", self._get_reba_range_query)
+        return self._stream(statement, self._get_range_params(params), batch_size, self._query_dimensions["reba"])
+
+    def paginate_reba(self, params: BaseParams, page_size: Optional[int] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        return self._paginate("reba", params, page_size)
+
+    def _get_reba_realtime_query(self) -> str:
+        return f"""
         {self._get_base_reba_query()}
         WHERE
             r.updated_at >= NOW() - INTERVAL 1 YEAR;
         """
-        return await self._fetchall(query, {"client": self.client})
+
+    async def get_realtime_reba(self) -> List[Dict[str, Any]]:
+        statement = self._get_statement("reba:realtime", self._get_reba_realtime_query)
+        rows = await self._fetchall(statement)
+        return await self._enrich(rows, BASE_DIMENSIONS)
 
     # KIM PUSH PULL
     def _get_base_kim_push_pull_query(self) -> str:
         return f"""
         SELECT
-            kpp.*,
+            {get_columns("kim_push_pull", "kpp")},
             'KIM_PP' AS type,
             {self._get_base_query()}
         FROM kim_push_pull_reports kpp
@@ -113,106 +255,129 @@ class MysqlRepository:
         {self._get_base_joins()}
         """
     
-    async def get_kim_push_pull(self, params: BaseParams) -> List[Dict[str, Any]]:
-        query = f"""
+    def _get_kim_push_pull_range_query(self) -> str:
+        return f"""
         {self._get_base_kim_push_pull_query()}
         WHERE
             kpp.updated_at >= :start_date
             AND kpp.updated_at <= :end_date
         """
-        return await self._fetchall(
-            query,
-            params={
-                "client": self.client,
-                "start_date": params["start_date"],
-                "end_date": params["end_date"]
-            }
-        )
 
-    async def get_realtime_kim_push_pull(self) -> List[Dict[str, Any]]:
-        query = f"""
+    async def get_kim_push_pull(self, params: BaseParams) -> List[Dict[str, Any]]:
+        statement = self._get_statement("kim_push_pull:range", self._get_kim_push_pull_range_query)
+        rows = await self._fetchall(statement, self._get_range_params(params))
+        return await self._enrich(rows, self._query_dimensions["kim_push_pull"])
+
+    def stream_kim_push_pull(self, params: BaseParams, batch_size: Optional[int] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        statement = self._get_statement("kim_push_pull:range", self._get_kim_push_pull_range_query)
+        return self._stream(statement, self._get_range_params(params), batch_size, self._query_dimensions["kim_push_pull"])
+
+    def paginate_kim_push_pull(self, params: BaseParams, page_size: Optional[int] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        return self._paginate("kim_push_pull", params, page_size)
+
+    def _get_kim_push_pull_realtime_query(self) -> str:
+        return f"""
         {self._get_base_kim_push_pull_query()}
         WHERE
             kpp.updated_at >= NOW() - INTERVAL 1 YEAR;
         """
-        return await self._fetchall(query, {"client": self.client})
+
+    async def get_realtime_kim_push_pull(self) -> List[Dict[str, Any]]:
+        statement = self._get_statement("kim_push_pull:realtime", self._get_kim_push_pull_realtime_query)
+        rows = await self._fetchall(statement)
+        return await self._enrich(rows, BASE_DIMENSIONS)
 
     # STRAIN INDEX
     def _get_base_strain_index_query(self) -> str:
         return f"""
         SELECT
-            si.*,
+            {get_columns("strain_index", "si")},
             'STRAIN_INDEX' AS type,
             {self._get_base_query()}
         FROM strain_index_reports si
         JOIN files f ON si.file_id = f.id
         {self._get_base_joins()}
         """
-    async def get_strain_index(self, params: BaseParams) -> List[Dict[str, Any]]:
-        query = f"""
+    def _get_strain_index_range_query(self) -> str:
+        return f"""
         {self._get_base_strain_index_query()}
         WHERE
             si.updated_at >= :start_date
             AND si.updated_at <= :end_date
         """
 
-        return await self._fetchall(
-            query,
-            params={
-                "client": self.client,
-                "start_date": params["start_date"],
-                "end_date": params["end_date"]
-            }
-        )
+    async def get_strain_index(self, params: BaseParams) -> List[Dict[str, Any]]:
+        statement = self._get_statement("strain_index:range", self._get_strain_index_range_query)
+        rows = await self._fetchall(statement, self._get_range_params(params))
+        return await self._enrich(rows, self._query_dimensions["strain_index"])
 
-    async def get_realtime_strain_index(self) -> List[Dict[str, Any]]:
-        query = f"""
+    def stream_strain_index(self, params: BaseParams, batch_size: Optional[int] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        statement = self._get_statement("strain_index:range", self._get_strain_index_range_query)
+        return self._stream(statement, self._get_range_params(params), batch_size, self._query_dimensions["strain_index"])
+
+    def paginate_strain_index(self, params: BaseParams, page_size: Optional[int] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        return self._paginate("strain_index", params, page_size)
+
+    def _get_strain_index_realtime_query(self) -> str:
+        return f"""
         {self._get_base_strain_index_query()}
         WHERE
             si.updated_at >= NOW() - INTERVAL 1 YEAR;
         """
-        return await self._fetchall(query, {"client": self.client})
+
+    async def get_realtime_strain_index(self) -> List[Dict[str, Any]]:
+        statement = self._get_statement("strain_index:realtime", self._get_strain_index_realtime_query)
+        rows = await self._fetchall(statement)
+        return await self._enrich(rows, BASE_DIMENSIONS)
 
     # NIOSH
     def _get_base_niosh_query(self) -> str:
         return f"""
         SELECT
-            n.*,
+            {get_columns("niosh", "n")},
             'NIOSH' AS type,
             {self._get_base_query()}
         FROM niosh_reports n
         JOIN files f ON n.file_id = f.id
         {self._get_base_joins()}
         """
-    async def get_niosh(self, params: BaseParams) -> List[Dict[str, Any]]:
-        query = f"""
+    def _get_niosh_range_query(self) -> str:
+        return f"""
         {self._get_base_niosh_query()}
         WHERE
             n.updated_at >= :start_date
             AND n.updated_at <= :end_date
         """
-        return await self._fetchall(
-            query,
-            params={
-                "client": self.client,
-                "start_date": params["start_date"],
-                "end_date": params["end_date"]
-            }
-        )
 
-    async def get_realtime_niosh(self) -> List[Dict[str, Any]]:
-        query = f"""
+    async def get_niosh(self, params: BaseParams) -> List[Dict[str, Any]]:
+        statement = self._get_statement("niosh:range", self._get_niosh_range_query)
+        rows = await self._fetchall(statement, self._get_range_params(params))
+        return await self._enrich(rows, self._query_dimensions["niosh"])
+
+    def stream_niosh(self, params: BaseParams, batch_size: Optional[int] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        statement = self._get_statement("niosh:range", self._get_niosh_range_query)
+        return self._stream(statement, self._get_range_params(params), batch_size, self._query_dimensions["niosh"])
+
+    def paginate_niosh(self, params: BaseParams, page_size: Optional[int] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        return self._paginate("niosh", params, page_size)
+
+    def _get_niosh_realtime_query(self) -> str:
+        return f"""
         {self._get_base_niosh_query()}
         WHERE
             n.updated_at >= NOW() - INTERVAL 1 DAY;
         """
-        return await self._fetchall(query, {"client": self.client})
-    
+
+    async def get_realtime_niosh(self) -> List[Dict[str, Any]]:
+        statement = self._get_statement("niosh:realtime", self._get_niosh_realtime_query)
+        rows = await self._fetchall(statement)
+        return await self._enrich(rows, BASE_DIMENSIONS)
+
     # KIM MHO
     def _get_base_kim_mho_query(self) -> str:
         return f"""
         SELECT
-            kmho.*,
+            {get_columns("kim_mho", "kmho")},
             'KIM_MHO' AS type,
             {self._get_base_query()}
         FROM kim_mho_reports kmho
@@ -220,34 +385,60 @@ class MysqlRepository:
         {self._get_base_joins()}
         """
 
-    async def get_kim_mho(self, params: BaseParams) -> List[Dict[str, Any]]:
-        query = f"""
+    def _get_kim_mho_range_query(self) -> str:
+        return f"""
         {self._get_base_kim_mho_query()}
         WHERE
             kmho.updated_at >= :start_date
             AND kmho.updated_at <= :end_date
         """
 
-        return await self._fetchall(
-            query,
-            params={
-                "client": self.client,
-                "start_date": params["start_date"],
-                "end_date": params["end_date"]
-            }
-        )
+    async def get_kim_mho(self, params: BaseParams) -> List[Dict[str, Any]]:
+        statement = self._get_statement("kim_mho:range", self._get_kim_mho_range_query)
+        rows = await self._fetchall(statement, self._get_range_params(params))
+        return await self._enrich(rows, self._query_dimensions["kim_mho"])
 
-    async def get_realtime_kim_mho(self) -> List[Dict[str, Any]]:
-        query = f"""
+    def stream_kim_mho(self, params: BaseParams, batch_size: Optional[int] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        statement = self._get_statement("kim_mho:range", self._get_kim_mho_range_query)
+        return self._stream(statement, self._get_range_params(params), batch_size, self._query_dimensions["kim_mho"])
+
+    def paginate_kim_mho(self, params: BaseParams, page_size: Optional[int] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        return self._paginate("kim_mho", params, page_size)
+
+    def _get_kim_mho_realtime_query(self) -> str:
+        return f"""
         {self._get_base_kim_mho_query()}
         WHERE
             kmho.updated_at >= NOW() - INTERVAL 1 YEAR;
         """
-        return await self._fetchall(query, {"client": self.client})
+
+    async def get_realtime_kim_mho(self) -> List[Dict[str, Any]]:
+        statement = self._get_statement("kim_mho:realtime", self._get_kim_mho_realtime_query)
+        rows = await self._fetchall(statement)
+        return await self._enrich(rows, BASE_DIMENSIONS)
 
     #File
-    async def get_files(self, params: BaseParams) -> List[Dict[str, Any]]:
-        query = f"""
+    def _get_files_range_query(self) -> str:
+        if env.DIMENSION_CACHE:
+            return """
+        SELECT
+        :client as client,
+        f.id as file_id,
+        f.original_name,
+        f.generated_name,
+        f.duration,
+        f.status,
+        f.created_at,
+        f.is_active,
+        f.organization_id AS dim_organization_id,
+        f.company_id AS dim_company_id,
+        f.workstation_id AS dim_workstation_id,
+        f.user_id AS dim_user_id
+        FROM files f
+        WHERE f.created_at >= :start_date
+        AND f.created_at <= :end_date
+        """
+        return f"""
         SELECT
         :client as client,
         f.id as file_id,
@@ -281,16 +472,21 @@ class MysqlRepository:
         WHERE f.created_at >= :start_date
         AND f.created_at <= :end_date
         """
-        
-        result = await self._fetchall(query, {
-            "client": self.client,
-            "start_date": params["start_date"],
-            "end_date": params["end_date"]
-        })
-        return result
+
+    async def get_files(self, params: BaseParams) -> List[Dict[str, Any]]:
+        statement = self._get_statement("files:range", self._get_files_range_query)
+        rows = await self._fetchall(statement, self._get_range_params(params))
+        return await self._enrich(rows, self._query_dimensions["files"])
+
+    def stream_files(self, params: BaseParams, batch_size: Optional[int] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        statement = self._get_statement("files:range", self._get_files_range_query)
+        return self._stream(statement, self._get_range_params(params), batch_size, self._query_dimensions["files"])
+
+    def paginate_files(self, params: BaseParams, page_size: Optional[int] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        return self._paginate("files", params, page_size)
     
-    async def get_files_realtime(self) -> List[Dict[str, Any]]:
-        query = f"""
+    def _get_files_realtime_query(self) -> str:
+        return f"""
         SELECT
         f.organization_id,
 		f.company_id,
@@ -321,15 +517,16 @@ class MysqlRepository:
         WHERE f.is_active = 1
         GROUP BY f.organization_id, f.company_id, f.workstation_id
         """
-        return await self._fetchall(query, {
-            "client": self.client
-        })
-    
+
+    async def get_files_realtime(self) -> List[Dict[str, Any]]:
+        statement = self._get_statement("files:realtime", self._get_files_realtime_query)
+        return await self._fetchall(statement)
+
     # Action Plan
-    async def get_action_plan(self, params: BaseParams) -> List[Dict[str, Any]]:
-        query = f"""
+    def _get_action_plan_range_query(self) -> str:
+        return f"""
         SELECT
-        apv.*,
+        {get_columns("action_plan", "apv")},
         apv.id as action_plan_id,
         {self._get_base_query()}
         FROM action_plans_v2 apv 
@@ -339,15 +536,23 @@ class MysqlRepository:
             apv.updated_at >= :start_date
             AND apv.updated_at <= :end_date
         """
-        return await self._fetchall(query, {
-            "client": self.client,
-            "start_date": params["start_date"],
-            "end_date": params["end_date"]
-        })
+
+    async def get_action_plan(self, params: BaseParams) -> List[Dict[str, Any]]:
+        statement = self._get_statement("action_plan:range", self._get_action_plan_range_query)
+        rows = await self._fetchall(statement, self._get_range_params(params))
+        return await self._enrich(rows, self._query_dimensions["action_plan"])
+
+    def stream_action_plan(self, params: BaseParams, batch_size: Optional[int] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        statement = self._get_statement("action_plan:range", self._get_action_plan_range_query)
+        return self._stream(statement, self._get_range_params(params), batch_size, self._query_dimensions["action_plan"])
+
+    def paginate_action_plan(self, params: BaseParams, page_size: Optional[int] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        return self._paginate("action_plan", params, page_size)
     
-    async def get_action_plan_realtime(self) -> List[Dict[str, Any]]:
-        query = f"""
+    def _get_action_plan_realtime_query(self) -> str:
+        return f"""
         SELECT 
+            aph.id AS action_plan_history_id,
             apht.name,
             apht.description,
             JSON_OBJECT(
@@ -364,4 +569,8 @@ class MysqlRepository:
         WHERE
             aph.updated_at >= NOW() - INTERVAL 3 MONTH;
         """
-        return await self._fetchall(query, {"client": self.client})
\ No newline at end of file
+
+    async def get_action_plan_realtime(self) -> List[Dict[str, Any]]:
+        statement = self._get_statement("action_plan:realtime", self._get_action_plan_realtime_query)
+        rows = await self._fetchall(statement)
+        return await self._enrich(rows, BASE_DIMENSIONS)
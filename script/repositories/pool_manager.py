@@ -0,0 +1,85 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine
+from utils import env
+
+class SourceBudget:
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        self.acquired = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self._semaphore = asyncio.Semaphore(limit)
+
+    async def __aenter__(self):
+        started = time.perf_counter()
+        await self._semaphore.acquire()
+        waited = time.perf_counter() - started
+        self.wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        self.acquired += 1
+        self.in_flight += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.in_flight -= 1
+        self._semaphore.release()
+
+class MysqlPoolManager:
+    def __init__(self):
+        self._engines: Dict[str, AsyncEngine] = {}
+        self._budgets: Dict[str, SourceBudget] = {}
+
+    def _get_setting(self, source: str, name: str) -> int:
+        return int(os.getenv(f"{source}_{name}", getattr(env, name)))
+
+    def get_engine(self, source: str, url: str) -> AsyncEngine:
+        if source not in self._engines:
+            async_url = url.replace("mysql+pymysql://", "mysql+aiomysql://")
+            self._engines[source] = create_async_engine(
+                async_url,
+                future=True,
+                pool_size=self._get_setting(source, "MYSQL_POOL_SIZE"),
+                max_overflow=self._get_setting(source, "MYSQL_MAX_OVERFLOW"),
+                pool_recycle=self._get_setting(source, "MYSQL_POOL_RECYCLE_SECONDS"),
+                pool_timeout=self._get_setting(source, "MYSQL_POOL_TIMEOUT_SECONDS"),
+                pool_pre_ping=env.MYSQL_POOL_PRE_PING,
+            )
+        return self._engines[source]
+
+    def get_budget(self, source: str) -> SourceBudget:
+        if source not in self._budgets:
+            self._budgets[source] = SourceBudget(self._get_setting(source, "MYSQL_MAX_CONCURRENCY"))
+        return self._budgets[source]
+
+    async def dispose(self, source: str) -> None:
+        engine = self._engines.pop(source, None)
+        if engine:
+            await engine.dispose()
+
+    def stats(self, source: str) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {}
+        engine = self._engines.get(source)
+        if engine:
+            pool = engine.pool
+            stats.update({
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": pool.overflow(),
+            })
+        budget = self._budgets.get(source)
+        if budget:
+            stats.update({
+                "budget": budget.limit,
+                "in_flight": budget.in_flight,
+                "acquired": budget.acquired,
+                "wait_seconds": round(budget.wait_seconds, 3),
+                "max_wait_seconds": round(budget.max_wait_seconds, 3),
+            })
+        return stats
+
+pool_manager = MysqlPoolManager()
@@ -0,0 +1,42 @@
+from typing import Dict, Tuple
+from utils import env, KIM_MHO_RATING_POINTS
+
+REPORT_BASE_COLUMNS: Tuple[str, ...] = ("id", "created_at", "updated_at", "is_active")
+
+# Column holding each report's display name, always selected as report_name
+REPORT_NAME_COLUMNS: Dict[str, str] = {
+    "reba": "report_name",
+    "kim_push_pull": "report_name",
+    "strain_index": "report_name",
+    "niosh": "report_name",
+    "kim_mho": "report_name",
+}
+
+# Columns read by RiskCalculator and ReportMongoSchema for each report type
+REPORT_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "reba": REPORT_BASE_COLUMNS + ("score_seconds",),
+    "kim_push_pull": REPORT_BASE_COLUMNS + ("score",),
+    "strain_index": REPORT_BASE_COLUMNS + ("score_left_rsi", "score_right_rsi"),
+    "niosh": REPORT_BASE_COLUMNS + ("risk",),
+    "kim_mho": REPORT_BASE_COLUMNS + ("duration",) + tuple(KIM_MHO_RATING_POINTS) + (
+        "left_force_intensity",
+        "left_force_frequency",
+        "left_force_type",
+        "right_force_intensity",
+        "right_force_frequency",
+        "right_force_type",
+    ),
+}
+
+def get_columns(name: str, alias: str) -> str:
+    # Action plans are loaded whole; the dashboard and the sinks read most of their columns
+    if name not in REPORT_COLUMNS:
+        return f"{alias}.*"
+
+    name_column = REPORT_NAME_COLUMNS[name]
+    if not env.COLUMN_PROJECTION:
+        # The star already carries report_name; aliasing it again would make the key ambiguous
+        return f"{alias}.*" if name_column == "report_name" else f"{alias}.*, {alias}.{name_column} AS report_name"
+    columns = [f"{alias}.{column}" for column in REPORT_COLUMNS[name]]
+    columns.append(f"{alias}.{name_column} AS report_name")
+    return ", ".join(columns)
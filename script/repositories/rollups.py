@@ -0,0 +1,97 @@
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from pymongo import DeleteMany, UpdateOne
+from .fingerprint_cache import document_key
+
+Bucket = Tuple[Tuple[str, Any], ...]
+
+@dataclass(frozen=True)
+class RollupSpec:
+    collection: str
+    fields: Tuple[str, ...]
+    date_field: str = "created_at"
+
+# Daily counters read by the dashboard, keyed by the source collection
+ROLLUPS: Dict[str, RollupSpec] = {
+    "reports": RollupSpec("reports_daily", ("client", "type", "risk")),
+    "files": RollupSpec("files_daily", ("client", "status")),
+    "action_plans": RollupSpec("action_plans_daily", ("client", "status")),
+}
+
+class RollupManager:
+    """Mantém as coleções de rollup diário com $inc apenas nos buckets afetados"""
+
+    def __init__(self, db, rollups: Dict[str, RollupSpec] = ROLLUPS):
+        self.db = db
+        self.rollups = rollups
+
+    def tracks(self, collection: str) -> bool:
+        return collection in self.rollups
+
+    async def snapshot(self, collection: str, documents: List[Dict[str, Any]], key_fields: Sequence[str]) -> Dict[str, Bucket]:
+        """Lê os buckets atuais dos documentos antes de serem sobrescritos"""
+        spec = self.rollups[collection]
+        lead = key_fields[0]
+        query = {lead: {"$in": list({document[lead] for document in documents})}}
+        projection = {field: 1 for field in (*key_fields, *spec.fields, spec.date_field)}
+
+        previous = {}
+        async for stored in self.db[collection].find(query, projection):
+            previous[document_key(stored, key_fields)] = self._bucket(spec, stored)
+        return previous
+
+    async def apply(self, collection: str, previous: Dict[str, Bucket], documents: List[Dict[str, Any]], key_fields: Sequence[str]) -> int:
+        """Aplica a diferença entre os buckets antigos e os novos e retorna quantos mudaram"""
+        spec = self.rollups[collection]
+        deltas: Counter = Counter()
+        for document in documents:
+            key = document_key(document, key_fields)
+            if key in previous:
+                deltas[previous[key]] -= 1
+            deltas[self._bucket(spec, document)] += 1
+
+        touched = [dict(bucket) for bucket, delta in deltas.items() if delta]
+        if not touched:
+            return 0
+
+        bulk_ops = [
+            UpdateOne({"_id": bucket}, {"$inc": {"count": deltas[tuple(bucket.items())]}, "$setOnInsert": bucket}, upsert=True)
+            for bucket in touched
+        ]
+        bulk_ops.append(DeleteMany({"_id": {"$in": touched}, "count": {"$lte": 0}}))
+        await self.db[spec.collection].bulk_write(bulk_ops, ordered=True)
+        return len(touched)
+
+    async def rebuild(self, collection: str) -> None:
+        """Recalcula o rollup inteiro a partir da coleção de origem"""
+        spec = self.rollups[collection]
+        group_id = {field: f"${field}" for field in spec.fields}
+        group_id["day"] = {"$dateTrunc": {"date": f"${spec.date_field}", "unit": "day"}}
+
+        await self.db[spec.collection].delete_many({})
+        pipeline = [
+            {"$group": {"_id": group_id, "count": {"$sum": 1}}},
+            {"$replaceWith": {"$mergeObjects": ["$_id", {"_id": "$_id", "count": "$count"}]}},
+            {"$merge": {"into": spec.collection, "on": "_id", "whenMatched": "replace", "whenNotMatched": "insert"}},
+        ]
+        async for _ in self.db[collection].aggregate(pipeline):
+            pass
+
+    async def ensure(self) -> List[str]:
+        """Reconstrói os rollups vazios cuja origem já tem dados e retorna quais foram reconstruídos"""
+        rebuilt = []
+        for collection, spec in self.rollups.items():
+            if await self.db[spec.collection].find_one({}, {"_id": 1}):
+                continue
+            if not await self.db[collection].find_one({}, {"_id": 1}):
+                continue
+            await self.rebuild(collection)
+            rebuilt.append(spec.collection)
+        return rebuilt
+
+    def _bucket(self, spec: RollupSpec, document: Dict[str, Any]) -> Bucket:
+        created_at: Optional[datetime] = document.get(spec.date_field)
+        day = datetime(created_at.year, created_at.month, created_at.day) if isinstance(created_at, datetime) else None
+        return tuple((field, document.get(field)) for field in spec.fields) + (("day", day),)
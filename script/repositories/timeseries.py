@@ -0,0 +1,98 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Set, Tuple
+from pymongo import InsertOne
+from pymongo.errors import CollectionInvalid
+from .fingerprint_cache import FINGERPRINT_FIELD, document_key
+from .mongo_bulk import MongoBulkWriter
+
+# Bookkeeping fields of the plain collections that never reach the events
+INTERNAL_FIELDS = ("_id", FINGERPRINT_FIELD, "_sync_key", "_sync_hash")
+
+@dataclass(frozen=True)
+class TimeSeriesSpec:
+    collection: str
+    meta_fields: Tuple[str, ...]
+    id_field: str
+    time_field: str = "created_at"
+    version_field: str = "updated_at"
+    granularity: str = "hours"
+
+# Append-only event collections, keyed by the source collection
+TIMESERIES: Dict[str, TimeSeriesSpec] = {
+    "reports": TimeSeriesSpec("reports_events", ("client", "type"), "report_id"),
+    "files": TimeSeriesSpec("files_events", ("client",), "file_id"),
+}
+
+class TimeSeriesManager:
+    """Grava versões de reports e files em coleções time-series do Mongo"""
+
+    def __init__(self, db, timeseries: Dict[str, TimeSeriesSpec] = TIMESERIES):
+        self.db = db
+        self.timeseries = timeseries
+        self._ready = set()
+
+    def tracks(self, collection: str) -> bool:
+        return collection in self.timeseries
+
+    async def ensure(self, collection: str) -> str:
+        """Cria a coleção time-series e seu índice secundário, se ainda não existirem"""
+        spec = self.timeseries[collection]
+        if spec.collection in self._ready:
+            return spec.collection
+
+        try:
+            await self.db.create_collection(
+                spec.collection,
+                timeseries={"timeField": spec.time_field, "metaField": "meta", "granularity": spec.granularity},
+            )
+        except CollectionInvalid:
+            pass
+        index_keys = [(f"meta.{field}", 1) for field in spec.meta_fields] + [(spec.time_field, 1)]
+        await self.db[spec.collection].create_index(index_keys)
+        # Backs the lookup that keeps a version from being inserted twice
+        await self.db[spec.collection].create_index([(spec.id_field, 1), (spec.time_field, 1)])
+        self._ready.add(spec.collection)
+        return spec.collection
+
+    def to_event(self, collection: str, document: Dict[str, Any]) -> Dict[str, Any]:
+        spec = self.timeseries[collection]
+        event = {field: value for field, value in document.items() if field not in spec.meta_fields and field not in INTERNAL_FIELDS}
+        event["meta"] = {field: document.get(field) for field in spec.meta_fields}
+        return event
+
+    async def insert(self, collection: str, documents: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Insere como eventos as versões ainda não gravadas; time-series não aceitam upsert"""
+        target = await self.ensure(collection)
+        spec = self.timeseries[collection]
+        existing = await self._existing_versions(spec, target, documents)
+
+        bulk_ops = []
+        for document in documents:
+            version = self._version_key(spec, document)
+            if version in existing:
+                continue
+            existing.add(version)
+            bulk_ops.append(InsertOne(self.to_event(collection, document)))
+
+        stats = await MongoBulkWriter(self.db[target]).write(bulk_ops)
+        stats["duplicates"] = len(documents) - len(bulk_ops)
+        return stats
+
+    async def _existing_versions(self, spec: TimeSeriesSpec, target: str, documents: List[Dict[str, Any]]) -> Set[str]:
+        """Versões dos documentos que já estão na coleção de eventos"""
+        times = [document[spec.time_field] for document in documents if document.get(spec.time_field) is not None]
+        if not times:
+            return set()
+
+        query = {
+            spec.id_field: {"$in": list({document.get(spec.id_field) for document in documents})},
+            spec.time_field: {"$gte": min(times), "$lte": max(times)},
+        }
+        projection = {"meta": 1, spec.id_field: 1, spec.time_field: 1, spec.version_field: 1}
+        existing = set()
+        async for event in self.db[target].find(query, projection):
+            existing.add(self._version_key(spec, {**event.get("meta", {}), **event}))
+        return existing
+
+    def _version_key(self, spec: TimeSeriesSpec, document: Dict[str, Any]) -> str:
+        return document_key(document, (*spec.meta_fields, spec.id_field, spec.time_field, spec.version_field))
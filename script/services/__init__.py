@@ -1,5 +1,6 @@
 from .report import ReportService
 from .file import FileService
 from .action_plan import ActionPlanService
+from .transform_executor import TransformExecutor, get_transform_executor
 
-__all__ = ["ReportService", "FileService", "ActionPlanService"]
\ No newline at end of file
+__all__ = ["ReportService", "FileService", "ActionPlanService", "TransformExecutor", "get_transform_executor"]
\ No newline at end of file
@@ -1,32 +1,39 @@
-from typing import Dict, Any, List
-import json
+from typing import AsyncIterator, Dict, Any, List
 from repositories import MysqlRepository
 from _types import BaseParams
+from utils import env
+from .row_decoder import ACTION_PLAN_FIELDS, decode_rows
+from .transform_executor import get_transform_executor
+
+def transform_action_plans(action_plans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return decode_rows(action_plans, ACTION_PLAN_FIELDS)
 
 class ActionPlanService:
     def __init__(self, repository: MysqlRepository):
         self.repository = repository
 
     async def get_action_plan(self, params: BaseParams) -> List[Dict[str, Any]]:
-        action_plan = await self.repository.get_action_plan(params)
-        return [self._process_action_plan_data(action_plan) for action_plan in action_plan]
+        action_plans = []
+        async for batch in self.iter_action_plans(params):
+            action_plans.extend(batch)
+        return action_plans
+
+    async def iter_action_plans(self, params: BaseParams) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Entrega cada lote transformado assim que chega do repositório"""
+        async for batch in self.get_batches(params):
+            yield await self.transform_async(batch)
+
+    def get_batches(self, params: BaseParams) -> AsyncIterator[List[Dict[str, Any]]]:
+        if env.MYSQL_FETCH_MODE == "keyset":
+            return self.repository.paginate_action_plan(params)
+        return self.repository.stream_action_plan(params)
+
+    def transform(self, action_plans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return transform_action_plans(action_plans)
+
+    async def transform_async(self, action_plans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return await get_transform_executor().run(transform_action_plans, action_plans)
 
     async def get_action_plan_realtime(self) -> List[Dict[str, Any]]:
-        action_plan = await self.repository.get_action_plan_realtime()
-        return [self._process_action_plan_data(action_plan) for action_plan in action_plan]
-
-    def _process_action_plan_data(self, action_plan_data: Dict[str, Any]) -> Dict[str, Any]:
-        processed = action_plan_data.copy()
-        json_fields = ['action_plan', 'file', 'company', 'organization', 'workstation']
-
-        for field in json_fields:
-            value = processed.get(field)
-            if isinstance(value, str):
-                try:
-                    processed[field] = json.loads(value)
-                except (json.JSONDecodeError, TypeError):
-                    processed[field] = None
-            else:
-                processed[field] = value if value is not None else {}
-
-        return processed
+        action_plans = await self.repository.get_action_plan_realtime()
+        return await self.transform_async(action_plans)
@@ -1,32 +1,39 @@
-from typing import Dict, Any, List
-import json
+from typing import AsyncIterator, Dict, Any, List
 from repositories import MysqlRepository
 from _types import BaseParams
+from utils import env
+from .row_decoder import FILE_FIELDS, decode_rows
+from .transform_executor import get_transform_executor
+
+def transform_files(files: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return decode_rows(files, FILE_FIELDS)
 
 class FileService:
     def __init__(self, repository: MysqlRepository):
         self.repository = repository
 
     async def get_files(self, params: BaseParams) -> List[Dict[str, Any]]:
-        files = await self.repository.get_files(params)
-        return [self._process_file_data(file) for file in files]
+        files = []
+        async for batch in self.iter_files(params):
+            files.extend(batch)
+        return files
+
+    async def iter_files(self, params: BaseParams) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Entrega cada lote transformado assim que chega do repositório"""
+        async for batch in self.get_batches(params):
+            yield await self.transform_async(batch)
+
+    def get_batches(self, params: BaseParams) -> AsyncIterator[List[Dict[str, Any]]]:
+        if env.MYSQL_FETCH_MODE == "keyset":
+            return self.repository.paginate_files(params)
+        return self.repository.stream_files(params)
+
+    def transform(self, files: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return transform_files(files)
+
+    async def transform_async(self, files: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return await get_transform_executor().run(transform_files, files)
 
     async def get_files_realtime(self) -> List[Dict[str, Any]]:
         files = await self.repository.get_files_realtime()
-        return [self._process_file_data(file) for file in files]
-
-    def _process_file_data(self, file_data: Dict[str, Any]) -> Dict[str, Any]:
-        processed = file_data.copy()
-        json_fields = ['company', 'organization', 'workstation', 'user']
-
-        for field in json_fields:
-            value = processed.get(field)
-            if isinstance(value, str):
-                try:
-                    processed[field] = json.loads(value)
-                except (json.JSONDecodeError, TypeError):
-                    processed[field] = None
-            else:
-                processed[field] = value if value is not None else {}
-
-        return processed
+        return await self.transform_async(files)
@@ -1,9 +1,32 @@
-from typing import List, Dict, Any, Literal
-import json
+from typing import AsyncIterator, List, Dict, Any, Literal
 from repositories import MysqlRepository
 from _types import BaseParams
+from utils import env
 from entities import RiskCalculator
 from schemas import ReportMongoSchema
+from .row_decoder import REPORT_FIELDS, decode_rows
+from .transform_executor import get_transform_executor
+
+def transform_reports(report_name: str, reports: List[Dict[str, Any]]) -> List[ReportMongoSchema]:
+    risks = RiskCalculator.calculate_risks(report_name, reports)
+    decode_rows(reports, REPORT_FIELDS)
+    return [_mount_mongo_schema(report, risk) for report, risk in zip(reports, risks)]
+
+def _mount_mongo_schema(data: Dict[str, Any], risk: str) -> ReportMongoSchema:
+    return ReportMongoSchema(
+        report_id=data["id"],
+        type=data["type"],
+        created_at=data["created_at"],
+        updated_at=data["updated_at"],
+        is_active=bool(data["is_active"]),
+        risk=risk,
+        name=data["report_name"] or "",
+        client=data["client"],
+        file=data["file"],
+        company=data["company"],
+        organization=data["organization"],
+        workstation=data["workstation"]
+    )
 
 class ReportService:
     def __init__(self, repository: MysqlRepository, report_name: Literal["reba", "niosh", "kim_mho", "kim_pp", "strain_index"]):
@@ -13,46 +36,56 @@ class ReportService:
             "reba": {
                 'get': self.repository.get_reba,
                 'get_realtime': self.repository.get_realtime_reba,
+                'stream': self.repository.stream_reba,
+                'paginate': self.repository.paginate_reba,
             },
             "niosh": {
                 'get': self.repository.get_niosh,
                 'get_realtime': self.repository.get_realtime_niosh,
+                'stream': self.repository.stream_niosh,
+                'paginate': self.repository.paginate_niosh,
             },
             "kim_mho": {
                 'get': self.repository.get_kim_mho,
                 'get_realtime': self.repository.get_realtime_kim_mho,
+                'stream': self.repository.stream_kim_mho,
+                'paginate': self.repository.paginate_kim_mho,
             },
             "kim_pp": {
                 'get': self.repository.get_kim_push_pull,
                 'get_realtime': self.repository.get_realtime_kim_push_pull,
+                'stream': self.repository.stream_kim_push_pull,
+                'paginate': self.repository.paginate_kim_push_pull,
             },
             "strain_index": {
                 'get': self.repository.get_strain_index,
                 'get_realtime': self.repository.get_realtime_strain_index,
+                'stream': self.repository.stream_strain_index,
+                'paginate': self.repository.paginate_strain_index,
             },
         }
 
     async def get_reports(self, params: BaseParams) -> List[Dict[str, Any]]:
-        reports = await self._map_reports[self.report_name]['get'](params)
-        return [self._mount_mongo_schema(report, self.report_name) for report in reports]
+        reports = []
+        async for batch in self.iter_reports(params):
+            reports.extend(batch)
+        return reports
+
+    async def iter_reports(self, params: BaseParams) -> AsyncIterator[List[ReportMongoSchema]]:
+        """Entrega cada lote transformado assim que chega do repositório"""
+        async for batch in self.get_batches(params):
+            yield await self.transform_async(batch)
+
+    def get_batches(self, params: BaseParams) -> AsyncIterator[List[Dict[str, Any]]]:
+        fetch_mode = 'paginate' if env.MYSQL_FETCH_MODE == "keyset" else 'stream'
+        return self._map_reports[self.report_name][fetch_mode](params)
+
+    def transform(self, reports: List[Dict[str, Any]]) -> List[ReportMongoSchema]:
+        return transform_reports(self.report_name, reports)
+
+    async def transform_async(self, reports: List[Dict[str, Any]]) -> List[ReportMongoSchema]:
+        return await get_transform_executor().run(transform_reports, self.report_name, reports)
 
     async def get_realtime_reports(self) -> List[Dict[str, Any]]:
         reports = await self._map_reports[self.report_name]['get_realtime']()
-        return [self._mount_mongo_schema(report, self.report_name) for report in reports]
-
-    def _mount_mongo_schema(self, report: Dict[str, Any], report_name: str) -> Dict[str, Any]:
-        data = RiskCalculator.calculate_risk(report_name, report)
-        return ReportMongoSchema(
-            report_id=data["id"],
-            type=data["type"],
-            created_at=data["created_at"],
-            updated_at=data["updated_at"],
-            is_active=bool(data["is_active"]),
-            risk=data["risk"],
-            name=data.get("report_name") or data.get("name") or "",
-            client=data["client"],
-            file=json.loads(data["file"]) if isinstance(data["file"], str) else data["file"],
-            company=json.loads(data["company"]) if isinstance(data["company"], str) else data["company"],
-            organization=json.loads(data["organization"]) if isinstance(data["organization"], str) else data["organization"],
-            workstation=json.loads(data["workstation"]) if isinstance(data["workstation"], str) else data["workstation"]
-        )
\ No newline at end of file
+        return await self.transform_async(reports)
\ No newline at end of file
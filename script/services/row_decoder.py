@@ -0,0 +1,56 @@
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from utils import env
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JsonLoads = Callable[[Any], Any]
+
+JSON_BACKENDS: Dict[str, JsonLoads] = {"json": json.loads}
+if orjson is not None:
+    JSON_BACKENDS["orjson"] = orjson.loads
+
+def get_json_loads(backend: Optional[str] = None) -> JsonLoads:
+    """Escolhe o decodificador JSON; "auto" usa orjson quando estiver instalado"""
+    backend = backend or env.JSON_BACKEND
+    if backend == "auto":
+        backend = "orjson" if "orjson" in JSON_BACKENDS else "json"
+    if backend not in JSON_BACKENDS:
+        raise ValueError(f"JSON backend {backend} is not available; installed: {sorted(JSON_BACKENDS)}")
+    return JSON_BACKENDS[backend]
+
+@dataclass(frozen=True)
+class JsonFields:
+    """Campos JSON embutidos de uma entidade e como tratar valores ausentes ou inválidos"""
+    fields: Tuple[str, ...]
+    # Factory for None or missing values; None leaves them untouched
+    missing: Optional[Callable[[], Any]] = None
+    # Raise on invalid JSON instead of storing None
+    strict: bool = False
+
+REPORT_FIELDS = JsonFields(("file", "company", "organization", "workstation"), strict=True)
+FILE_FIELDS = JsonFields(("company", "organization", "workstation", "user"), missing=dict)
+ACTION_PLAN_FIELDS = JsonFields(("action_plan", "file", "company", "organization", "workstation"), missing=dict)
+
+def decode_rows(rows: List[Dict[str, Any]], spec: JsonFields, loads: Optional[JsonLoads] = None) -> List[Dict[str, Any]]:
+    """Decodifica os campos JSON das linhas no próprio dicionário, sem cópia"""
+    loads = loads or get_json_loads()
+    fields, missing, strict = spec.fields, spec.missing, spec.strict
+    # orjson raises its own JSONDecodeError, which subclasses ValueError
+    errors = () if strict else (ValueError, TypeError)
+
+    for row in rows:
+        for field in fields:
+            value = row.get(field)
+            if isinstance(value, str):
+                try:
+                    row[field] = loads(value)
+                except errors:
+                    row[field] = None
+            elif value is None and missing is not None:
+                row[field] = missing()
+    return rows
@@ -0,0 +1,64 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, List, Optional
+from utils import env
+
+# Workers must not inherit the parent's sockets, pools or driver threads, so they never come from a plain fork
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+class TransformExecutor:
+    """Executa as transformações de lotes em um pool de processos, fora do event loop"""
+
+    def __init__(self, mode: Optional[str] = None, workers: Optional[int] = None, min_rows: Optional[int] = None):
+        self.mode = mode or env.TRANSFORM_EXECUTOR
+        self.workers = workers or env.TRANSFORM_WORKERS or os.cpu_count() or 1
+        self.min_rows = env.TRANSFORM_MIN_ROWS if min_rows is None else min_rows
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode == "process"
+
+    @property
+    def concurrency(self) -> int:
+        """Quantos lotes podem ser transformados ao mesmo tempo"""
+        return self.workers if self.enabled else 1
+
+    async def run(self, transform: Callable[..., List[Any]], *args: Any) -> List[Any]:
+        """Executa transform(*args); o último argumento é o lote de linhas"""
+        if not self.enabled or len(args[-1]) < self.min_rows:
+            # Small batches cost more to pickle than to transform
+            return transform(*args)
+        return await asyncio.get_running_loop().run_in_executor(self._get_pool(), partial(transform, *args))
+
+    async def start(self) -> None:
+        """Sobe o pool antes de qualquer cliente de banco ser criado"""
+        if self.enabled:
+            # The first task starts the fork server; later workers fork from it, never from this process
+            await asyncio.get_running_loop().run_in_executor(self._get_pool(), os.getpid)
+
+    def close(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool:
+            pool.shutdown(cancel_futures=True)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context(START_METHOD))
+            return self._pool
+
+_transform_executor: Optional[TransformExecutor] = None
+
+def get_transform_executor() -> TransformExecutor:
+    """Executor compartilhado por todos os serviços do processo"""
+    global _transform_executor
+    if _transform_executor is None:
+        _transform_executor = TransformExecutor()
+    return _transform_executor
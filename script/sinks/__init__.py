@@ -0,0 +1,17 @@
+from .base import Sink
+from .fan_out import SinkFanOut
+from .mongo import MongoSink
+from .clickhouse import ClickHouseSink
+from .files import JsonlSink, ParquetSink
+from .registry import register_sink, build_sinks
+
+__all__ = [
+    "Sink",
+    "SinkFanOut",
+    "MongoSink",
+    "ClickHouseSink",
+    "JsonlSink",
+    "ParquetSink",
+    "register_sink",
+    "build_sinks"
+]
@@ -0,0 +1,24 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List
+
+def to_documents(batch: List[Any]) -> List[Dict[str, Any]]:
+    """Converte schemas (como ReportMongoSchema) em dicionários"""
+    return [item.create() if hasattr(item, "create") else item for item in batch]
+
+class Sink(ABC):
+    """Destino de carga de um lote extraído; entity é o nome da coleção/tabela"""
+
+    name = "sink"
+
+    async def start(self) -> None:
+        pass
+
+    @abstractmethod
+    async def write(self, entity: str, batch: List[Any]) -> Dict[str, Any]:
+        """Carrega o lote no destino e devolve um resumo da escrita"""
+
+    async def flush(self, entity: str) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
@@ -0,0 +1,37 @@
+import asyncio
+from typing import Any, Dict, List
+from repositories import ClickHouseBufferedWriter, ClickHouseRepository
+from utils import env
+from .base import Sink, to_documents
+
+class ClickHouseSink(Sink):
+    name = "clickhouse"
+
+    def __init__(self, repository: ClickHouseRepository):
+        self.repository = repository
+        self.writer = ClickHouseBufferedWriter(repository)
+
+    @classmethod
+    def from_env(cls) -> "ClickHouseSink":
+        return cls(ClickHouseRepository(
+            host=env.CLICKHOUSE_HOST,
+            database=env.CLICKHOUSE_DATABASE,
+            user=env.CLICKHOUSE_USER,
+            password=env.CLICKHOUSE_PASSWORD,
+            port=env.CLICKHOUSE_PORT,
+            compression=env.CLICKHOUSE_COMPRESSION
+        ))
+
+    async def start(self) -> None:
+        await asyncio.to_thread(self.repository.ensure_tables)
+        await self.writer.start()
+
+    async def write(self, entity: str, batch: List[Any]) -> Dict[str, Any]:
+        await self.writer.add(entity, to_documents(batch))
+        return {}
+
+    async def flush(self, entity: str) -> None:
+        await self.writer.flush(entity)
+
+    async def close(self) -> None:
+        await self.writer.close()
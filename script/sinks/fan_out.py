@@ -0,0 +1,96 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from utils import env
+from .base import Sink
+
+class SinkFanOut:
+    """Distribui cada lote para todos os sinks, com uma fila e um worker por sink e entidade"""
+
+    def __init__(self, sinks: List[Sink], queue_size: Optional[int] = None, batch_rows: Optional[int] = None):
+        self.sinks = sinks
+        self.queue_size = queue_size or env.SINK_QUEUE_SIZE
+        self.batch_rows = batch_rows or env.SINK_BATCH_ROWS
+        self._queues: Dict[Tuple[str, str], asyncio.Queue] = {}
+        self._workers: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._errors: Dict[Tuple[str, str], BaseException] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    async def start(self) -> None:
+        for sink in self.sinks:
+            await sink.start()
+
+    async def write(self, entity: str, batch: List[Any]) -> None:
+        """Enfileira o lote em cada sink; só espera se a fila de algum sink estiver cheia"""
+        self._raise_errors(entity)
+        if not batch:
+            return
+        await asyncio.gather(*(self._get_queue(sink, entity).put(batch) for sink in self.sinks))
+
+    async def flush(self, entity: str) -> None:
+        """Espera os lotes pendentes da entidade e esvazia os buffers dos sinks"""
+        await asyncio.gather(*(queue.join() for (_, queued_entity), queue in list(self._queues.items()) if queued_entity == entity))
+        self._raise_errors(entity)
+        await asyncio.gather(*(sink.flush(entity) for sink in self.sinks))
+
+    def reset_errors(self, entity: str) -> None:
+        """Descarta erros de execuções anteriores antes de uma nova janela"""
+        for key in [key for key in self._errors if key[1] == entity]:
+            del self._errors[key]
+
+    def pop_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Retorna e zera os contadores por sink desde a última chamada"""
+        stats, self._stats = self._stats, {}
+        for sink_stats in stats.values():
+            sink_stats["seconds"] = round(sink_stats["seconds"], 3)
+        return stats
+
+    async def close(self) -> None:
+        for entity in {entity for _, entity in self._queues}:
+            await self.flush(entity)
+        for worker in self._workers.values():
+            worker.cancel()
+        await asyncio.gather(*self._workers.values(), return_exceptions=True)
+        for sink in self.sinks:
+            await sink.close()
+
+    def _get_queue(self, sink: Sink, entity: str) -> asyncio.Queue:
+        key = (sink.name, entity)
+        if key not in self._queues:
+            self._queues[key] = asyncio.Queue(self.queue_size)
+            self._workers[key] = asyncio.create_task(self._run(sink, entity, self._queues[key]))
+        return self._queues[key]
+
+    async def _run(self, sink: Sink, entity: str, queue: asyncio.Queue) -> None:
+        while True:
+            batches = [await queue.get()]
+            rows = len(batches[0])
+            # Batches that piled up behind a slow write go out together
+            while rows < self.batch_rows and not queue.empty():
+                batches.append(queue.get_nowait())
+                rows += len(batches[-1])
+
+            try:
+                merged = [item for batch in batches for item in batch]
+                started = time.perf_counter()
+                result = await sink.write(entity, merged)
+                self._record(sink.name, len(merged), time.perf_counter() - started, result)
+            except Exception as e:
+                self._errors[(sink.name, entity)] = e
+                print(f"Sink {sink.name} failed to write {entity}: {e}", flush=True)
+            finally:
+                for _ in batches:
+                    queue.task_done()
+
+    def _record(self, name: str, rows: int, seconds: float, result: Dict[str, Any]) -> None:
+        stats = self._stats.setdefault(name, {"batches": 0, "rows": 0, "seconds": 0.0})
+        stats["batches"] += 1
+        stats["rows"] += rows
+        stats["seconds"] += seconds
+        for key, value in (result or {}).items():
+            stats[key] = stats.get(key, 0) + value
+
+    def _raise_errors(self, entity: str) -> None:
+        for (name, errored_entity), error in self._errors.items():
+            if errored_entity == entity:
+                raise RuntimeError(f"Sink {name} failed for {entity}") from error
@@ -0,0 +1,60 @@
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from utils import env
+from .base import Sink, to_documents
+
+class JsonlSink(Sink):
+    """Acrescenta os documentos em arquivos JSONL diários por entidade"""
+
+    name = "jsonl"
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or env.SINK_FILE_DIR
+
+    async def write(self, entity: str, batch: List[Any]) -> Dict[str, Any]:
+        documents = to_documents(batch)
+        path = await asyncio.to_thread(self._append, entity, documents)
+        return {"files": 1} if path else {}
+
+    def _append(self, entity: str, documents: List[Dict[str, Any]]) -> str:
+        if not documents:
+            return ""
+        directory = os.path.join(self.directory, entity)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{datetime.now():%Y-%m-%d}.jsonl")
+        with open(path, "a", encoding="utf-8") as file:
+            file.writelines(json.dumps(document, default=str) + "\n" for document in documents)
+        return path
+
+class ParquetSink(Sink):
+    """Grava cada lote como um arquivo Parquet por entidade; requer pyarrow"""
+
+    name = "parquet"
+
+    def __init__(self, directory: Optional[str] = None):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:
+            raise RuntimeError("The parquet sink requires pyarrow to be installed") from e
+        self._pyarrow = pyarrow
+        self._parquet = pyarrow.parquet
+        self.directory = directory or env.SINK_FILE_DIR
+
+    async def write(self, entity: str, batch: List[Any]) -> Dict[str, Any]:
+        documents = to_documents(batch)
+        path = await asyncio.to_thread(self._write_file, entity, documents)
+        return {"files": 1} if path else {}
+
+    def _write_file(self, entity: str, documents: List[Dict[str, Any]]) -> str:
+        if not documents:
+            return ""
+        directory = os.path.join(self.directory, entity, f"{datetime.now():%Y-%m-%d}")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{time.time_ns()}.parquet")
+        self._parquet.write_table(self._pyarrow.Table.from_pylist(documents), path)
+        return path
@@ -0,0 +1,26 @@
+from typing import Any, Dict, List
+from repositories import MongoRepository
+from .base import Sink
+
+class MongoSink(Sink):
+    name = "mongo"
+
+    def __init__(self, mongo_repository: MongoRepository):
+        self.mongo_repository = mongo_repository
+        self._upserts = {
+            "reports": mongo_repository.bulk_upsert_reports,
+            "files": mongo_repository.bulk_upsert_files,
+            "action_plans": mongo_repository.bulk_upsert_action_plans,
+        }
+
+    async def write(self, entity: str, batch: List[Any]) -> Dict[str, Any]:
+        stats = await self._upserts[entity](entity, batch)
+        if not stats:
+            return {}
+        return {
+            "upserted": stats["upserted"],
+            "modified": stats["modified"],
+            "skipped": stats["skipped"],
+            "events": stats["events"],
+            "bulk_batches": len(stats["batches"]),
+        }
@@ -0,0 +1,29 @@
+from typing import Callable, Dict, Sequence, Union
+from repositories import MongoRepository
+from .base import Sink
+from .clickhouse import ClickHouseSink
+from .fan_out import SinkFanOut
+from .files import JsonlSink, ParquetSink
+from .mongo import MongoSink
+
+SinkFactory = Callable[[MongoRepository], Sink]
+
+_REGISTRY: Dict[str, SinkFactory] = {}
+
+def register_sink(name: str, factory: SinkFactory) -> None:
+    """Registra um sink que pode ser habilitado pelo nome em SINKS"""
+    _REGISTRY[name] = factory
+
+def build_sinks(names: Union[str, Sequence[str]], mongo_repository: MongoRepository) -> SinkFanOut:
+    """Monta o fan-out com os sinks pedidos, na ordem informada"""
+    if isinstance(names, str):
+        names = [name.strip() for name in names.split(",") if name.strip()]
+    unknown = [name for name in names if name not in _REGISTRY]
+    if unknown:
+        raise ValueError(f"Unknown sinks {unknown}; available: {sorted(_REGISTRY)}")
+    return SinkFanOut([_REGISTRY[name](mongo_repository) for name in names])
+
+register_sink("mongo", MongoSink)
+register_sink("clickhouse", lambda _: ClickHouseSink.from_env())
+register_sink("jsonl", lambda _: JsonlSink())
+register_sink("parquet", lambda _: ParquetSink())
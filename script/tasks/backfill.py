@@ -0,0 +1,79 @@
+import argparse
+import asyncio
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from repositories import MysqlRepository, MongoRepository
+from services import get_transform_executor
+from sinks import build_sinks
+from orchestrators import ReportsOrchestrator, FilesOrchestrator, ActionPlanOrchestrator, JobGraph
+from utils import env
+
+TARGETS = ["reports", "files", "action_plans"]
+
+async def backfill_until_caught_up(run_backfill, max_windows: int) -> None:
+    while True:
+        committed = await run_backfill(max_windows)
+        if committed < max_windows:
+            return
+
+async def main(targets, max_windows: int) -> int:
+    # The transform workers start before any client opens a connection
+    transform_executor = get_transform_executor()
+    await transform_executor.start()
+    if transform_executor.enabled:
+        print(f"Backfill: Transform pool ready with up to {transform_executor.workers} worker(s)", flush=True)
+    mongo_repository = MongoRepository(uri=env.MONGO_URI, database=env.MONGO_DATABASE)
+    index_report = await mongo_repository.ensure_indexes(create=env.MONGO_ENSURE_INDEXES)
+    for collection, names in index_report["created"].items():
+        print(f"Backfill: Created indexes on {collection}: {', '.join(names)}", flush=True)
+    for collection, errors in index_report["failed"].items():
+        print(f"Backfill: Failed to create indexes on {collection}: {'; '.join(errors)}", flush=True)
+    for collection, names in index_report["missing"].items():
+        print(f"Backfill: Missing indexes on {collection}: {', '.join(names)}", flush=True)
+    if env.ROLLUPS:
+        for collection in await mongo_repository.ensure_rollups():
+            print(f"Backfill: Rebuilt rollup {collection}", flush=True)
+    sinks = build_sinks(env.SINKS, mongo_repository)
+    await sinks.start()
+    print(f"Backfill: Loading into sinks: {', '.join(sink.name for sink in sinks.sinks)}", flush=True)
+    reports_orchestrator = ReportsOrchestrator(mongo_repository, sinks)
+    files_orchestrator = FilesOrchestrator(mongo_repository, sinks)
+    action_plan_orchestrator = ActionPlanOrchestrator(mongo_repository, sinks)
+
+    async with MysqlRepository(url=env.STANDARD_MYSQL_URL, client="STANDARD") as repository_standard,\
+        MysqlRepository(url=env.JOHN_DEERE_MYSQL_URL, client="JOHN_DEERE") as repository_john_deere:
+
+        backfills = {
+            "reports": lambda windows: reports_orchestrator.run_reports_backfill(repository_standard, repository_john_deere, windows),
+            "files": lambda windows: files_orchestrator.run_files_backfill(repository_standard, repository_john_deere, windows),
+            "action_plans": lambda windows: action_plan_orchestrator.run_action_plans_backfill(repository_standard, repository_john_deere, windows),
+        }
+
+        print(f"Starting backfill for {', '.join(targets)}", flush=True)
+        graph = JobGraph()
+        for target in targets:
+            graph.add(target, lambda run_backfill=backfills[target]: backfill_until_caught_up(run_backfill, max_windows))
+        errors = await graph.run()
+
+        print(f"MySQL pool standard {repository_standard.pool_stats()}", flush=True)
+        print(f"MySQL pool john_deere {repository_john_deere.pool_stats()}", flush=True)
+        print(f"Unchanged upserts skipped {mongo_repository.fingerprints.pop_stats()}", flush=True)
+        await sinks.close()
+        transform_executor.close()
+        print(f"Sinks {sinks.pop_stats()}", flush=True)
+
+    if errors:
+        print(f"Backfill completed with errors in: {', '.join(errors)}", flush=True)
+        return 1
+
+    print("Backfill completed successfully", flush=True)
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Catch up lagging control collections with parallel backfill")
+    parser.add_argument("targets", nargs="*", choices=TARGETS, help="Defaults to all targets")
+    parser.add_argument("--max-windows", type=int, default=env.BACKFILL_MAX_WINDOWS, help="Windows planned per backfill round")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.targets or TARGETS, args.max_windows)))
@@ -0,0 +1,76 @@
+import argparse
+import json
+import random
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.row_decoder import ACTION_PLAN_FIELDS, FILE_FIELDS, JSON_BACKENDS, REPORT_FIELDS, JsonFields, decode_rows
+
+SPECS = {"reports": REPORT_FIELDS, "files": FILE_FIELDS, "action_plans": ACTION_PLAN_FIELDS}
+
+def _random_row(rng: random.Random, spec: JsonFields) -> dict:
+    row = {"id": rng.randrange(1_000_000), "client": "STANDARD"}
+    for field in spec.fields:
+        roll = rng.random()
+        if roll < 0.05 and spec.missing is not None:
+            row[field] = None
+        elif roll < 0.08 and not spec.strict:
+            row[field] = "{invalid"
+        else:
+            row[field] = json.dumps({"id": rng.randrange(1_000_000), "name": f"{field} {rng.randrange(1000)}", "tags": ["a", "b"]})
+    return row
+
+def previous_decode(rows: list, spec: JsonFields) -> list:
+    """Caminho anterior dos serviços: cópia da linha e json.loads campo a campo"""
+    decoded = []
+    for row in rows:
+        processed = row.copy()
+        for field in spec.fields:
+            value = processed.get(field)
+            if isinstance(value, str):
+                try:
+                    processed[field] = json.loads(value)
+                except (json.JSONDecodeError, TypeError):
+                    processed[field] = None
+            elif spec.missing is not None:
+                processed[field] = value if value is not None else {}
+        decoded.append(processed)
+    return decoded
+
+def _measure(decode, rows: list, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        # Decoding happens in place, so every round gets fresh rows
+        batch = [row.copy() for row in rows]
+        started = time.perf_counter()
+        decode(batch)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def main(entities, rows: int, repeat: int, seed: int) -> int:
+    rng = random.Random(seed)
+    for entity in entities:
+        spec = SPECS[entity]
+        sample = [_random_row(rng, spec) for _ in range(rows)]
+        expected = previous_decode(sample, spec)
+
+        baseline = _measure(lambda batch: previous_decode(batch, spec), sample, repeat)
+        print(f"{entity} previous: {baseline:.3f}s for {rows} rows", flush=True)
+        for backend, loads in JSON_BACKENDS.items():
+            if decode_rows([row.copy() for row in sample], spec, loads) != expected:
+                print(f"{entity} {backend}: output differs from the previous path", flush=True)
+                return 1
+            seconds = _measure(lambda batch: decode_rows(batch, spec, loads), sample, repeat)
+            print(f"{entity} {backend}: {seconds:.3f}s ({baseline / seconds:.2f}x)", flush=True)
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the shared row decoder with the previous per-service decoding")
+    parser.add_argument("entities", nargs="*", choices=list(SPECS), help="Defaults to all entities")
+    parser.add_argument("--rows", type=int, default=50000, help="Synthetic rows per entity")
+    parser.add_argument("--repeat", type=int, default=5, help="Rounds per decoder; the best round is reported")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    sys.exit(main(args.entities or list(SPECS), args.rows, args.repeat, args.seed))
@@ -0,0 +1,72 @@
+import argparse
+import random
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from entities import RiskCalculator
+from entities.risk_batch import BATCH_COLUMNS, is_available, to_columns
+from utils import KIM_MHO_RATING_POINTS, KIM_MHO_INTENSITIES
+
+REPORT_NAMES = list(BATCH_COLUMNS)
+
+def _maybe(rng: random.Random, value):
+    return None if rng.random() < 0.1 else value
+
+def _random_report(rng: random.Random, report_name: str) -> dict:
+    """Gera um report sintético cobrindo limites, valores ausentes e categorias desconhecidas"""
+    if report_name == "reba":
+        return {"score_seconds": _maybe(rng, rng.choice([0, 1, 3, 3.5, 7, 7.01, 10, 11, rng.uniform(0, 15)]))}
+    if report_name == "kim_pp":
+        return {"score": _maybe(rng, rng.choice([0, 9.99, 10, 99, 100, rng.uniform(0, 150)]))}
+    if report_name == "strain_index":
+        return {
+            "score_left_rsi": _maybe(rng, rng.choice([0, 9.9, 10, rng.uniform(0, 20)])),
+            "score_right_rsi": _maybe(rng, rng.choice([0, 9.9, 10, rng.uniform(0, 20)])),
+        }
+    if report_name == "niosh":
+        return {"risk": _maybe(rng, rng.choice(["LOW", "MODERATE", "HIGH", "VERY_HIGH"]))}
+
+    report = {"duration": _maybe(rng, rng.choice([0, 0.5, 1, 2, rng.uniform(0, 10)]))}
+    for key, points in KIM_MHO_RATING_POINTS.items():
+        report[key] = _maybe(rng, rng.choice(list(points) + ["UNKNOWN"]))
+    for side in ("left", "right"):
+        report[f"{side}_force_intensity"] = _maybe(rng, rng.choice(KIM_MHO_INTENSITIES + ["UNKNOWN"]))
+        report[f"{side}_force_frequency"] = _maybe(rng, rng.choice([0, 4, 5, 15, 30, 59, 60, 90, 91, rng.uniform(0, 120)]))
+        report[f"{side}_force_type"] = _maybe(rng, rng.choice(["HOLDING", "MOVING", "OTHER"]))
+    return report
+
+def main(report_names, rows: int, seed: int) -> int:
+    if not is_available():
+        print("numpy is not installed; only the row by row risk path is available", flush=True)
+        return 1
+
+    rng = random.Random(seed)
+    mismatches = 0
+    for report_name in report_names:
+        reports = [_random_report(rng, report_name) for _ in range(rows)]
+
+        started = time.perf_counter()
+        expected = [RiskCalculator.calculate_risk(report_name, report)["risk"] for report in reports]
+        scalar_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        actual = RiskCalculator.calculate_risk_batch(report_name, to_columns(report_name, reports))
+        batch_seconds = time.perf_counter() - started
+
+        diffs = [index for index, (left, right) in enumerate(zip(expected, actual)) if left != right]
+        mismatches += len(diffs)
+        print(f"{report_name}: {len(diffs)} mismatch(es), row by row {scalar_seconds:.3f}s, batch {batch_seconds:.3f}s", flush=True)
+        for index in diffs[:5]:
+            print(f"  {reports[index]} -> expected {expected[index]}, got {actual[index]}", flush=True)
+
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the batch risk scoring against the row by row calculation")
+    parser.add_argument("report_names", nargs="*", choices=REPORT_NAMES, help="Defaults to all report types")
+    parser.add_argument("--rows", type=int, default=100000, help="Synthetic reports per type")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    sys.exit(main(args.report_names or REPORT_NAMES, args.rows, args.seed))
@@ -4,14 +4,34 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from repositories import MysqlRepository, MongoRepository
-from orchestrators import ReportsOrchestrator, FilesOrchestrator, ActionPlanOrchestrator
+from services import get_transform_executor
+from sinks import build_sinks
+from orchestrators import ReportsOrchestrator, FilesOrchestrator, ActionPlanOrchestrator, JobGraph
 from utils import env
 
 async def main():
+    # The transform workers start before any client opens a connection
+    transform_executor = get_transform_executor()
+    await transform_executor.start()
+    if transform_executor.enabled:
+        print(f"Extract: Transform pool ready with up to {transform_executor.workers} worker(s)", flush=True)
     mongo_repository = MongoRepository(uri=env.MONGO_URI, database=env.MONGO_DATABASE)
-    reports_orchestrator = ReportsOrchestrator(mongo_repository)
-    files_orchestrator = FilesOrchestrator(mongo_repository)
-    action_plan_orchestrator = ActionPlanOrchestrator(mongo_repository)
+    index_report = await mongo_repository.ensure_indexes(create=env.MONGO_ENSURE_INDEXES)
+    for collection, names in index_report["created"].items():
+        print(f"Extract: Created indexes on {collection}: {', '.join(names)}", flush=True)
+    for collection, errors in index_report["failed"].items():
+        print(f"Extract: Failed to create indexes on {collection}: {'; '.join(errors)}", flush=True)
+    for collection, names in index_report["missing"].items():
+        print(f"Extract: Missing indexes on {collection}: {', '.join(names)}", flush=True)
+    if env.ROLLUPS:
+        for collection in await mongo_repository.ensure_rollups():
+            print(f"Extract: Rebuilt rollup {collection}", flush=True)
+    sinks = build_sinks(env.SINKS, mongo_repository)
+    await sinks.start()
+    print(f"Extract: Loading into sinks: {', '.join(sink.name for sink in sinks.sinks)}", flush=True)
+    reports_orchestrator = ReportsOrchestrator(mongo_repository, sinks)
+    files_orchestrator = FilesOrchestrator(mongo_repository, sinks)
+    action_plan_orchestrator = ActionPlanOrchestrator(mongo_repository, sinks)
     
     async with MysqlRepository(url=env.STANDARD_MYSQL_URL, client="STANDARD") as repository_standard,\
         MysqlRepository(url=env.JOHN_DEERE_MYSQL_URL, client="JOHN_DEERE") as repository_john_deere:
@@ -19,22 +39,27 @@ async def main():
         while True:
             try:
                 print("Starting ETL cycle...", flush=True)
-                await reports_orchestrator.run_reports_etl(repository_standard, repository_john_deere)
-                print("Reports ETL completed", flush=True)
-            
-                await files_orchestrator.run_files_etl(repository_standard, repository_john_deere)
-                print("Files ETL completed", flush=True)
-                
-                await action_plan_orchestrator.run_action_plans_etl(repository_standard, repository_john_deere)
-                print("Action Plans ETL completed", flush=True)
+                graph = JobGraph()
+                graph.add("reports", lambda: reports_orchestrator.run_reports_etl(repository_standard, repository_john_deere))
+                graph.add("files", lambda: files_orchestrator.run_files_etl(repository_standard, repository_john_deere))
+                graph.add("action_plans", lambda: action_plan_orchestrator.run_action_plans_etl(repository_standard, repository_john_deere))
+                errors = await graph.run()
                 
-                print("ETL cycle completed successfully", flush=True)
+                if errors:
+                    print(f"ETL cycle completed with errors in: {', '.join(errors)}", flush=True)
+                else:
+                    print("ETL cycle completed successfully", flush=True)
                 
             except Exception as e:
                 print(f"Error in ETL cycle: {e}", flush=True)
                 import traceback
                 traceback.print_exc()
             
+            print(f"Extract: MySQL pool standard {repository_standard.pool_stats()}", flush=True)
+            print(f"Extract: MySQL pool john_deere {repository_john_deere.pool_stats()}", flush=True)
+            print(f"Extract: Unchanged upserts skipped {mongo_repository.fingerprints.pop_stats()}", flush=True)
+            print(f"Extract: Sinks {sinks.pop_stats()}", flush=True)
+
             sleep_time = int(env.JOB_SLEEP_SECONDS)
             print(f"Extract: Sleeping for {sleep_time} seconds", flush=True)
             await asyncio.sleep(sleep_time) 
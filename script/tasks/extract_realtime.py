@@ -4,11 +4,18 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from repositories import MysqlRepository, MongoRepository
-from orchestrators import ReportsOrchestrator, FilesOrchestrator, ActionPlanOrchestrator
+from orchestrators import ReportsOrchestrator, FilesOrchestrator, ActionPlanOrchestrator, JobGraph
 from utils import env
 
 async def main():
     mongo_repository = MongoRepository(uri=env.MONGO_URI, database=env.MONGO_DATABASE)
+    index_report = await mongo_repository.ensure_indexes(create=env.MONGO_ENSURE_INDEXES)
+    for collection, names in index_report["created"].items():
+        print(f"Extract realtime: Created indexes on {collection}: {', '.join(names)}", flush=True)
+    for collection, errors in index_report["failed"].items():
+        print(f"Extract realtime: Failed to create indexes on {collection}: {'; '.join(errors)}", flush=True)
+    for collection, names in index_report["missing"].items():
+        print(f"Extract realtime: Missing indexes on {collection}: {', '.join(names)}", flush=True)
     reports_orchestrator = ReportsOrchestrator(mongo_repository)
     files_orchestrator = FilesOrchestrator(mongo_repository)
     action_plan_orchestrator = ActionPlanOrchestrator(mongo_repository)
@@ -19,19 +26,22 @@ async def main():
         while True:
             try:
                 print("Starting Realtime ETL cycle...", flush=True)
-                await reports_orchestrator.run_realtime_reports_etl(repository_standard, repository_john_deere)
-                print("Realtime Reports ETL completed", flush=True)
+                graph = JobGraph()
+                graph.add("realtime_reports", lambda: reports_orchestrator.run_realtime_reports_etl(repository_standard, repository_john_deere))
+                graph.add("realtime_files", lambda: files_orchestrator.run_realtime_files_etl(repository_standard, repository_john_deere))
+                graph.add("realtime_action_plans", lambda: action_plan_orchestrator.run_realtime_action_plans_etl(repository_standard, repository_john_deere))
+                errors = await graph.run()
                 
-                await files_orchestrator.run_realtime_files_etl(repository_standard, repository_john_deere)
-                print("Realtime Files ETL completed", flush=True)
-                
-                await action_plan_orchestrator.run_realtime_action_plans_etl(repository_standard, repository_john_deere)
-                print("Realtime Action Plans ETL completed", flush=True)
-                
-                print("Realtime ETL cycle completed successfully", flush=True)
+                if errors:
+                    print(f"Realtime ETL cycle completed with errors in: {', '.join(errors)}", flush=True)
+                else:
+                    print("Realtime ETL cycle completed successfully", flush=True)
             except Exception as e:
                 print(f"Error in Realtime ETL cycle: {e}", flush=True)
             
+            print(f"Extract realtime: MySQL pool standard {repository_standard.pool_stats()}", flush=True)
+            print(f"Extract realtime: MySQL pool john_deere {repository_john_deere.pool_stats()}", flush=True)
+
             sleep_time = int(env.JOB_REALTIME_SLEEP_SECONDS)
             print(f"Extract realtime: Sleeping for {sleep_time} seconds", flush=True)
             await asyncio.sleep(sleep_time) 
@@ -0,0 +1,28 @@
+import argparse
+import asyncio
+import sys
+import os
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from repositories import MongoRepository
+from utils import env
+
+TARGETS = ["reports", "files"]
+
+async def main(targets, start_date, end_date, batch_size: int) -> int:
+    async with MongoRepository(uri=env.MONGO_URI, database=env.MONGO_DATABASE) as mongo_repository:
+        for target in targets:
+            print(f"Migrating {target} into {mongo_repository.timeseries.timeseries[target].collection}", flush=True)
+            migrated = await mongo_repository.migrate_to_timeseries(target, start_date, end_date, batch_size)
+            print(f"Migrated {migrated} {target} event(s)", flush=True)
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Copy reports and files into the time-series event collections")
+    parser.add_argument("targets", nargs="*", choices=TARGETS, help="Defaults to all targets")
+    parser.add_argument("--start", type=datetime.fromisoformat, help="Only documents created at or after this date")
+    parser.add_argument("--end", type=datetime.fromisoformat, help="Only documents created at or before this date")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Documents inserted per batch")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.targets or TARGETS, args.start, args.end, args.batch_size)))
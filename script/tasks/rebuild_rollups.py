@@ -0,0 +1,23 @@
+import argparse
+import asyncio
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from repositories import MongoRepository
+from repositories.rollups import ROLLUPS
+from utils import env
+
+TARGETS = list(ROLLUPS)
+
+async def main(targets) -> int:
+    async with MongoRepository(uri=env.MONGO_URI, database=env.MONGO_DATABASE) as mongo_repository:
+        for collection in await mongo_repository.rebuild_rollups(targets):
+            print(f"Rebuilt rollup {collection}", flush=True)
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompute the daily rollups from their source collections")
+    parser.add_argument("targets", nargs="*", choices=TARGETS, help="Defaults to all rollups")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.targets or TARGETS)))
@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from repositories.mongo import MongoRepository
+from utils import env
+
+KEY_FIELDS = ("file_id", "created_at", "client")
+
+class FakeResult:
+    matched_count = modified_count = upserted_count = inserted_count = deleted_count = 0
+
+class FakeCollection:
+    async def bulk_write(self, bulk_ops, ordered):
+        return FakeResult()
+
+class FakeFingerprints:
+    def __init__(self):
+        self.remembered = []
+
+    async def filter_changed(self, collection, documents, key_fields):
+        return documents, 0
+
+    def remember(self, collection, documents, key_fields):
+        self.remembered.extend(documents)
+
+class FakeTimeSeries:
+    def tracks(self, collection):
+        return False
+
+class FailingRollups:
+    def tracks(self, collection):
+        return True
+
+    async def snapshot(self, collection, documents, key_fields):
+        return {}
+
+    async def apply(self, collection, previous, documents, key_fields):
+        raise RuntimeError("rollup write failed")
+
+def _repository() -> MongoRepository:
+    repository = MongoRepository.__new__(MongoRepository)
+    repository.db = {"files": FakeCollection()}
+    repository.fingerprints = FakeFingerprints()
+    repository.timeseries = FakeTimeSeries()
+    repository.rollups = FailingRollups()
+    return repository
+
+def test_failed_rollup_keeps_documents_pending(monkeypatch):
+    monkeypatch.setattr(env, "SKIP_UNCHANGED_UPSERTS", True)
+    monkeypatch.setattr(env, "ROLLUPS", True)
+    monkeypatch.setattr(env, "MONGO_STORAGE_MODE", "collection")
+    repository = _repository()
+    documents = [{"file_id": 1, "created_at": None, "client": "standard", "status": "DONE"}]
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(repository._bulk_upsert("files", documents, KEY_FIELDS))
+
+    # Nothing was fingerprinted, so the next run upserts the file and applies the rollup again
+    assert repository.fingerprints.remembered == []
@@ -0,0 +1,42 @@
+import pytest
+
+from entities.risk_batch import BATCH_COLUMNS
+from repositories.projections import REPORT_COLUMNS, REPORT_NAME_COLUMNS, get_columns
+from utils import env
+
+# Fields ReportMongoSchema reads from every report row; report_name comes from the aliased name column
+SCHEMA_FIELDS = ("id", "created_at", "updated_at", "is_active")
+
+QUERY_TO_REPORT = {
+    "reba": "reba",
+    "kim_push_pull": "kim_pp",
+    "strain_index": "strain_index",
+    "niosh": "niosh",
+    "kim_mho": "kim_mho",
+}
+
+def test_report_projections_cover_every_consumed_field():
+    assert set(REPORT_COLUMNS) == set(QUERY_TO_REPORT) == set(REPORT_NAME_COLUMNS)
+    for query_name, report_name in QUERY_TO_REPORT.items():
+        missing = set(SCHEMA_FIELDS + BATCH_COLUMNS[report_name]) - set(REPORT_COLUMNS[query_name])
+        assert not missing, f"{query_name} projection misses {sorted(missing)}"
+
+def test_projection_lists_columns_when_enabled(monkeypatch):
+    monkeypatch.setattr(env, "COLUMN_PROJECTION", True)
+    expected = [f"r.{column}" for column in REPORT_COLUMNS["reba"]] + ["r.report_name AS report_name"]
+    assert get_columns("reba", "r") == ", ".join(expected)
+
+@pytest.mark.parametrize("projection", [True, False])
+def test_name_column_is_aliased_to_report_name(monkeypatch, projection):
+    monkeypatch.setattr(env, "COLUMN_PROJECTION", projection)
+    monkeypatch.setitem(REPORT_NAME_COLUMNS, "niosh", "name")
+    assert get_columns("niosh", "n").endswith("n.name AS report_name")
+
+def test_action_plans_keep_every_column(monkeypatch):
+    # The dashboard reads due_date and other action plan columns beyond the schema fields
+    monkeypatch.setattr(env, "COLUMN_PROJECTION", True)
+    assert get_columns("action_plan", "apv") == "apv.*"
+
+def test_projection_disabled_selects_everything(monkeypatch):
+    monkeypatch.setattr(env, "COLUMN_PROJECTION", False)
+    assert get_columns("kim_mho", "kmho") == "kmho.*"
@@ -0,0 +1,144 @@
+import math
+from decimal import Decimal
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from entities import RiskCalculator
+from entities.risk_batch import BATCH_COLUMNS, _force_points, to_columns
+from entities.risk_tables import FORCE_TABLES, force_points
+from utils import (
+    env,
+    KIM_PUSH_PULL_RISK_MAX_SCORE,
+    REBA_RISK_MAX_SCORE,
+    STRAIN_INDEX_RISK_MAX_SCORE,
+    KIM_MHO_RISK_MAX_SCORE,
+    KIM_MHO_HOLDING_FREQUENCIES,
+    KIM_MHO_MOVING_FREQUENCIES,
+    KIM_MHO_INTENSITIES,
+    KIM_MHO_RATING_POINTS,
+)
+
+NAN = float("nan")
+
+def _around(threshold) -> list:
+    """O limite exato, os vizinhos imediatos em float e a mesma fronteira como Decimal"""
+    return [
+        threshold,
+        math.nextafter(threshold, -math.inf),
+        math.nextafter(threshold, math.inf),
+        threshold - 0.5,
+        threshold + 0.5,
+        Decimal(str(threshold)),
+        Decimal(str(threshold)) - Decimal("0.01"),
+        Decimal(str(threshold)) + Decimal("0.01"),
+    ]
+
+def _scores(thresholds) -> list:
+    values = [None, NAN, 0, -1, Decimal("0")]
+    for threshold in thresholds:
+        values.extend(_around(threshold))
+    return values
+
+def _frequencies(frequencies) -> list:
+    values = [None, NAN, 0, -1, Decimal("4"), frequencies[-1] + 1, math.nextafter(frequencies[-1], math.inf)]
+    for frequency in frequencies:
+        values.extend([frequency, math.nextafter(frequency, -math.inf), math.nextafter(frequency, math.inf)])
+    return values
+
+def _force_reports() -> list:
+    """Um report por célula das matrizes de força, dos dois lados, e combinações desconhecidas"""
+    reports = []
+    for type_name, frequencies in (("HOLDING", KIM_MHO_HOLDING_FREQUENCIES), ("MOVING", KIM_MHO_MOVING_FREQUENCIES)):
+        for intensity in KIM_MHO_INTENSITIES + ["UNKNOWN", None]:
+            for frequency in _frequencies(frequencies):
+                for side in ("left", "right"):
+                    reports.append({
+                        "duration": 1,
+                        f"{side}_force_type": type_name,
+                        f"{side}_force_intensity": intensity,
+                        f"{side}_force_frequency": frequency,
+                    })
+    for type_name in ("OTHER", None):
+        reports.append({"duration": 1, "left_force_type": type_name, "left_force_intensity": "PEAK", "left_force_frequency": 15})
+    return reports
+
+def _duration_reports() -> list:
+    # arm_posture POOR (3) + force_transfer RESTRICTED (2) scores 5, so each duration maps to a known total
+    reports = []
+    for threshold in KIM_MHO_RISK_MAX_SCORE.values():
+        for duration in _around(threshold / 5):
+            reports.append({"duration": duration, "arm_posture": "POOR", "force_transfer": "RESTRICTED"})
+    for duration in (None, NAN, 0, Decimal("0"), Decimal("2.5")):
+        reports.append({
+            "duration": duration,
+            "arm_posture": "POOR",
+            "left_force_type": "HOLDING",
+            "left_force_intensity": "VERY_LOW",
+            "left_force_frequency": 15,
+        })
+    return reports
+
+def _rating_reports() -> list:
+    reports = []
+    for key, points in KIM_MHO_RATING_POINTS.items():
+        for value in list(points) + ["UNKNOWN", None]:
+            for duration in (1, 4, 10):
+                reports.append({"duration": duration, key: value, "body_posture": "SEVERELY_INCLINED"})
+    return reports
+
+CASES = {
+    "reba": [{"score_seconds": score} for score in _scores(REBA_RISK_MAX_SCORE.values())],
+    "kim_pp": [{"score": score} for score in _scores(KIM_PUSH_PULL_RISK_MAX_SCORE.values())],
+    "strain_index": [
+        {"score_left_rsi": left, "score_right_rsi": right}
+        for left in _scores(STRAIN_INDEX_RISK_MAX_SCORE.values())
+        for right in (None, NAN, 0, STRAIN_INDEX_RISK_MAX_SCORE["SAFE"], Decimal("9.99"))
+    ],
+    "niosh": [{"risk": risk} for risk in ("LOW", "MODERATE", "HIGH", "VERY_HIGH", "UNKNOWN", None)],
+    "kim_mho": _force_reports() + _duration_reports() + _rating_reports(),
+}
+
+@pytest.fixture(autouse=True)
+def vectorized(monkeypatch):
+    monkeypatch.setattr(env, "VECTORIZED_RISK", True)
+
+def test_every_report_type_is_covered():
+    assert set(CASES) == set(BATCH_COLUMNS)
+
+@pytest.mark.parametrize("report_name", sorted(CASES))
+def test_batch_matches_scalar(report_name):
+    reports = CASES[report_name]
+    expected = [RiskCalculator.calculate_risk_value(report_name, report) for report in reports]
+    actual = RiskCalculator.calculate_risks(report_name, reports)
+
+    assert len(actual) == len(expected)
+    for report, left, right in zip(reports, expected, actual):
+        assert left == right, report
+
+def test_batch_force_points_match_every_matrix_cell():
+    reports = _force_reports()
+    columns = to_columns("kim_mho", reports)
+    for side in ("left", "right"):
+        actual = _force_points(columns, side)
+        for report, points in zip(reports, actual):
+            expected = force_points(
+                report.get(f"{side}_force_type"),
+                report.get(f"{side}_force_intensity"),
+                report.get(f"{side}_force_frequency"),
+            )
+            assert points == expected, report
+
+def test_every_matrix_cell_is_reached():
+    reached = {
+        (report[f"{side}_force_type"], report[f"{side}_force_intensity"], report[f"{side}_force_frequency"])
+        for report in _force_reports()
+        for side in ("left", "right")
+        if f"{side}_force_type" in report
+    }
+    for type_name, (matrix, frequencies) in FORCE_TABLES.items():
+        for row, intensity in enumerate(KIM_MHO_INTENSITIES):
+            for column, frequency in enumerate(frequencies):
+                assert (type_name, intensity, frequency) in reached
+                assert force_points(type_name, intensity, frequency) == matrix[row][column]
@@ -0,0 +1,19 @@
+import pytest
+
+from sinks import Sink, build_sinks, register_sink
+from sinks import registry
+
+class SinkWithoutWrite(Sink):
+    name = "without_write"
+
+def test_sink_without_write_fails_when_built(monkeypatch):
+    monkeypatch.setattr(registry, "_REGISTRY", dict(registry._REGISTRY))
+    register_sink("without_write", lambda _: SinkWithoutWrite())
+
+    with pytest.raises(TypeError, match="write"):
+        build_sinks("without_write", None)
+
+def test_registered_sinks_build():
+    fan_out = build_sinks("jsonl", None)
+
+    assert [sink.name for sink in fan_out.sinks] == ["jsonl"]
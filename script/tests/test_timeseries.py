@@ -0,0 +1,74 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from repositories.mongo import check_storage_mode
+from repositories.timeseries import TimeSeriesManager
+from utils import env
+
+class FakeResult:
+    matched_count = modified_count = upserted_count = deleted_count = 0
+
+    def __init__(self, inserted_count):
+        self.inserted_count = inserted_count
+
+class FakeEvents:
+    def __init__(self):
+        self.events = []
+
+    async def create_index(self, keys):
+        pass
+
+    async def bulk_write(self, bulk_ops, ordered):
+        self.events.extend(op._doc for op in bulk_ops)
+        return FakeResult(len(bulk_ops))
+
+    async def find(self, query, projection):
+        # The version check filters by key, so returning every event is enough here
+        for event in self.events:
+            yield event
+
+class FakeDatabase(dict):
+    async def create_collection(self, name, **kwargs):
+        self.setdefault(name, FakeEvents())
+
+def _report(updated_at: datetime) -> dict:
+    return {
+        "_id": "abc",
+        "_fingerprint": {"updated_at": updated_at, "hash": "h"},
+        "report_id": 7,
+        "type": "reba",
+        "client": "STANDARD",
+        "created_at": datetime(2023, 1, 1, 8, 0, 0, 123456),
+        "updated_at": updated_at,
+        "risk": "LOW",
+    }
+
+def test_insert_skips_versions_already_stored():
+    db = FakeDatabase()
+    timeseries = TimeSeriesManager(db)
+    first, second = datetime(2023, 1, 1, 9), datetime(2023, 1, 2, 9)
+
+    stats = asyncio.run(timeseries.insert("reports", [_report(first), _report(first)]))
+    assert (stats["inserted"], stats["duplicates"]) == (1, 1)
+
+    stats = asyncio.run(timeseries.insert("reports", [_report(first), _report(second)]))
+    assert (stats["inserted"], stats["duplicates"]) == (1, 1)
+    assert len(db["reports_events"].events) == 2
+
+def test_events_drop_internal_fields():
+    event = TimeSeriesManager(FakeDatabase()).to_event("reports", _report(datetime(2023, 1, 1, 9)))
+
+    assert "_id" not in event and "_fingerprint" not in event
+    assert event["meta"] == {"client": "STANDARD", "type": "reba"}
+
+def test_timeseries_only_requires_rollups_and_fingerprints_off(monkeypatch):
+    monkeypatch.setattr(env, "MONGO_STORAGE_MODE", "timeseries")
+    monkeypatch.setattr(env, "ROLLUPS", True)
+    monkeypatch.setattr(env, "SKIP_UNCHANGED_UPSERTS", False)
+    with pytest.raises(ValueError, match="ROLLUPS"):
+        check_storage_mode()
+
+    monkeypatch.setattr(env, "ROLLUPS", False)
+    check_storage_mode()
@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from orchestrators.base import BaseOrchestrator, SKIP_THRESHOLD_MINUTES
+from utils import env
+
+THRESHOLD = timedelta(minutes=SKIP_THRESHOLD_MINUTES)
+DEFAULT_START = datetime(2023, 1, 1)
+DEFAULT_END = datetime(2023, 1, 31, 23, 59, 59)
+
+@pytest.fixture
+def orchestrator(monkeypatch):
+    monkeypatch.setattr(env, "DIFF_TYPE", "days")
+    monkeypatch.setattr(env, "OFFSET", 1)
+    monkeypatch.setattr(env, "ADAPTIVE_WINDOW", True)
+    monkeypatch.setattr(env, "ADAPTIVE_WINDOW_MAX_SECONDS", 60 * 60 * 24 * 30)
+    monkeypatch.setattr(env, "ADAPTIVE_WINDOW_MAX_GROWTH", 30)
+    monkeypatch.setattr(env, "WINDOW_TARGET_ROWS", 50000)
+    # Sinks are never used by the window planning
+    return BaseOrchestrator(mongo_repository=None, sinks=object())
+
+def _control(end_date: datetime, size: timedelta, rows: int = 1) -> dict:
+    return {"start_date": end_date - size, "end_date": end_date, "rows": rows, "duration_seconds": 1}
+
+def test_adaptive_window_near_present_ends_before_threshold(orchestrator):
+    now = datetime.now()
+    # A quiet day would grow the next window to 30 days, well into the future
+    control = _control(now - timedelta(hours=2), timedelta(days=1))
+    start_date, end_date = orchestrator._calculate_date_range(control, DEFAULT_START, DEFAULT_END)
+
+    assert start_date < end_date <= datetime.now() - THRESHOLD
+    assert not orchestrator._should_skip_etl(end_date)
+
+def test_control_inside_threshold_is_skipped(orchestrator):
+    control = _control(datetime.now() - timedelta(minutes=1), timedelta(days=1))
+    _, end_date = orchestrator._calculate_date_range(control, DEFAULT_START, DEFAULT_END)
+
+    assert orchestrator._should_skip_etl(end_date)
+
+def test_planned_windows_stop_at_threshold(orchestrator, monkeypatch):
+    monkeypatch.setattr(env, "ADAPTIVE_WINDOW", False)
+    control = _control(datetime.now() - timedelta(days=3, hours=6), timedelta(days=1))
+    windows = orchestrator._plan_windows(control, DEFAULT_START, DEFAULT_END, max_windows=10)
+
+    assert len(windows) == 4
+    assert windows[0]["start_date"] == control["end_date"] + timedelta(seconds=1)
+    for previous, window in zip(windows, windows[1:]):
+        assert window["start_date"] == previous["end_date"] + timedelta(seconds=1)
+    assert all(window["start_date"] <= window["end_date"] for window in windows)
+    assert windows[-1]["end_date"] <= datetime.now() - THRESHOLD
@@ -9,9 +9,64 @@ class Enviroments:
         self.JOHN_DEERE_MYSQL_URL = os.getenv("JOHN_DEERE_MYSQL_URL")
         self.MONGO_URI = os.getenv("MONGO_URI")
         self.MONGO_DATABASE = os.getenv("MONGO_DATABASE")
+        self.VECTORIZED_RISK = os.getenv("VECTORIZED_RISK", "true").lower() == "true"
+        self.TRANSFORM_EXECUTOR = os.getenv("TRANSFORM_EXECUTOR", "inline")
+        self.TRANSFORM_WORKERS = int(os.getenv("TRANSFORM_WORKERS", 0))
+        self.TRANSFORM_MIN_ROWS = int(os.getenv("TRANSFORM_MIN_ROWS", 1000))
+        self.JSON_BACKEND = os.getenv("JSON_BACKEND", "auto")
+        self.SINKS = os.getenv("SINKS", "mongo")
+        self.SINK_QUEUE_SIZE = int(os.getenv("SINK_QUEUE_SIZE", 8))
+        self.SINK_BATCH_ROWS = int(os.getenv("SINK_BATCH_ROWS", 20000))
+        self.SINK_FILE_DIR = os.getenv("SINK_FILE_DIR", "data")
+        self.CLICKHOUSE_HOST = os.getenv("CLICKHOUSE_HOST", "localhost")
+        self.CLICKHOUSE_PORT = int(os.getenv("CLICKHOUSE_PORT", 9000))
+        self.CLICKHOUSE_DATABASE = os.getenv("CLICKHOUSE_DATABASE", "etl")
+        self.CLICKHOUSE_USER = os.getenv("CLICKHOUSE_USER", "default")
+        self.CLICKHOUSE_PASSWORD = os.getenv("CLICKHOUSE_PASSWORD", "")
+        self.CLICKHOUSE_COMPRESSION = os.getenv("CLICKHOUSE_COMPRESSION", "lz4")
+        self.CLICKHOUSE_BUFFER_ROWS = int(os.getenv("CLICKHOUSE_BUFFER_ROWS", 50000))
+        self.CLICKHOUSE_BUFFER_SECONDS = float(os.getenv("CLICKHOUSE_BUFFER_SECONDS", 5))
         self.DIFF_TYPE = os.getenv("DIFF_TYPE", "days")
         self.OFFSET = int(os.getenv("OFFSET", 30))
         self.JOB_SLEEP_SECONDS = int(os.getenv("JOB_SLEEP_SECONDS", 60))
         self.JOB_REALTIME_SLEEP_SECONDS = int(os.getenv("JOB_REALTIME_SLEEP_SECONDS", 60))
+        self.MONGO_ENSURE_INDEXES = os.getenv("MONGO_ENSURE_INDEXES", "true").lower() == "true"
+        self.SKIP_UNCHANGED_UPSERTS = os.getenv("SKIP_UNCHANGED_UPSERTS", "true").lower() == "true"
+        self.FINGERPRINT_CACHE_SIZE = int(os.getenv("FINGERPRINT_CACHE_SIZE", 500000))
+        self.MONGO_STORAGE_MODE = os.getenv("MONGO_STORAGE_MODE", "collection")
+        self.ROLLUPS = os.getenv("ROLLUPS", "true").lower() == "true"
+        self.MONGO_BULK_BATCH_SIZE = int(os.getenv("MONGO_BULK_BATCH_SIZE", 1000))
+        self.MONGO_BULK_CONCURRENCY = int(os.getenv("MONGO_BULK_CONCURRENCY", 4))
+        self.REALTIME_SYNC_MODE = os.getenv("REALTIME_SYNC_MODE", "diff")
+        self.JOB_MAX_CONCURRENCY = int(os.getenv("JOB_MAX_CONCURRENCY", 3))
+        self.BACKFILL_AUTO = os.getenv("BACKFILL_AUTO", "false").lower() == "true"
+        self.BACKFILL_LAG_WINDOWS = int(os.getenv("BACKFILL_LAG_WINDOWS", 3))
+        self.BACKFILL_MAX_WINDOWS = int(os.getenv("BACKFILL_MAX_WINDOWS", 48))
+        self.BACKFILL_CONCURRENCY = int(os.getenv("BACKFILL_CONCURRENCY", 4))
+        self.STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", 1000))
+        self.ETL_PIPELINE = os.getenv("ETL_PIPELINE", "false").lower() == "true"
+        self.PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", 4))
+        self.PIPELINE_LOADERS = int(os.getenv("PIPELINE_LOADERS", 2))
+        self.MYSQL_FETCH_MODE = os.getenv("MYSQL_FETCH_MODE", "stream")
+        self.KEYSET_PAGE_SIZE = int(os.getenv("KEYSET_PAGE_SIZE", 5000))
+        self.KEYSET_PAGE_RETRIES = int(os.getenv("KEYSET_PAGE_RETRIES", 3))
+        self.WINDOW_SPLIT_MODE = os.getenv("WINDOW_SPLIT_MODE", "time")
+        self.WINDOW_PARTS = int(os.getenv("WINDOW_PARTS", 1))
+        self.WINDOW_TARGET_ROWS = int(os.getenv("WINDOW_TARGET_ROWS", 50000))
+        self.WINDOW_MAX_PARTS = int(os.getenv("WINDOW_MAX_PARTS", 8))
+        self.WINDOW_TARGET_SECONDS = float(os.getenv("WINDOW_TARGET_SECONDS", 30))
+        self.ADAPTIVE_WINDOW = os.getenv("ADAPTIVE_WINDOW", "false").lower() == "true"
+        self.ADAPTIVE_WINDOW_MIN_SECONDS = int(os.getenv("ADAPTIVE_WINDOW_MIN_SECONDS", 60))
+        self.ADAPTIVE_WINDOW_MAX_SECONDS = int(os.getenv("ADAPTIVE_WINDOW_MAX_SECONDS", 60 * 60 * 24 * 30))
+        self.ADAPTIVE_WINDOW_MAX_GROWTH = float(os.getenv("ADAPTIVE_WINDOW_MAX_GROWTH", 2))
+        self.MYSQL_MAX_CONCURRENCY = int(os.getenv("MYSQL_MAX_CONCURRENCY", 10))
+        self.MYSQL_POOL_SIZE = int(os.getenv("MYSQL_POOL_SIZE", 5))
+        self.MYSQL_MAX_OVERFLOW = int(os.getenv("MYSQL_MAX_OVERFLOW", 10))
+        self.MYSQL_POOL_RECYCLE_SECONDS = int(os.getenv("MYSQL_POOL_RECYCLE_SECONDS", 1800))
+        self.MYSQL_POOL_TIMEOUT_SECONDS = int(os.getenv("MYSQL_POOL_TIMEOUT_SECONDS", 30))
+        self.MYSQL_POOL_PRE_PING = os.getenv("MYSQL_POOL_PRE_PING", "true").lower() == "true"
+        self.COLUMN_PROJECTION = os.getenv("COLUMN_PROJECTION", "false").lower() == "true"
+        self.DIMENSION_CACHE = os.getenv("DIMENSION_CACHE", "false").lower() == "true"
+        self.DIMENSION_CACHE_TTL_SECONDS = int(os.getenv("DIMENSION_CACHE_TTL_SECONDS", 60))
 
 env = Enviroments()
\ No newline at end of file